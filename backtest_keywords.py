@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Back-test keyword filters against historical result files
+
+Loads all tenders from the tender database (or the given
+evergabe_results_*.json files), applies the configured filter
+(or a variant of it) to every result at once and reports how many results
+each keyword matches. With --compare both match modes are run and the
+results only one of them keeps are listed.
+
+Usage:
+    python backtest_keywords.py                          # configured match mode
+    python backtest_keywords.py --mode morphological     # root based matcher
+    python backtest_keywords.py --add lichtmastarbeiten --remove straße
+    python backtest_keywords.py --compare                # keywords vs morphological
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.config_manager import ConfigManager
+from utils.keyword_matcher import build_matcher
+from utils.compound_matcher import CompoundMatcher
+from utils.batch_filter import load_results_frame, load_store_frame, batch_filter
+from utils.tender_store import TenderStore
+
+
+def make_matcher(config, mode, add=None, remove=None):
+    """Build the matcher for a match mode, optionally with a changed keyword list"""
+    if mode == 'morphological':
+        return CompoundMatcher.from_config(config)
+    keywords = list(config.get('search.filter_keywords', []) or [])
+    keywords += add or []
+    removed = {keyword.lower() for keyword in (remove or [])}
+    keywords = [keyword for keyword in keywords if keyword.lower() not in removed]
+    return build_matcher(config, filter_keywords=keywords)
+
+
+def run_filter(df, matcher, label):
+    """Filter all results and print the summary"""
+    start = time.perf_counter()
+    result = batch_filter(df, matcher)
+    elapsed = time.perf_counter() - start
+    summary = result.summary()
+    print(f"\n{label}: {summary['relevant']}/{summary['total']} relevant "
+          f"({summary['excluded']} excluded) in {elapsed:.2f}s")
+    return result
+
+
+def print_counts(result, top):
+    """Print per-keyword hit counts and keywords without hits"""
+    print(f"\nTop {top} keywords (results matched):")
+    for keyword, count in result.keyword_counts.head(top).items():
+        print(f"  {keyword:<40} {count:6d}")
+    if len(result.exclude_counts):
+        print("\nExclude keywords:")
+        for keyword, count in result.exclude_counts.items():
+            print(f"  {keyword:<40} {count:6d}")
+
+
+def print_rows(df, mask, label, limit):
+    """Print titles of the rows selected by a mask"""
+    rows = df[mask]
+    print(f"\n{label}: {len(rows)}")
+    for title in rows['title'].fillna('').head(limit):
+        print(f"  - {title[:90]}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Back-test keyword filters against historical results')
+    parser.add_argument('files', nargs='*', help='Result files (default: the tender database, else all result files)')
+    parser.add_argument('--config', help='Configuration file')
+    parser.add_argument('--mode', choices=['keywords', 'morphological'], help='Match mode (default: search.match_mode)')
+    parser.add_argument('--add', nargs='+', default=[], help='Keywords to add to filter_keywords')
+    parser.add_argument('--remove', nargs='+', default=[], help='Keywords to remove from filter_keywords')
+    parser.add_argument('--compare', action='store_true', help='Compare keyword and morphological matching')
+    parser.add_argument('--top', type=int, default=30, help='Number of keywords to show')
+    parser.add_argument('--limit', type=int, default=20, help='Number of titles to show per list')
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config)
+
+    start = time.perf_counter()
+    database = os.path.join(config.get_output_directory(), config.get('output.database', 'tenders.db') or '')
+    if not args.files and os.path.isfile(database):
+        df = load_store_frame(TenderStore(database))
+    else:
+        df = load_results_frame(args.files or None, config.get_output_directory())
+    print(f"✓ Loaded {len(df)} results in {time.perf_counter() - start:.2f}s")
+    if df.empty:
+        print("✗ No results to test against")
+        return 1
+
+    if args.compare:
+        keywords = run_filter(df, make_matcher(config, 'keywords', args.add, args.remove), 'Keywords')
+        morphological = run_filter(df, make_matcher(config, 'morphological'), 'Morphological')
+        print_rows(df, morphological.relevant & ~keywords.relevant, 'Only kept by morphological matching', args.limit)
+        print_rows(df, keywords.relevant & ~morphological.relevant, 'Only kept by keyword matching', args.limit)
+        return 0
+
+    mode = args.mode or config.get('search.match_mode', 'keywords')
+    result = run_filter(df, make_matcher(config, mode, args.add, args.remove), mode.capitalize())
+    print_counts(result, args.top)
+
+    if mode == 'keywords' and (args.add or args.remove):
+        # Show what the change does compared to the configured list
+        current = batch_filter(df, make_matcher(config, 'keywords'))
+        print_rows(df, result.relevant & ~current.relevant, 'Newly kept', args.limit)
+        print_rows(df, current.relevant & ~result.relevant, 'No longer kept', args.limit)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the search result and detail page parsers
+
+Runs the list-page parsing (process_search_results) and the detail page
+extraction (extract_order_details) over a corpus of saved HTML pages and
+reports per-page and per-field timings, throughput and peak memory.
+Results can be stored as a baseline and compared to catch regressions.
+
+Timings are the median of the repeats. Each page is also parsed with plain
+BeautifulSoup in the same run, and the baseline comparison uses timings
+relative to that reference parse, so a slower or busier machine does not
+show up as a regression.
+
+Usage:
+    python benchmark_parser.py                    # run and compare with baseline
+    python benchmark_parser.py --save-baseline    # run and store as new baseline
+    python benchmark_parser.py --seed             # add debug_*.html dumps to the corpus
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import gc
+import argparse
+import statistics
+import tracemalloc
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.page_parser import parse_search_results, FIELD_EXTRACTORS, empty_result
+from utils.result_normalizer import normalize_result
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+FIXTURE_DIR = os.path.join(BENCHMARK_DIR, 'fixtures')
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+
+def seed_corpus(source_dir='.'):
+    """Copy debug HTML dumps written by the scraper into the fixture corpus"""
+    copied = 0
+    for kind, pattern in [('search', 'debug_search_page_*.html'), ('detail', 'debug_detail_*.html')]:
+        target_dir = os.path.join(FIXTURE_DIR, kind)
+        os.makedirs(target_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(source_dir, pattern)):
+            # Search dumps are overwritten per page on every run, so keep them unique by mtime
+            stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(os.path.getmtime(path)))
+            name = os.path.basename(path).replace('debug_', f'{stamp}_')
+            shutil.copyfile(path, os.path.join(target_dir, name))
+            copied += 1
+    print(f"✓ Copied {copied} pages into {FIXTURE_DIR}")
+
+
+def load_corpus(kind):
+    """Load all fixture pages of one kind ('search' or 'detail')"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, kind, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def median_ms(samples):
+    """Median of timings in seconds, in milliseconds"""
+    return statistics.median(samples) * 1000 if samples else 0.0
+
+
+def bench_search_pages(pages, repeat):
+    """Time parse_search_results and a plain BeautifulSoup parse per page
+
+    Returns:
+        Median milliseconds per page, number of cards and the mean
+        reference parse time in milliseconds
+    """
+    samples = {name: [] for name, _ in pages}
+    reference = {name: [] for name, _ in pages}
+    cards = 0
+    # Pages alternate within each repeat, so a slow phase of the machine
+    # hits the reference and the parser alike
+    for run in range(repeat):
+        for name, html in pages:
+            start = time.perf_counter()
+            BeautifulSoup(html, 'html.parser')
+            reference[name].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            result = parse_search_results(html)
+            samples[name].append(time.perf_counter() - start)
+            if run == 0:
+                cards += len(result)
+    per_page = {name: median_ms(times) for name, times in samples.items()}
+    reference_ms = sum(median_ms(times) for times in reference.values()) / max(1, len(pages))
+    return per_page, cards, reference_ms
+
+
+def bench_detail_pages(pages, repeat):
+    """Time the detail extraction per page and per field
+
+    The soup field (parsing the page with BeautifulSoup) is the reference
+    the other timings are compared relative to.
+
+    Returns:
+        Median milliseconds per page and mean (over pages) of the median
+        milliseconds per field
+    """
+    fields = ['soup'] + [field for field, _ in FIELD_EXTRACTORS] + ['normalize']
+    per_page = {}
+    per_field = dict.fromkeys(fields, 0.0)
+
+    for name, html in pages:
+        page_samples = []
+        field_samples = {field: [] for field in fields}
+        for _ in range(repeat):
+            start = time.perf_counter()
+            soup = BeautifulSoup(html, 'html.parser')
+            field_samples['soup'].append(time.perf_counter() - start)
+
+            info = empty_result(name, 'benchmark')
+            for field, extractor in FIELD_EXTRACTORS:
+                start = time.perf_counter()
+                extractor(soup, info)
+                field_samples[field].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            normalize_result(info)
+            field_samples['normalize'].append(time.perf_counter() - start)
+            page_samples.append(sum(times[-1] for times in field_samples.values()))
+        per_page[name] = median_ms(page_samples)
+        for field, times in field_samples.items():
+            per_field[field] += median_ms(times)
+
+    per_field = {field: total / max(1, len(pages)) for field, total in per_field.items()}
+    return per_page, per_field
+
+
+def run_benchmark(repeat=5):
+    """Run the benchmark over the fixture corpus
+
+    Returns:
+        Report dict with timings in milliseconds
+    """
+    search_pages = load_corpus('search')
+    detail_pages = load_corpus('detail')
+
+    # Timing pass (tracemalloc slows parsing down, so it is measured separately)
+    start = time.perf_counter()
+    search_per_page, cards, search_reference = bench_search_pages(search_pages, repeat)
+    search_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detail_per_page, detail_per_field = bench_detail_pages(detail_pages, repeat)
+    detail_elapsed = time.perf_counter() - start
+
+    # Memory pass (only the parsers, without the reference parse and the
+    # soups the timing pass left for the garbage collector)
+    gc.collect()
+    tracemalloc.start()
+    for _, html in search_pages:
+        parse_search_results(html)
+    _, search_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    tracemalloc.start()
+    bench_detail_pages(detail_pages, 1)
+    _, detail_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    search_mean = sum(search_per_page.values()) / max(1, len(search_per_page))
+    detail_mean = sum(detail_per_page.values()) / max(1, len(detail_per_page))
+    detail_reference = detail_per_field['soup']
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': repeat,
+        'search': {
+            'pages': len(search_pages),
+            'cards': cards,
+            'per_page_ms': search_per_page,
+            'mean_ms': search_mean,
+            'reference_ms': search_reference,
+            'relative': search_mean / search_reference if search_reference else None,
+            'pages_per_sec': len(search_pages) * repeat / search_elapsed if search_elapsed else 0,
+            'peak_memory_kb': search_peak / 1024
+        },
+        'detail': {
+            'pages': len(detail_pages),
+            'per_page_ms': detail_per_page,
+            'per_field_ms': detail_per_field,
+            'mean_ms': detail_mean,
+            'reference_ms': detail_reference,
+            'relative': detail_mean / detail_reference if detail_reference else None,
+            'pages_per_sec': len(detail_pages) * repeat / detail_elapsed if detail_elapsed else 0,
+            'peak_memory_kb': detail_peak / 1024
+        }
+    }
+
+
+def compare_with_baseline(report, baseline, tolerance=0.25):
+    """Compare timings and peak memory with the baseline
+
+    Timings are compared relative to each run's reference parse when both
+    runs have one, so only slowdowns of the parser itself count. The
+    tolerance is the noise margin.
+
+    Returns:
+        List of regression messages (empty if none)
+    """
+    regressions = []
+    for section in ('search', 'detail'):
+        current, previous = report[section], baseline.get(section, {})
+        old_reference, new_reference = previous.get('reference_ms'), current.get('reference_ms')
+        relative = bool(old_reference and new_reference)
+
+        def scaled(value, reference):
+            return value / reference if relative else value
+
+        old, new = previous.get('mean_ms'), current.get('mean_ms')
+        if old and new and scaled(new, new_reference) > scaled(old, old_reference) * (1 + tolerance):
+            change = scaled(new, new_reference) / scaled(old, old_reference) - 1
+            regressions.append(f"{section}.mean_ms: {old:.2f} → {new:.2f} (+{change * 100:.0f}%"
+                               f"{' relative to the reference parse' if relative else ''})")
+
+        old, new = previous.get('peak_memory_kb'), current.get('peak_memory_kb')
+        if old and new and new > old * (1 + tolerance):
+            regressions.append(f"{section}.peak_memory_kb: {old:.2f} → {new:.2f} (+{(new / old - 1) * 100:.0f}%)")
+
+        for field, old in previous.get('per_field_ms', {}).items():
+            new = current.get('per_field_ms', {}).get(field)
+            # The reference itself, and sub-0.05ms fields (dominated by timer noise), are not compared
+            if field == 'soup' and relative or not (new and old and old > 0.05):
+                continue
+            if scaled(new, new_reference) > scaled(old, old_reference) * (1 + tolerance):
+                regressions.append(f"{section}.field.{field}: {old:.3f} → {new:.3f} ms")
+    return regressions
+
+
+def print_report(report):
+    """Print a human readable benchmark report"""
+    print("\n" + "="*60)
+    print("PARSER BENCHMARK")
+    print("="*60)
+
+    search = report['search']
+    print(f"\nSearch result pages: {search['pages']} ({search['cards']} cards)")
+    for name, ms in search['per_page_ms'].items():
+        print(f"  {name:<40} {ms:8.2f} ms")
+    print(f"  Mean: {search['mean_ms']:.2f} ms | {search['pages_per_sec']:.1f} pages/s | peak {search['peak_memory_kb']:.0f} KB")
+    print(f"  Reference parse: {search['reference_ms']:.2f} ms ({search['relative'] or 0:.2f}x)")
+
+    detail = report['detail']
+    print(f"\nDetail pages: {detail['pages']}")
+    for name, ms in detail['per_page_ms'].items():
+        print(f"  {name:<40} {ms:8.2f} ms")
+    print(f"  Mean: {detail['mean_ms']:.2f} ms | {detail['pages_per_sec']:.1f} pages/s | peak {detail['peak_memory_kb']:.0f} KB")
+    print(f"  Reference parse: {detail['reference_ms']:.2f} ms ({detail['relative'] or 0:.2f}x)")
+    print("\n  Per field:")
+    for field, ms in sorted(detail['per_field_ms'].items(), key=lambda x: -x[1]):
+        print(f"    {field:<25} {ms:8.3f} ms")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Offline parser benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='Parse each page this many times (the median is reported)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--seed', action='store_true', help='Copy debug_*.html dumps into the fixture corpus and exit')
+    parser.add_argument('--json', help='Also write the report to this file')
+    args = parser.parse_args()
+
+    if args.seed:
+        seed_corpus()
+        return 0
+
+    report = run_benchmark(repeat=args.repeat)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Baseline saved to {BASELINE_FILE}")
+        return 0
+
+    if not os.path.exists(BASELINE_FILE):
+        print("\n→ No baseline yet, run with --save-baseline to create one")
+        return 0
+
+    with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = compare_with_baseline(report, baseline, args.tolerance)
+    print("\n" + "="*60)
+    if regressions:
+        print(f"✗ {len(regressions)} REGRESSIONS vs baseline from {baseline.get('created_at')}")
+        for message in regressions:
+            print(f"  - {message}")
+        return 1
+    print(f"✓ No regressions vs baseline from {baseline.get('created_at')}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compact the historical result files
+
+Imports every evergabe_results_*.json into the tender database (tenders
+are deduplicated by Vergabe-ID/URL, the latest content and AI summaries
+are kept), writes all tenders to output/compact/tenders.jsonl with an
+index, and archives or deletes the per-run files that fall outside the
+retention policy (output.retention).
+
+Usage:
+    python compact_results.py                   # import, compact, apply retention
+    python compact_results.py --dry-run         # only show what would happen
+    python compact_results.py --keep-runs 5 --keep-days 14
+    python compact_results.py --delete          # delete instead of archiving
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.config_manager import ConfigManager
+from utils.tender_store import TenderStore
+from utils.compaction import (
+    write_compact_dataset, retention_candidates, apply_retention, unimported_files
+)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Merge result files into one dataset and apply the retention policy')
+    parser.add_argument('--config', help='Configuration file')
+    parser.add_argument('--keep-runs', type=int, help='Newest runs that keep their files (default: output.retention.keep_runs)')
+    parser.add_argument('--keep-days', type=int, help='Days of runs that keep their files (default: output.retention.keep_days)')
+    parser.add_argument('--delete', action='store_true', help='Delete superseded files instead of archiving them')
+    parser.add_argument('--no-retention', action='store_true', help='Only import and compact, keep all files')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would be done without changing anything')
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config)
+    output_dir = config.get_output_directory()
+    retention = config.get('output.retention', {}) or {}
+    keep_runs = args.keep_runs if args.keep_runs is not None else retention.get('keep_runs', 10)
+    keep_days = args.keep_days if args.keep_days is not None else retention.get('keep_days', 30)
+    action = 'delete' if args.delete else retention.get('action', 'archive')
+    archive_dir = os.path.join(output_dir, retention.get('archive_directory', 'archive'))
+
+    store = TenderStore(os.path.join(output_dir, config.get('output.database', 'tenders.db') or 'tenders.db'))
+
+    pending = unimported_files(store, output_dir)
+    if args.dry_run:
+        print(f"→ Would import {len(pending)} result files")
+    else:
+        imported = store.import_directory(output_dir)
+        print(f"✓ Imported {imported} result files ({store.count()} tenders in total)")
+        compact_dir = os.path.join(output_dir, 'compact')
+        count = write_compact_dataset(store, compact_dir)
+        print(f"✓ Wrote {count} tenders to {compact_dir}")
+
+    if args.no_retention:
+        return 0
+
+    candidates = retention_candidates(store, output_dir, keep_runs, keep_days)
+    files = sum(len(paths) for _, paths in candidates)
+    target = '' if action == 'delete' else f' to {archive_dir}'
+    print(f"\nRetention: keep the newest {keep_runs} runs and the last {keep_days} days")
+    for run_file, paths in candidates:
+        print(f"  {run_file}: {', '.join(os.path.basename(path) for path in paths)}")
+    if args.dry_run:
+        print(f"→ Would {action} {files} files of {len(candidates)} runs{target}")
+        return 0
+    moved = apply_retention(candidates, action, archive_dir)
+    print(f"✓ {'Deleted' if action == 'delete' else 'Archived'} {moved} files of {len(candidates)} runs{target}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Report which filter keywords matter, based on the stored keyword statistics
+
+Flags keywords that never matched, keywords that were never the only match
+(removing them would not change any result), keywords always matched
+together with another one (subsumed) and duplicates in the keyword list.
+
+Usage:
+    python keyword_report.py               # full report
+    python keyword_report.py --top 50      # show more keywords in the table
+    python keyword_report.py --reset       # delete the stored statistics
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.config_manager import ConfigManager
+from utils.keyword_stats import load_stats, analyze_keywords
+
+
+def configured_keywords(config):
+    """Keywords (or roots) the current match mode uses"""
+    if config.get('search.match_mode', 'keywords') == 'morphological':
+        return list(config.get('search.morphology.roots', {}) or {}) + \
+            list(config.get('search.morphology.words', []) or [])
+    return list(config.get('search.filter_keywords', []) or [])
+
+
+def print_table(stats, top):
+    """Print the most frequent keywords with their counters"""
+    rows = sorted(stats['keywords'].items(),
+                  key=lambda item: -(item[1]['early']['matched'] + item[1]['late']['matched']))
+    print(f"\n{'Keyword':<35} {'Early':>7} {'Only':>6} {'Kept':>6} {'Late':>7} {'Only':>6} {'Kept':>6}")
+    print("-" * 78)
+    for keyword, counts in rows[:top]:
+        early, late = counts['early'], counts['late']
+        print(f"{keyword:<35} {early['matched']:7d} {early['only']:6d} {early['relevant']:6d} "
+              f"{late['matched']:7d} {late['only']:6d} {late['relevant']:6d}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Keyword hit-rate report')
+    parser.add_argument('--config', help='Configuration file')
+    parser.add_argument('--top', type=int, default=25, help='Number of keywords in the table')
+    parser.add_argument('--reset', action='store_true', help='Delete the stored statistics')
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config)
+    path = os.path.join(config.get_output_directory(), 'keyword_stats.json')
+
+    if args.reset:
+        if os.path.exists(path):
+            os.remove(path)
+            print(f"✓ Deleted {path}")
+        return 0
+
+    stats = load_stats(path)
+    if not stats['runs']:
+        print(f"✗ No keyword statistics yet ({path}), run the scraper with search.keyword_stats: true")
+        return 1
+
+    keywords = configured_keywords(config)
+    print("="*78)
+    print(f"KEYWORD REPORT - {stats['runs']} runs, last update {stats['updated_at']}")
+    print("="*78)
+    print("Early = result list filter, Late = final filter, Only = only matching keyword,")
+    print("Kept = result was relevant after the final filter")
+    print_table(stats, args.top)
+
+    findings = analyze_keywords(stats, keywords)
+
+    print(f"\nDuplicates in the keyword list ({len(findings['duplicates'])}):")
+    for keyword in findings['duplicates']:
+        print(f"  - {keyword}")
+
+    print(f"\nNever matched ({len(findings['never_matched'])} of {len(set(k.lower() for k in keywords))}):")
+    for keyword in findings['never_matched']:
+        print(f"  - {keyword}")
+
+    print(f"\nNever the only match - removing them changes no result ({len(findings['never_only'])}):")
+    for keyword in findings['never_only']:
+        print(f"  - {keyword}")
+
+    print(f"\nSubsumed - always matched together with ({len(findings['subsumed'])}):")
+    for keyword, covering in findings['subsumed']:
+        print(f"  - {keyword:<35} → {', '.join(covering[:5])}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
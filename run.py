@@ -8,6 +8,78 @@ import sys
 import argparse
 from src.evergabe_scraper import EvergabeScraper
 
+def load_details(scraper, filepath, indices=None):
+    """Load missing detail page data into an existing run"""
+    import json
+    from utils.result_files import open_text, load_results, run_name
+    
+    store = scraper.get_tender_store()
+    run_file = run_name(filepath)
+    if store and store.get_run(run_file):
+        results = store.run_results(run_file)
+    else:
+        results = load_results(filepath)
+    
+    print(f"\n→ Loading details for {filepath}")
+    loaded = scraper.load_missing_details(results, indices)
+    
+    if loaded:
+        if store:
+            # Only the completed tenders changed; the others keep their scraped_at
+            store.update_tenders([results[index] for index in loaded])
+        if store and store.get_run(run_file):
+            if os.path.exists(filepath):
+                store.export_json(run_file, filepath)
+        else:
+            with open_text(filepath, 'w') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ Loaded details for {len(loaded)} results")
+
+def print_changes(config_path, since, fields=None):
+    """Print tenders whose deadline, documents or other content changed since a date"""
+    from utils.config_manager import ConfigManager
+    from utils.tender_store import TenderStore
+    
+    config = ConfigManager(config_path)
+    database = config.get('output.database', 'tenders.db')
+    path = os.path.join(config.get_output_directory(), database or 'tenders.db')
+    if not os.path.exists(path):
+        print(f"\n✗ No tender database at {path}")
+        return
+    
+    tenders = TenderStore(path).changes_since(since, fields)
+    print(f"\nTenders changed since {since}: {len(tenders)}")
+    for tender in tenders:
+        print(f"\n- {tender.get('title', 'No title')[:70]} (Vergabe-ID {tender.get('vergabe_id') or '?'})")
+        print(f"  {tender.get('url')}")
+        for revision in tender['revisions']:
+            for field, change in revision['changes'].items():
+                if field == 'documents':
+                    added = ', '.join(doc.get('name') or doc.get('url') for doc in change['added'])
+                    removed = ', '.join(doc.get('name') or doc.get('url') for doc in change['removed'])
+                    text = ' '.join(part for part in (f"+ {added}" if added else '', f"- {removed}" if removed else '') if part)
+                else:
+                    text = f"{str(change['old'])[:40]} → {str(change['new'])[:40]}"
+                print(f"  {revision['changed_at']}  {field}: {text}")
+
+def recover_run(config_path, path):
+    """Export the JSONL results of a run that stopped before saving"""
+    from utils.config_manager import ConfigManager
+    from utils.result_sink import JsonlSink
+    from utils.result_export import export_run
+    from utils.tender_store import TenderStore
+    
+    config = ConfigManager(config_path)
+    sink = JsonlSink(path, append=True)
+    print(f"\n→ Recovering {len(sink)} results from {path}")
+    database = config.get('output.database', 'tenders.db')
+    store = TenderStore(os.path.join(config.get_output_directory(), database)) if database else None
+    base_name = os.path.basename(path)[:-len('.jsonl')]
+    export_run(sink, os.path.dirname(path) or '.', base_name, config.get_output_formats(), store=store,
+               parquet_dir=config.get('output.parquet_directory', 'parquet'),
+               compression=config.get('output.compression', 'none'))
+    sink.remove()
+
 def main():
     """Main function"""
     
@@ -20,6 +92,12 @@ def main():
     parser.add_argument('--max-pages', type=int, help='Max pages per search term (overrides config)')
     parser.add_argument('--show-config', action='store_true', help='Show current configuration and exit')
     parser.add_argument('--create-config', action='store_true', help='Create default config file and exit')
+    parser.add_argument('--load-details', metavar='FILE', help='Open detail pages for results in FILE that were built from the result list')
+    parser.add_argument('--index', type=int, nargs='+', help='With --load-details: only these result indices')
+    parser.add_argument('--recover', metavar='FILE', help='Save the results of an interrupted run from its .jsonl file and exit')
+    parser.add_argument('--changes-since', metavar='DATE', help='Show stored tenders that changed since DATE (YYYY-MM-DD) and exit')
+    parser.add_argument('--fields', nargs='+', help='With --changes-since: only these fields (e.g. deadline_iso documents)')
+    parser.add_argument('--progress-events', action='store_true', help='Print machine-readable progress lines (used by the web viewer)')
     
     args = parser.parse_args()
     
@@ -43,6 +121,16 @@ def main():
             print("\n✓ Configuration file created: config.yaml")
         return
     
+    # Interrupted run (no browser needed)
+    if args.recover:
+        recover_run(args.config, args.recover)
+        return
+    
+    # Change report from the tender database (no browser needed)
+    if args.changes_since:
+        print_changes(args.config, args.changes_since, args.fields)
+        return
+    
     # Check if .env exists
     if not os.path.exists('.env'):
         print("\n✗ No credentials found!")
@@ -53,8 +141,14 @@ def main():
     # Initialize scraper with config
     print(f"\n→ Running with {'headless' if args.headless else 'visible'} browser")
     scraper = EvergabeScraper(headless=args.headless, config_path=args.config)
+    scraper.progress.enabled = args.progress_events
     
     try:
+        # Complete results built from the result list (list_only/lazy mode)
+        if args.load_details:
+            load_details(scraper, args.load_details, args.index)
+            return
+        
         # Override config with command line arguments if provided
         search_terms = args.terms if args.terms else None
         max_pages = args.max_pages
@@ -77,6 +171,10 @@ def main():
         print(f"RESULTS SUMMARY")
         print(f"{'='*60}")
         print(f"Total orders found: {len(scraper.results)}")
+        if scraper.term_planner:
+            print("Search terms:")
+            for line in scraper.term_planner.summary():
+                print(f"  {line}")
         
         # Filter relevant
         relevant = scraper.filter_relevant()
@@ -110,6 +208,7 @@ def main():
             traceback.print_exc()
     finally:
         scraper.close()
+        scraper.progress.finish()
         
     print(f"\n{'='*60}")
     print("SCRAPER FINISHED")
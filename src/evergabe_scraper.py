@@ -6,7 +6,7 @@ Evergabe.de scraper for streetlamp work orders
 import os
 import sys
 import time
-import json
+import threading
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -15,8 +15,6 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import pandas as pd
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,6 +22,19 @@ from utils.login_manager import LoginManager
 from utils.cookie_handler import CookieHandler
 from utils.wait_helper import WaitHelper
 from utils.config_manager import ConfigManager
+from utils.page_parser import parse_search_results, parse_order_details, card_to_result, canonical_url, url_id
+from utils.detail_pipeline import DetailPipeline
+from utils.keyword_matcher import KeywordMatcher
+from utils.compound_matcher import CompoundMatcher
+from utils.keyword_stats import KeywordStats
+from utils.search_query import build_search_url, filter_params
+from utils.term_planner import TermPlanner
+from utils.tender_store import TenderStore
+from utils.seen_index import SeenIndex
+from utils.result_sink import JsonlSink
+from utils.result_export import export_run
+from utils.result_catalog import ResultCatalog
+from utils.progress_events import ProgressReporter
 
 class EvergabeScraper:
     def __init__(self, headless=None, config_path=None):
@@ -40,9 +51,28 @@ class EvergabeScraper:
         self.headless = headless if headless is not None else self.config.is_headless()
         
         self.setup_driver()
-        self.results = []
+        # Results are streamed to <base_name>.jsonl as they are extracted
+        self.base_name = self.get_base_name()
+        self.results = JsonlSink(os.path.join(self.config.get_output_directory(), f'{self.base_name}.jsonl'))
+        self.results_saved = False
         self.processed_vergabe_ids = set()  # Track processed vergabe_ids to avoid duplicates
         self.processed_urls = set()  # Also track URLs as backup
+        self.processed_url_ids = set()  # Tender numbers of the processed URLs (see url_id)
+        self.processed_lock = threading.Lock()  # collect_result also runs in the pipeline's collector thread
+        self.detail_pipeline = None  # Set while parsing in worker processes
+        self.collected_by_term = {}  # search term -> results the detail pipeline added
+        self.keyword_matchers = {}  # Compiled keyword matchers by keyword lists
+        self.term_planner = None  # Set during search_orders when search.planner is enabled
+        self.relevance_recorded = False  # Set by filter_relevant; the planner's run is only stored then
+        self.tender_store = None  # Opened on first use, see get_tender_store
+        self.seen_index = None  # Opened on first use, see get_seen_index
+        self.search_terms_used = []
+        self.progress = ProgressReporter()  # Prints event lines when enabled (run.py --progress-events)
+        self.keyword_stats = None
+        if self.config.get('search.keyword_stats', True):
+            self.keyword_stats = KeywordStats(
+                os.path.join(self.config.get_output_directory(), 'keyword_stats.json')
+            )
         self.logged_in = False
         self.login_manager = LoginManager(self.driver, self.config)
         self.cookie_handler = CookieHandler(self.driver)
@@ -152,28 +182,65 @@ class EvergabeScraper:
         print(f"{'='*60}")
         print(f"Search terms: {search_terms}")
         print(f"Max pages per term: {max_pages}")
+        server_filters = filter_params(self.config.get('search.server_filters', {}))
+        if server_filters:
+            print(f"Server-side filters: {', '.join(f'{name}={value}' for name, value in server_filters)}")
+        
+        # Parse detail pages in worker processes while the browser keeps fetching
+        if self.config.get('performance.parallel_details', False):
+            max_workers = self.config.get('performance.max_workers', 3)
+            self.detail_pipeline = DetailPipeline(
+                self.collect_parsed,
+                max_workers=max_workers,
+                queue_size=self.config.get('performance.parse_queue_size', 2 * max_workers)
+            )
+            print(f"Parsing details in {max_workers} worker processes")
+        
+        # Order terms by past yield, stop terms that only repeat earlier ones
+        # and stop paging where past runs found nothing relevant
+        if self.config.get('search.planner.enabled', True):
+            if self.term_planner is None:
+                self.term_planner = TermPlanner(
+                    os.path.join(self.config.get_output_directory(), 'term_stats.json'),
+                    min_new_fraction=self.config.get('search.planner.min_new_fraction', 0.1),
+                    min_pages=self.config.get('search.planner.min_pages', 1),
+                    min_expected_relevant=self.config.get('search.planner.min_expected_relevant', 0.0),
+                    min_samples=self.config.get('search.planner.min_samples', 3),
+                    audit_every=self.config.get('search.planner.audit_every', 0)
+                )
+            if self.term_planner.audit:
+                print("Full-depth audit run: loading all pages of every term")
+            ordered = self.term_planner.order_terms(search_terms)
+            if ordered != list(search_terms):
+                print(f"Term order (by past yield): {ordered}")
+            search_terms = ordered
+        
+        self.search_terms_used.extend(term for term in search_terms if term not in self.search_terms_used)
+        self.progress.start(search_terms, max_pages)
         
-        for term in search_terms:
-            print(f"\n→ Searching for: {term}")
-            self.search_term(term, max_pages)
+        try:
+            for term in search_terms:
+                print(f"\n→ Searching for: {term}")
+                self.progress.start_term(term)
+                if self.term_planner:
+                    self.term_planner.start_term(term)
+                self.search_term(term, max_pages)
+                self.progress.end_term()
+        finally:
+            if self.detail_pipeline:
+                print("\n→ Waiting for detail parsers to finish...")
+                self.detail_pipeline.close()
+                if self.detail_pipeline.failed:
+                    print(f"✗ {len(self.detail_pipeline.failed)} detail pages were not parsed:")
+                    for url in self.detail_pipeline.failed:
+                        print(f"    {url}")
+                self.detail_pipeline = None
             
     def search_term(self, search_term, max_pages=3):
         """Search for a specific term"""
         try:
-            import urllib.parse
-            
-            # Build search URL
-            params = {
-                'utf8': '✓',
-                'search[source]': 'form_cms',
-                'search[filters][publish_end]': '0',
-                'search[query]': search_term,
-                'commit': 'Aufträge suchen'
-            }
-            
-            base_url = "https://www.evergabe.de/auftraege/auftrag-suchen"
-            query_string = urllib.parse.urlencode(params, safe='[]')
-            search_url = f"{base_url}?{query_string}"
+            # Build search URL (server-side filters reduce the pages to load)
+            search_url = build_search_url(search_term, self.config.get('search.server_filters', {}))
             
             print(f"  Navigating to search...")
             self.driver.get(search_url)
@@ -206,6 +273,7 @@ class EvergabeScraper:
         """Process the search results"""
         page = 1
         results_found = 0
+        queued_count = 0  # Pages handed to the detail pipeline, counted once collected
         
         while page <= max_pages:
             print(f"\n  Page {page}:")
@@ -215,114 +283,29 @@ class EvergabeScraper:
                 max_wait=self.config.get_timing('wait_after_search')
             )
             
-            # Parse page
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
             # Debug: Save page HTML for inspection
+            page_source = self.driver.page_source
             with open(f'debug_search_page_{page}.html', 'w', encoding='utf-8') as f:
-                f.write(self.driver.page_source)
+                f.write(page_source)
             print(f"    Saved page HTML to debug_search_page_{page}.html")
             
-            # Look for the search results list items
-            # evergabe.de uses <li class="result-list-item"> for results
-            result_items = soup.find_all('li', class_='result-list-item')
+            # Parse result cards (url, title, full_text with description and meta info)
+            cards = parse_search_results(page_source)
             
-            links = []
+            print(f"    Found {len(cards)} unique order links")
+            self.progress.start_page(page, len(cards))
             
-            if result_items:
-                print(f"    Found {len(result_items)} result items")
-                
-                for item in result_items:
-                    # Each result item has a data-href attribute with the tender URL
-                    tender_url = item.get('data-href', '')
-                    
-                    if tender_url:
-                        # Get the title from the h3 element
-                        title_elem = item.find('h3', class_='result-list-item-title')
-                        title = ''
-                        if title_elem:
-                            title_link = title_elem.find('a')
-                            if title_link:
-                                title = title_link.get_text(strip=True)
-                        
-                        # Get description/preview text from the result item
-                        description = ''
-                        # Look for description in various possible elements
-                        desc_elem = item.find('p', class_='result-list-item-description')
-                        if not desc_elem:
-                            desc_elem = item.find('div', class_='description')
-                        if not desc_elem:
-                            desc_elem = item.find('p')  # Any paragraph in the item
-                        
-                        if desc_elem:
-                            description = desc_elem.get_text(strip=True)
-                        
-                        # Get any additional metadata (location, authority, etc.)
-                        meta_text = ''
-                        meta_elems = item.find_all(['span', 'div'], class_=lambda x: x and ('meta' in str(x).lower() or 'info' in str(x).lower()))
-                        for meta in meta_elems:
-                            meta_text += ' ' + meta.get_text(strip=True)
-                        
-                        # Combine all text for better filtering
-                        full_text = f"{title} {description} {meta_text}"
-                        
-                        # Create an enhanced link object with all information
-                        class ResultLink:
-                            def __init__(self, href, title, full_text):
-                                self.href = href
-                                self.title = title
-                                self.full_text = full_text
-                            def get(self, attr, default=''):
-                                if attr == 'href':
-                                    return self.href
-                                return default
-                            def get_text(self, strip=True):
-                                return self.title
-                        
-                        links.append(ResultLink(tender_url, title, full_text))
-            else:
-                print(f"    No result items found, checking for alternative structure")
-                
-                # Fallback: look for links in any result-related containers
-                result_containers = soup.find_all(['div', 'ul'], class_=lambda x: x and 'result' in str(x).lower())
-                
-                for container in result_containers:
-                    # Find links that look like tender details
-                    container_links = container.find_all('a', href=lambda x: x and '/ausschreibung/' in x)
-                    for link in container_links:
-                        href = link.get('href', '')
-                        text = link.get_text(strip=True)
-                        
-                        # Skip if it's a navigation link
-                        if any(skip in href.lower() for skip in ['merken', 'filter', 'sort']):
-                            continue
-                        
-                        if text and len(text) > 10:
-                            links.append(link)
-            
-            # Filter unique URLs and preserve full text for filtering
-            unique_urls = []
-            seen = set()
-            for link in links:
-                url = link.get('href', '')
-                if not url.startswith('http'):
-                    url = f"https://www.evergabe.de{url}"
-                title = link.get_text(strip=True)
-                # Get full text if available (for enhanced filtering)
-                full_text = getattr(link, 'full_text', title)
-                if url not in seen:
-                    seen.add(url)
-                    unique_urls.append((url, title, full_text))
-            
-            print(f"    Found {len(unique_urls)} unique order links")
-            
-            if len(unique_urls) == 0:
+            if len(cards) == 0:
                 print("    No results found on this page")
                 break
             
+            if self.term_planner:
+                new_count = self.term_planner.record_page(search_term, page, [canonical_url(card['url']) for card in cards])
+                print(f"    {new_count} of them not seen before in this run")
+            
             # Process each result (limit if configured)
             max_per_page = self.config.get_max_results_per_page()
-            urls_to_process = unique_urls[:max_per_page] if max_per_page > 0 else unique_urls
+            cards_to_process = cards[:max_per_page] if max_per_page > 0 else cards
             
             # Get early filtering setting
             early_filter = self.config.get('search.early_filter', True)
@@ -331,43 +314,106 @@ class EvergabeScraper:
             use_word_boundaries = self.config.get('search.use_word_boundaries', True)
             skip_duplicates = self.config.get('search.skip_duplicates', True)
             
+            # Detail mode: full = open every detail page, lazy = only when required
+            # fields are missing from the card, list_only = never open detail pages
+            detail_mode = self.config.get('search.detail_mode', 'full')
+            required_fields = self.config.get('search.required_fields', [])
+            
+            # Tenders loaded in earlier runs are taken from the database
+            known_tenders = self.config.get('search.known_tenders', {}) or {}
+            seen_index = self.get_seen_index()
+            
             skipped_count = 0
             duplicate_count = 0
-            for idx, item in enumerate(urls_to_process, 1):
-                # Handle both old format (url, title) and new format (url, title, full_text)
-                if len(item) == 3:
-                    url, title, full_text = item
-                else:
-                    url, title = item
-                    full_text = title
+            card_count = 0
+            known_count = 0
+            for idx, card in enumerate(cards_to_process, 1):
+                url, title, full_text = card['url'], card['title'], card['full_text']
                 
-                # Check for duplicate URLs first (fast check)
-                if skip_duplicates and url in self.processed_urls:
-                    print(f"    [{idx}/{len(urls_to_process)}] Skipping: {title[:60]}... (duplicate URL)")
+                # Check for duplicates first, before anything is loaded (the other
+                # terms link the same tender with another search_id)
+                if skip_duplicates and self.is_duplicate(url, card.get('url_id')):
+                    print(f"    [{idx}/{len(cards_to_process)}] Skipping: {title[:60]}... (duplicate)")
                     duplicate_count += 1
+                    self.progress.card('duplicate', title)
                     continue
                 
                 # Early filtering - check full text (title + description) before opening detail page
-                if early_filter and filter_keywords:
-                    if self.should_skip_result(full_text, filter_keywords, exclude_keywords, use_word_boundaries):
-                        print(f"    [{idx}/{len(urls_to_process)}] Skipping: {title[:60]}... (no keyword match)")
+                # (always applied without detail pages, the filter decides what is kept)
+                if (early_filter or detail_mode != 'full') and self.filter_active(filter_keywords):
+                    if self.should_skip_result(full_text, filter_keywords, exclude_keywords, use_word_boundaries, url=url):
+                        print(f"    [{idx}/{len(cards_to_process)}] Skipping: {title[:60]}... (no keyword match)")
                         skipped_count += 1
+                        self.progress.card('skipped', title)
                         continue
                 
-                print(f"    [{idx}/{len(urls_to_process)}] Processing: {title[:60]}...")
+                if self.term_planner:
+                    self.term_planner.record_passed(search_term)
+                
+                # Skip the detail page of tenders loaded in an earlier run
+                if seen_index:
+                    fetch, reason = seen_index.should_fetch(url, known_tenders.get('revalidate_hours', 24))
+                    seen_index.mark_seen(url)
+                    stored = None
+                    if not fetch:
+                        store = self.get_tender_store()
+                        stored = store.get_tender(url=url, as_result=True) if store else None
+                    if stored:
+                        known_count += 1
+                        print(f"    [{idx}/{len(cards_to_process)}] Known: {title[:60]}... (from database)")
+                        stored['search_term'] = search_term
+                        if self.collect_result(stored):
+                            results_found += 1
+                        self.progress.card('known', title)
+                        continue
+                    # Seen before but not in the database (e.g. a bloom filter false
+                    # positive or a run without a store): load it like a new tender
+                    if not fetch:
+                        print(f"    [{idx}/{len(cards_to_process)}] Not in database: {title[:60]}... (loading again)")
+                    elif reason == 'revalidate':
+                        print(f"    [{idx}/{len(cards_to_process)}] Revalidating: {title[:60]}...")
+                
+                # Build the result from the card when the detail page is not needed
+                if detail_mode in ('lazy', 'list_only'):
+                    partial = card_to_result(card, search_term)
+                    missing = [field for field in required_fields if not partial.get(field)]
+                    if detail_mode == 'list_only' or not missing:
+                        print(f"    [{idx}/{len(cards_to_process)}] From list: {title[:60]}...")
+                        if self.collect_result(partial):
+                            results_found += 1
+                            card_count += 1
+                        self.progress.card('result', title)
+                        continue
+                    print(f"    [{idx}/{len(cards_to_process)}] Missing {', '.join(missing)} - opening details")
+                
+                print(f"    [{idx}/{len(cards_to_process)}] Processing: {title[:60]}...")
                 processed = self.extract_order_details(url, search_term)
-                if processed:
-                    results_found += 1
+                if processed is None:
+                    queued_count += 1
+                else:
+                    if processed:
+                        results_found += 1
+                    self.progress.card('result' if processed else 'failed', title)
                 
                 # Optional wait between results
                 wait_time = self.config.get_timing('wait_between_results')
                 if wait_time > 0:
                     time.sleep(wait_time)
             
+            self.progress.end_page()
+            if card_count > 0:
+                print(f"    Built {card_count} results from the list without opening details")
             if skipped_count > 0:
                 print(f"    Skipped {skipped_count} results (no keyword match)")
             if duplicate_count > 0:
                 print(f"    Skipped {duplicate_count} duplicates")
+            if known_count > 0:
+                print(f"    Skipped {known_count} detail pages loaded in earlier runs")
+            
+            # Stop paging when this term only returns tenders earlier terms found
+            if self.term_planner and not self.term_planner.should_continue(search_term, page):
+                print(f"    → Stopping '{search_term}': {self.term_planner.run[search_term]['reason']}")
+                break
             
             # Try next page
             if not self.go_to_next_page():
@@ -376,16 +422,49 @@ class EvergabeScraper:
             page += 1
             # No extra wait needed - page load handles it
         
-        print(f"  Total results for '{search_term}': {results_found}")
+        if queued_count:
+            found = results_found + self.collected_by_term.get(search_term, 0)
+            print(f"  Total results for '{search_term}': {found} so far "
+                  f"({queued_count} detail pages handed to the background parsers)")
+        else:
+            print(f"  Total results for '{search_term}': {results_found}")
     
     def extract_order_details(self, url, search_term):
         """Extract detailed information from an order page
         
+        With performance.parallel_details enabled the fetched page is handed
+        to the detail pipeline and parsed in a worker process; the result is
+        collected asynchronously.
+        
         Returns:
-            bool: True if successfully processed, False if skipped (duplicate or error)
+            bool: True if successfully processed, False if skipped (duplicate or error),
+                  None if queued for the detail pipeline (see collect_parsed)
         """
-        skip_duplicates = self.config.get('search.skip_duplicates', True)
+        html = self.fetch_order_page(url)
+        if html is None:
+            return False
+        
+        if self.detail_pipeline:
+            try:
+                # Blocks while the parsers are behind (backpressure)
+                self.detail_pipeline.put(html, url, search_term)
+                return None
+            except RuntimeError as e:
+                print(f"      ✗ {e} - parsing in this process")
         
+        try:
+            info = parse_order_details(html, url, search_term)
+        except Exception as e:
+            print(f"      ✗ Error extracting details: {e}")
+            return False
+        return self.collect_result(info)
+    
+    def fetch_order_page(self, url):
+        """Load an order page in a new tab and return its HTML
+        
+        Returns:
+            str: Page source, or None if not logged in or on error
+        """
         try:
             # Open in new tab
             self.driver.execute_script("window.open('');")
@@ -403,278 +482,24 @@ class EvergabeScraper:
             # Check if logged in
             if 'anmelden' in self.driver.current_url.lower():
                 print("      ✗ Not logged in - skipping details")
-                self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[0])
-                return False
-            
-            # Parse the page
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Extract information
-            info = {
-                'search_term': search_term,
-                'url': url,
-                'scraped_at': datetime.now().isoformat(),
-                'title': '',
-                'description': '',
-                'contracting_authority': '',
-                'location': '',
-                'deadline': '',
-                'cpv_codes': '',
-                'reference': '',
-                'vergabe_id': '',
-                'procedure_type': '',
-                'period_of_performance': '',
-                'documents': []
-            }
-            
-            # Get title from H1
-            h1 = soup.find('h1', class_='header-flex__headline')
-            if not h1:
-                h1 = soup.find('h1')
-            if h1:
-                info['title'] = h1.get_text(strip=True)
-            
-            # Get description from the "Ausgeschriebene Leistung" section
-            desc_section = soup.find('div', id='award_procedure_details')
-            if desc_section:
-                desc_text = desc_section.find('p', class_='shorttext')
-                if desc_text:
-                    info['description'] = desc_text.get_text(strip=True)
-            
-            # Get contracting authority (Auftraggeber)
-            authority_section = soup.find('div', id='contracting_authority')
-            if authority_section:
-                # Look for the full authority text including all details
-                authority_text = []
-                # Get all p tags with authority information
-                for p_tag in authority_section.find_all('p'):
-                    text = p_tag.get_text(strip=True)
-                    if text:
-                        authority_text.append(text)
-                if authority_text:
-                    info['contracting_authority'] = ', '.join(authority_text)
-            
-            # Alternative: look for Auftraggeber header
-            if not info['contracting_authority']:
-                auftraggeber = soup.find(text=lambda x: x and 'Auftraggeber' in x)
-                if auftraggeber:
-                    parent = auftraggeber.find_parent()
-                    if parent:
-                        next_elem = parent.find_next_sibling()
-                        if next_elem:
-                            info['contracting_authority'] = next_elem.get_text(strip=True)
-            
-            # Get location from "Ausführungsort" section
-            location_section = soup.find('div', id='award_procedure_places')
-            if location_section:
-                # Get all location-related text elements
-                location_parts = []
-                seen_texts = set()  # Track unique texts to avoid duplicates
-                
-                # Look for all p tags and spans with location info
-                for elem in location_section.find_all(['p', 'span']):
-                    text = elem.get_text(strip=True)
-                    # Skip UI elements, headers, and duplicates
-                    skip_terms = ['Ausführungsort', 'Karte anzeigen', 'mehr anzeigen', 
-                                 'weniger anzeigen', 'anzeigen', '(1)', '(2)', '(3)']
-                    
-                    if text and not any(skip in text for skip in skip_terms) and len(text) > 2:
-                        # Clean up the text
-                        text = text.replace('Karte anzeigen', '').strip()
-                        text = text.replace('mehr anzeigen', '').strip()
-                        
-                        # Only add if not already seen (avoid duplicates)
-                        if text not in seen_texts:
-                            seen_texts.add(text)
-                            # Special handling for postal code + city + distance
-                            if 'km)' in text:
-                                # This is likely "04103 Leipzig (387 km)" format
-                                location_parts.append(text)
-                            elif text not in str(location_parts):  # Avoid substring duplicates
-                                location_parts.append(text)
+                html = None
+            else:
+                html = self.driver.page_source
+                # Mark URL as processed so it is never fetched twice
+                self.mark_processed(url)
+                if self.seen_index:
+                    self.seen_index.mark_seen(url, fetched=True)
                 
-                # Clean and join location parts
-                if location_parts:
-                    # Remove any duplicate substrings
-                    cleaned_parts = []
-                    for part in location_parts:
-                        is_duplicate = False
-                        for other in location_parts:
-                            if part != other and part in other:
-                                is_duplicate = True
-                                break
-                        if not is_duplicate:
-                            cleaned_parts.append(part)
-                    
-                    info['location'] = ', '.join(cleaned_parts)
-                else:
-                    # Fallback: try to get any text from the section
-                    location_text = location_section.get_text(separator=' ', strip=True)
-                    # Clean up common UI elements
-                    for term in ['Ausführungsort', 'Karte anzeigen', 'mehr anzeigen', '(1)']:
-                        location_text = location_text.replace(term, ' ')
-                    location_text = ' '.join(location_text.split())  # Clean whitespace
-                    if location_text.strip():
-                        info['location'] = location_text.strip()
-            
-            # Get deadline (Angebotsfrist)
-            deadline_elem = soup.find('strong', class_='counter-headline', text='Angebotsfrist')
-            if deadline_elem:
-                deadline_parent = deadline_elem.find_parent()
-                if deadline_parent:
-                    deadline_span = deadline_parent.find_next('span', class_='d-block')
-                    if deadline_span:
-                        info['deadline'] = deadline_span.get_text(strip=True)
-            
-            # Get reference number (Vergabenummer) and Vergabe-ID
-            ref_section = soup.find('div', id='file_number_contracting_authority')
-            if ref_section:
-                # Look for all h2 headers and their values
-                h2_tags = ref_section.find_all('h2')
-                for h2 in h2_tags:
-                    header_text = h2.get_text(strip=True)
-                    
-                    # Check for Vergabenummer
-                    if 'Vergabe' in header_text and 'nummer' in header_text:
-                        # Look for the value - it might be in a p tag or as direct text
-                        next_elem = h2.find_next_sibling()
-                        if next_elem:
-                            value = next_elem.get_text(strip=True)
-                            # Filter out the header text if it's repeated
-                            if value and not 'Auftraggebers' in value and value != header_text:
-                                info['reference'] = value
-                        else:
-                            # Try to get text after the h2
-                            parent = h2.parent
-                            if parent:
-                                full_text = parent.get_text(strip=True)
-                                # Split by the header and get what comes after
-                                parts = full_text.split(header_text)
-                                if len(parts) > 1:
-                                    value = parts[1].strip()
-                                    # Take the first line if multiple lines
-                                    if '\n' in value:
-                                        value = value.split('\n')[0].strip()
-                                    if value and not 'bei evergabe' in value:
-                                        info['reference'] = value
-                    
-                    # Check for Vergabe-ID
-                    elif 'Vergabe-ID' in header_text:
-                        # Look for the value
-                        next_elem = h2.find_next_sibling()
-                        if next_elem:
-                            value = next_elem.get_text(strip=True)
-                            # Filter out the header text if it's repeated
-                            if value and not 'evergabe.de' in value and value != header_text:
-                                info['vergabe_id'] = value
-                        else:
-                            # Try to get text after the h2
-                            parent = h2.parent
-                            if parent:
-                                full_text = parent.get_text(strip=True)
-                                # Split by the header and get what comes after
-                                parts = full_text.split(header_text)
-                                if len(parts) > 1:
-                                    value = parts[1].strip()
-                                    # Extract just numbers
-                                    import re
-                                    match = re.search(r'\d+', value)
-                                    if match:
-                                        info['vergabe_id'] = match.group()
-            
-            # If still not found, try a more aggressive search
-            if not info['reference'] or info['reference'] == '(des Auftraggebers)':
-                # Look for pattern like "25A60179" - alphanumeric codes
-                import re
-                # Look for codes that look like reference numbers
-                text = soup.get_text()
-                # Pattern for reference numbers (mix of letters and numbers, 5-15 chars)
-                matches = re.findall(r'\b[A-Z0-9]{5,15}\b', text)
-                for match in matches:
-                    # Check if this looks like a reference (has both letters and numbers)
-                    if any(c.isalpha() for c in match) and any(c.isdigit() for c in match):
-                        # Check if it's near "Vergabenummer" text
-                        if 'Vergabenummer' in text:
-                            idx = text.find('Vergabenummer')
-                            match_idx = text.find(match)
-                            if abs(match_idx - idx) < 200:  # Within 200 chars
-                                info['reference'] = match
-                                break
-            
-            if not info['vergabe_id'] or info['vergabe_id'] == '(bei evergabe.de)':
-                # Look for 7-digit numbers that could be Vergabe-IDs
-                import re
-                text = soup.get_text()
-                # Pattern for Vergabe-ID (typically 7 digits)
-                matches = re.findall(r'\b\d{6,8}\b', text)
-                for match in matches:
-                    # Check if it's near "Vergabe-ID" text
-                    if 'Vergabe-ID' in text:
-                        idx = text.find('Vergabe-ID')
-                        match_idx = text.find(match)
-                        if abs(match_idx - idx) < 200:  # Within 200 chars
-                            info['vergabe_id'] = match
-                            break
-            
-            # Get procedure type
-            type_section = soup.find('div', id='award_procedure_type')
-            if type_section:
-                type_span = type_section.find('span', text=lambda x: x and 'Ausschreibung' in x if x else False)
-                if type_span:
-                    info['procedure_type'] = type_span.get_text(strip=True)
-            
-            # Get period of performance
-            period_section = soup.find('div', id='period_of_performance')
-            if period_section:
-                period_span = period_section.find('span')
-                if period_span:
-                    info['period_of_performance'] = period_span.get_text(strip=True)
-            
-            # Get CPV codes from badges
-            cpv_badges = soup.find_all('a', class_='badge-primary-ultra-light', href=lambda x: x and 'craft_code_ids' in x)
-            if cpv_badges:
-                cpv_list = [badge.find('span', class_='link-text').get_text(strip=True) for badge in cpv_badges if badge.find('span', class_='link-text')]
-                info['cpv_codes'] = ', '.join(cpv_list)
-            
-            # Find document links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if any(ext in href.lower() for ext in ['.pdf', '.doc', '.docx', '.zip']) or 'herunterladen' in href:
-                    if not href.startswith('http'):
-                        href = f"https://www.evergabe.de{href}"
-                    doc_name = link.get_text(strip=True) or 'Document'
-                    if doc_name and 'PDF' not in doc_name and len(doc_name) > 3:
-                        info['documents'].append({
-                            'name': doc_name,
-                            'url': href
-                        })
-            
-            # Check for duplicate vergabe_id before adding to results
-            if skip_duplicates and info['vergabe_id']:
-                if info['vergabe_id'] in self.processed_vergabe_ids:
-                    print(f"      ✗ Duplicate vergabe_id: {info['vergabe_id']} - skipping")
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[0])
-                    return False
-                self.processed_vergabe_ids.add(info['vergabe_id'])
-            
-            # Mark URL as processed
-            self.processed_urls.add(url)
-            
-            # Add to results
-            self.results.append(info)
-            print(f"      ✓ Extracted: {info['title'][:50]}")
-            print(f"         Authority: {info['contracting_authority'][:50] if info['contracting_authority'] else 'N/A'}")
-            print(f"         Location: {info['location'] if info['location'] else 'N/A'}")
-            print(f"         Deadline: {info['deadline'] if info['deadline'] else 'N/A'}")
-            if info['vergabe_id']:
-                print(f"         Vergabe-ID: {info['vergabe_id']}")
+                # Debug: Save detail page HTML (seeds the parser benchmark corpus)
+                if self.config.should_save_debug_html():
+                    page_id = url.rstrip('/').split('/')[-1].split('?')[0]
+                    with open(f'debug_detail_{page_id}.html', 'w', encoding='utf-8') as f:
+                        f.write(html)
             
             # Close tab and return
             self.driver.close()
             self.driver.switch_to.window(self.driver.window_handles[0])
-            return True
+            return html
             
         except Exception as e:
             print(f"      ✗ Error extracting details: {e}")
@@ -684,7 +509,102 @@ class EvergabeScraper:
                     self.driver.switch_to.window(self.driver.window_handles[0])
             except:
                 pass
-            return False
+            return None
+    
+    def is_duplicate(self, url, tender_number=None):
+        """Check whether a tender was already processed in this run (by the URL's tender number or canonical URL)"""
+        tender_number = tender_number or url_id(url)
+        if tender_number and tender_number in self.processed_url_ids:
+            return True
+        return canonical_url(url) in self.processed_urls
+    
+    def mark_processed(self, url):
+        """Remember a tender URL and its tender number as processed"""
+        self.processed_urls.add(canonical_url(url))
+        tender_number = url_id(url)
+        if tender_number:
+            self.processed_url_ids.add(tender_number)
+    
+    def collect_parsed(self, info):
+        """Collector of the detail pipeline: add a parsed result and count it for its term"""
+        added = self.collect_result(info)
+        if added:
+            with self.processed_lock:
+                term = info.get('search_term', '')
+                self.collected_by_term[term] = self.collected_by_term.get(term, 0) + 1
+        self.progress.card('result' if added else 'duplicate', info.get('title', ''))
+        return added
+    
+    def collect_result(self, info):
+        """Deduplicate and store a parsed result
+        
+        Returns:
+            bool: True if the result was added, False if it was a duplicate
+        """
+        skip_duplicates = self.config.get('search.skip_duplicates', True)
+        
+        with self.processed_lock:
+            # Check for duplicate vergabe_id before adding to results
+            if skip_duplicates and info['vergabe_id']:
+                if info['vergabe_id'] in self.processed_vergabe_ids:
+                    print(f"      ✗ Duplicate vergabe_id: {info['vergabe_id']} - skipping")
+                    return False
+                self.processed_vergabe_ids.add(info['vergabe_id'])
+            
+            # Mark URL as processed
+            self.mark_processed(info['url'])
+            
+            # Add to results
+            self.results.append(info)
+        print(f"      ✓ Extracted: {info['title'][:50]}")
+        print(f"         Authority: {info['contracting_authority'][:50] if info['contracting_authority'] else 'N/A'}")
+        print(f"         Location: {info['location'] if info['location'] else 'N/A'}")
+        print(f"         Deadline: {info['deadline'] if info['deadline'] else 'N/A'}")
+        if info['vergabe_id']:
+            print(f"         Vergabe-ID: {info['vergabe_id']}")
+        return True
+    
+    def load_missing_details(self, results, indices=None):
+        """Open the detail pages of results that were built from the result list
+        
+        Args:
+            results: List of result dicts (updated in place)
+            indices: Only load these indices (default: all partial results)
+        
+        Returns:
+            list: Indices of the results completed with detail page data
+        """
+        if indices is None:
+            indices = [i for i, result in enumerate(results) if result.get('details_loaded') is False]
+        
+        if not indices or not self.ensure_logged_in():
+            return []
+        
+        loaded = []
+        for count, index in enumerate(indices, 1):
+            if not 0 <= index < len(results):
+                print(f"  ✗ Invalid index: {index}")
+                continue
+            partial = results[index]
+            print(f"  [{count}/{len(indices)}] Loading details: {partial.get('title', '')[:60]}...")
+            html = self.fetch_order_page(partial['url'])
+            if html is None:
+                continue
+            try:
+                info = parse_order_details(html, partial['url'], partial.get('search_term', ''))
+            except Exception as e:
+                print(f"      ✗ Error extracting details: {e}")
+                continue
+            # Keep what the viewer added (e.g. ai_summary) and card values the page lacks
+            for key, value in partial.items():
+                if key not in info or (not info[key] and value):
+                    info[key] = value
+            info['details_loaded'] = True
+            results[index] = info
+            loaded.append(index)
+            print(f"      ✓ Completed: {info['title'][:50]}")
+            self.progress.details(count, len(indices), info['title'])
+        return loaded
     
     def go_to_next_page(self):
         """Navigate to next page of results"""
@@ -746,43 +666,49 @@ class EvergabeScraper:
             print(f"    ✗ Error navigating to next page: {e}")
             return False
     
-    def should_skip_result(self, text, filter_keywords, exclude_keywords, use_word_boundaries=True):
+    def get_keyword_matcher(self, filter_keywords, exclude_keywords, use_word_boundaries=True):
+        """Get the compiled keyword matcher for these keyword lists (built once)
+        
+        With search.match_mode "morphological" the root based matcher from
+        search.morphology is used and filter_keywords are ignored.
+        """
+        if self.config.get('search.match_mode', 'keywords') == 'morphological':
+            key = ('morphological', tuple(exclude_keywords or ()), bool(use_word_boundaries))
+            matcher = self.keyword_matchers.get(key)
+            if matcher is None:
+                matcher = CompoundMatcher.from_config(self.config, exclude_keywords, use_word_boundaries)
+                self.keyword_matchers[key] = matcher
+            return matcher
+        
+        key = (tuple(filter_keywords or ()), tuple(exclude_keywords or ()), bool(use_word_boundaries))
+        matcher = self.keyword_matchers.get(key)
+        if matcher is None:
+            matcher = KeywordMatcher(filter_keywords, exclude_keywords, use_word_boundaries)
+            self.keyword_matchers[key] = matcher
+        return matcher
+    
+    def filter_active(self, filter_keywords):
+        """True if results are filtered at all (keywords given or morphological mode)"""
+        if self.config.get('search.match_mode', 'keywords') == 'morphological':
+            return True
+        return bool(filter_keywords)
+    
+    def should_skip_result(self, text, filter_keywords, exclude_keywords, use_word_boundaries=True, url=None):
         """Check if a result should be skipped based on title/preview text
         
         Returns True if result should be skipped, False if it should be processed
         """
-        import re
-        
-        if not filter_keywords:
+        if not self.filter_active(filter_keywords):
             return False  # No filtering, process everything
         
-        text_lower = text.lower()
-        
-        # First check exclusions - if any exclusion keyword is found, skip
-        if exclude_keywords:  # Check if exclude_keywords is not None/empty
-            for ex_keyword in exclude_keywords:
-                ex_keyword = ex_keyword.lower()
-                if use_word_boundaries:
-                    pattern = r'\b' + re.escape(ex_keyword) + r'\b'
-                    if re.search(pattern, text_lower, re.IGNORECASE):
-                        return True  # Skip this result
-                else:
-                    if ex_keyword in text_lower:
-                        return True  # Skip this result
-        
-        # Check if any inclusion keyword matches
-        for keyword in filter_keywords:
-            keyword = keyword.lower()
-            if use_word_boundaries:
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    return False  # Don't skip, keyword found
-            else:
-                if keyword in text_lower:
-                    return False  # Don't skip, keyword found
+        matcher = self.get_keyword_matcher(filter_keywords, exclude_keywords, use_word_boundaries)
+        if self.keyword_stats is None:
+            return matcher.should_skip(text)
         
-        # No inclusion keywords matched, skip this result
-        return True
+        # Collect all keywords for the hit statistics
+        match = matcher.match(text)
+        self.keyword_stats.record('early', match.matched_keywords, relevant=False, url=url)
+        return not match.relevant
     
     def filter_relevant(self, keywords=None, use_word_boundaries=None, exclude_keywords=None):
         """Filter results for relevant streetlamp orders
@@ -792,8 +718,6 @@ class EvergabeScraper:
             use_word_boundaries: If True, match whole words only (avoid LED matching Leder)
             exclude_keywords: List of keywords to exclude (remove if contains any)
         """
-        import re
-        
         if keywords is None:
             keywords = self.config.get('search.filter_keywords', 
                                       ['straßen', 'lampe', 'leuchte', 'led', 'beleuchtung', 'licht'])
@@ -804,107 +728,91 @@ class EvergabeScraper:
         if exclude_keywords is None:
             exclude_keywords = self.config.get('search.exclude_keywords', [])
         
+        # Same compiled matcher as the early filter
+        matcher = self.get_keyword_matcher(keywords, exclude_keywords, use_word_boundaries)
+        
         filtered = []
         for result in self.results:
-            text = f"{result.get('title', '')} {result.get('description', '')}".lower()
-            
-            # First check exclusions - if any exclusion keyword is found, skip this result
-            exclude = False
-            if exclude_keywords:  # Check if exclude_keywords is not None/empty
-                for ex_keyword in exclude_keywords:
-                    ex_keyword = ex_keyword.lower()
-                    if use_word_boundaries:
-                        pattern = r'\b' + re.escape(ex_keyword) + r'\b'
-                        if re.search(pattern, text, re.IGNORECASE):
-                            exclude = True
-                            break
-                    else:
-                        if ex_keyword in text:
-                            exclude = True
-                            break
-            
-            if exclude:
-                continue  # Skip this result
-            
-            # Check if any inclusion keyword matches
-            match_found = False
-            for keyword in keywords:
-                keyword = keyword.lower()
-                
-                if use_word_boundaries:
-                    # Use word boundary regex to match whole words only
-                    # \b ensures we match word boundaries
-                    # This prevents LED from matching Leder or lediglich
-                    pattern = r'\b' + re.escape(keyword) + r'\b'
-                    if re.search(pattern, text, re.IGNORECASE):
-                        match_found = True
-                        break
-                else:
-                    # Simple substring match (old behavior)
-                    if keyword in text:
-                        match_found = True
-                        break
-            
-            if match_found:
+            text = f"{result.get('title', '')} {result.get('description', '')}"
+            if self.keyword_stats is None:
+                relevant = matcher.is_relevant(text)
+            else:
+                match = matcher.match(text)
+                relevant = match.relevant
+                self.keyword_stats.record('late', match.matched_keywords, relevant, url=result.get('url'))
+            if relevant:
                 filtered.append(result)
         
+        if self.term_planner:
+            self.term_planner.record_relevant(canonical_url(result.get('url')) for result in filtered)
+            self.relevance_recorded = True
+        
         return filtered
     
+    def get_tender_store(self):
+        """Get the tender database (None if output.database is empty)"""
+        if self.tender_store is None:
+            database = self.config.get('output.database', 'tenders.db')
+            if not database:
+                return None
+            self.tender_store = TenderStore(os.path.join(self.config.get_output_directory(), database))
+        return self.tender_store
+    
+    def get_seen_index(self):
+        """Get the index of tenders seen in earlier runs (None if search.known_tenders is disabled)"""
+        if self.seen_index is None:
+            if not (self.config.get('search.known_tenders', {}) or {}).get('enabled', True):
+                return None
+            self.seen_index = SeenIndex(self.config.get_output_directory())
+        return self.seen_index
+    
+    def get_base_name(self):
+        """File name of this run's results, without extension"""
+        if self.config.get('output.include_timestamp', True):
+            return f"evergabe_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return 'evergabe_results'
+    
     def save_results(self):
-        """Save results to files"""
+        """Save results to the tender database and export files
+        
+        The exports are written from the JSONL file one result at a time.
+        """
         if not self.results:
             print("\nNo results to save")
             return
         
-        # Ensure output directory exists
-        output_dir = self.config.get_output_directory()
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Generate filename
-        if self.config.get('output.include_timestamp', True):
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            base_name = f'evergabe_results_{timestamp}'
-        else:
-            base_name = 'evergabe_results'
-        
-        formats = self.config.get_output_formats()
-        
-        # Save JSON
-        if 'json' in formats:
-            json_file = os.path.join(output_dir, f'{base_name}.json')
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, ensure_ascii=False, indent=2)
-            print(f"\n✓ Saved {len(self.results)} results to {json_file}")
-        
-        # Save Excel
-        if 'excel' in formats:
-            excel_file = os.path.join(output_dir, f'{base_name}.xlsx')
-            df = pd.DataFrame(self.results)
-            
-            # Handle documents column
-            if 'documents' in df.columns:
-                df['documents'] = df['documents'].apply(
-                    lambda x: '\n'.join([d['name'] for d in x]) if isinstance(x, list) else ''
-                )
-            
-            df.to_excel(excel_file, index=False)
-            print(f"✓ Saved results to {excel_file}")
+        export_run(
+            self.results, self.config.get_output_directory(), self.base_name,
+            self.config.get_output_formats(), store=self.get_tender_store(),
+            search_terms=self.search_terms_used,
+            parquet_dir=self.config.get('output.parquet_directory', 'parquet'),
+            compression=self.config.get('output.compression', 'none')
+        )
+        self.results_saved = True
         
-        # Save CSV
-        if 'csv' in formats:
-            csv_file = os.path.join(output_dir, f'{base_name}.csv')
-            df = pd.DataFrame(self.results)
-            
-            # Handle documents column
-            if 'documents' in df.columns:
-                df['documents'] = df['documents'].apply(
-                    lambda x: '\n'.join([d['name'] for d in x]) if isinstance(x, list) else ''
-                )
-            
-            df.to_csv(csv_file, index=False, encoding='utf-8-sig')
-            print(f"✓ Saved results to {csv_file}")
+        # Let the viewer list the new run without rescanning the output directory
+        store = self.get_tender_store()
+        if store:
+            ResultCatalog(store, self.config.get_output_directory()).refresh(force=True)
     
     def close(self):
         """Close the browser"""
+        if self.keyword_stats:
+            self.keyword_stats.save()
+        if self.term_planner:
+            # An interrupted run has no relevance credits yet; storing its pages
+            # would lower the expected relevant results of every page it loaded
+            if self.relevance_recorded:
+                self.term_planner.finish()
+            else:
+                print("→ Term statistics of this run discarded (final filter did not run)")
+        if self.seen_index:
+            self.seen_index.close()
+        # Keep the JSONL of an unsaved run (python run.py --recover FILE)
+        if self.results_saved or not self.results:
+            self.results.remove()
+        else:
+            self.results.close()
+            print(f"\n→ Unsaved results kept in {self.results.path}")
         self.driver.quit()
         print("\n✓ Browser closed")
\ No newline at end of file
@@ -1,71 +1,172 @@
 // Global variables
+// Only the visible result card is in the page. Cards are fetched from
+// /api/results in pages around the current position and kept in cardCache.
+const PAGE_SIZE = 10;
+const PREFETCH = 3;
+let currentFile = null;
 let currentIndex = 0;
-let allResults = [];
-let filteredResults = [];
-let isSearching = false;
+let totalResults = 0;
+let currentSort = '';
+let currentFilter = '';
+let cardCache = new Map();  // position -> {index, html}
+let pendingPages = new Map();  // page offset -> fetch promise (while loading)
+let searchTimer = null;
 
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
-    // Get all result cards
-    const cards = document.querySelectorAll('.result-card');
-    allResults = Array.from(cards);
-    filteredResults = [...allResults];
+    const cards = document.getElementById('result-cards');
+    currentFile = cards.dataset.file || null;
+    totalResults = parseInt(cards.dataset.total) || 0;
+    
+    // The first card is rendered by the server
+    const firstCard = cards.querySelector('.result-card');
+    if (firstCard) {
+        cardCache.set(0, { index: parseInt(firstCard.dataset.index), html: firstCard.outerHTML });
+        renderMarkdown(firstCard);
+    }
     
     updateNavigation();
+    prefetchAround(0);
 });
 
+// Fetch the page of cards containing a position (once while it is loading)
+function fetchPage(position) {
+    const offset = Math.floor(position / PAGE_SIZE) * PAGE_SIZE;
+    if (pendingPages.has(offset)) return pendingPages.get(offset);
+    
+    const params = new URLSearchParams({
+        file: currentFile || '', offset: offset, limit: PAGE_SIZE,
+        sort: currentSort, filter: currentFilter, html: 1
+    });
+    const generation = cardCache;
+    const pages = pendingPages;
+    const request = fetch(`/api/results?${params}`)
+        .then(response => response.json())
+        .then(data => {
+            // Ignore answers for an older sort order or search
+            if (generation !== cardCache) return;
+            totalResults = data.total;
+            data.results.forEach((item, i) => {
+                cardCache.set(offset + i, { index: item.index, html: item.html });
+            });
+        })
+        .catch(error => {
+            console.error('Error loading results:', error);
+        })
+        .finally(() => pages.delete(offset));
+    pendingPages.set(offset, request);
+    return request;
+}
+
+// Load the cards next to a position in the background
+function prefetchAround(position) {
+    for (let distance = 1; distance <= PREFETCH; distance++) {
+        [position + distance, position - distance].forEach(neighbour => {
+            if (neighbour >= 0 && neighbour < totalResults && !cardCache.has(neighbour)) {
+                fetchPage(neighbour);
+            }
+        });
+    }
+}
+
+// Convert the AI summaries of a card from markdown
+function renderMarkdown(card) {
+    card.querySelectorAll('[data-markdown]').forEach(element => {
+        element.innerHTML = convertMarkdownToHTML(element.dataset.markdown);
+    });
+}
+
+// Show the card at a position (fetching it if needed)
+async function showCard(position) {
+    const container = document.getElementById('result-cards');
+    if (!cardCache.has(position)) {
+        await fetchPage(position);
+    }
+    // Another card may have been requested in the meantime
+    if (position !== currentIndex) return;
+    
+    const card = cardCache.get(position);
+    container.innerHTML = card ? card.html : '';
+    const element = container.querySelector('.result-card');
+    if (element) {
+        renderMarkdown(element);
+        element.scrollIntoView({ behavior: 'smooth', block: 'start' });
+    }
+    
+    updateNavigation();
+    prefetchAround(position);
+}
+
+// Drop all cached cards (new sort order or search)
+function resetCards() {
+    cardCache = new Map();
+    pendingPages = new Map();
+}
+
+// Drop the cached card of a result so it is fetched again (e.g. with a new summary)
+function forgetResult(index) {
+    cardCache.forEach((card, position) => {
+        if (card.index === index) cardCache.delete(position);
+    });
+}
+
 // Navigation functions
 function navigate(direction) {
-    const results = isSearching ? filteredResults : allResults;
-    
-    if (results.length === 0) return;
-    
-    // Hide current card
-    if (results[currentIndex]) {
-        results[currentIndex].style.display = 'none';
-    }
+    if (totalResults === 0) return;
     
     // Update index
     currentIndex += direction;
     
     // Wrap around
     if (currentIndex < 0) {
-        currentIndex = results.length - 1;
-    } else if (currentIndex >= results.length) {
+        currentIndex = totalResults - 1;
+    } else if (currentIndex >= totalResults) {
         currentIndex = 0;
     }
     
-    // Show new card
-    if (results[currentIndex]) {
-        results[currentIndex].style.display = 'block';
-        results[currentIndex].scrollIntoView({ behavior: 'smooth', block: 'start' });
-    }
-    
     updateNavigation();
+    showCard(currentIndex);
 }
 
 function updateNavigation() {
-    const results = isSearching ? filteredResults : allResults;
     const prevBtn = document.getElementById('prev-btn');
     const nextBtn = document.getElementById('next-btn');
     const position = document.getElementById('current-position');
     
-    if (results.length === 0) {
+    if (totalResults === 0) {
         position.textContent = '0 / 0';
         prevBtn.disabled = true;
         nextBtn.disabled = true;
         return;
     }
     
-    position.textContent = `${currentIndex + 1} / ${results.length}`;
+    position.textContent = `${currentIndex + 1} / ${totalResults}`;
     
     // Enable/disable buttons
-    prevBtn.disabled = results.length <= 1;
-    nextBtn.disabled = results.length <= 1;
+    prevBtn.disabled = totalResults <= 1;
+    nextBtn.disabled = totalResults <= 1;
+}
+
+// Reload the cards from the first position (new sort order or search)
+async function reloadCards() {
+    resetCards();
+    currentIndex = 0;
+    await fetchPage(0);
+    showCard(0);
 }
 
-// Search functionality
+function sortResults(sort) {
+    currentSort = sort;
+    reloadCards();
+}
+
+// Search functionality (on the server, debounced while typing)
 function searchResults() {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(runSearch, 250);
+}
+
+async function runSearch() {
     const searchInput = document.getElementById('search-input');
     const query = searchInput.value.toLowerCase().trim();
     const searchSummary = document.getElementById('search-summary');
@@ -75,59 +176,26 @@ function searchResults() {
         clearSearch();
         return;
     }
+    if (query === currentFilter) return;
     
-    isSearching = true;
-    
-    // Hide all cards first
-    allResults.forEach(card => {
-        card.style.display = 'none';
-    });
-    
-    // Filter results based on search query
-    filteredResults = allResults.filter(card => {
-        const text = card.textContent.toLowerCase();
-        return text.includes(query);
-    });
-    
-    // Reset to first result
-    currentIndex = 0;
+    currentFilter = query;
+    await reloadCards();
     
-    // Show first filtered result
-    if (filteredResults.length > 0) {
-        filteredResults[0].style.display = 'block';
-        searchSummary.style.display = 'flex';
-        searchCount.textContent = filteredResults.length;
-    } else {
-        searchSummary.style.display = 'flex';
-        searchCount.textContent = '0';
-    }
-    
-    updateNavigation();
+    searchSummary.style.display = 'flex';
+    searchCount.textContent = totalResults;
 }
 
 function clearSearch() {
     const searchInput = document.getElementById('search-input');
     const searchSummary = document.getElementById('search-summary');
     
+    clearTimeout(searchTimer);
     searchInput.value = '';
     searchSummary.style.display = 'none';
-    isSearching = false;
+    if (!currentFilter) return;
     
-    // Hide all cards
-    allResults.forEach(card => {
-        card.style.display = 'none';
-    });
-    
-    // Reset filtered results
-    filteredResults = [...allResults];
-    currentIndex = 0;
-    
-    // Show first card
-    if (allResults.length > 0) {
-        allResults[0].style.display = 'block';
-    }
-    
-    updateNavigation();
+    currentFilter = '';
+    reloadCards();
 }
 
 // File loading
@@ -159,7 +227,7 @@ async function refreshFiles() {
             files.forEach(file => {
                 const option = document.createElement('option');
                 option.value = file.filename;
-                option.textContent = `${file.timestamp} (${(file.size / 1024).toFixed(1)} KB)`;
+                option.textContent = `${file.timestamp} (${file.count} Treffer, ${file.summaries} Zusammenfassungen, ${(file.size / 1024).toFixed(1)} KB)`;
                 fileSelect.appendChild(option);
             });
             
@@ -469,6 +537,7 @@ async function generateSummary(filename, index, force = false) {
                 `;
             }
             
+            forgetResult(index);
             showNotification(force ? 'AI-Zusammenfassung neu generiert!' : 'AI-Zusammenfassung generiert!');
         } else {
             // Show error
@@ -752,43 +821,42 @@ async function generateAllSummaries(forceRegenerate = false) {
         
         if (data.status === 'started') {
             const totalCount = data.total;
-            let processed = 0;
             
-            // Poll for progress
-            const pollInterval = setInterval(async () => {
-                try {
-                    const progressResponse = await fetch(`/api/batch-progress/${filename}`);
-                    const progressData = await progressResponse.json();
-                    
-                    processed = progressData.processed;
-                    const percentage = (processed / totalCount) * 100;
-                    
-                    // Update progress bar
-                    progressFill.style.width = percentage + '%';
-                    progressText.textContent = `${processed} / ${totalCount}`;
+            const onProgress = (progressData) => {
+                const processed = progressData.processed;
+                const percentage = totalCount ? (processed / totalCount) * 100 : 100;
+                
+                // Update progress bar
+                progressFill.style.width = percentage + '%';
+                progressText.textContent = `${processed} / ${totalCount}`;
+                if (progressData.event === 'summary' && progressData.title) {
+                    progressText.textContent += ` – ${progressData.title}`;
+                }
+                
+                // Check if complete
+                if (progressData.status === 'completed') {
+                    button.disabled = false;
+                    if (otherButton) otherButton.disabled = false;
+                    showNotification(`✅ Alle ${processed} Zusammenfassungen wurden generiert!`);
                     
-                    // Check if complete
-                    if (progressData.status === 'completed' || processed >= totalCount) {
-                        clearInterval(pollInterval);
-                        button.disabled = false;
-                        if (otherButton) otherButton.disabled = false;
-                        showNotification(`✅ Alle ${processed} Zusammenfassungen wurden generiert!`);
-                        
-                        // Reload page after 2 seconds to show new summaries
-                        setTimeout(() => {
-                            window.location.reload();
-                        }, 2000);
-                    } else if (progressData.status === 'error') {
-                        clearInterval(pollInterval);
-                        button.disabled = false;
-                        showNotification('❌ Fehler bei der Batch-Generierung');
-                    }
-                } catch (error) {
-                    console.error('Error polling progress:', error);
-                    clearInterval(pollInterval);
+                    // Reload page after 2 seconds to show new summaries
+                    setTimeout(() => {
+                        window.location.reload();
+                    }, 2000);
+                    return true;
+                } else if (progressData.status === 'error') {
                     button.disabled = false;
+                    if (otherButton) otherButton.disabled = false;
+                    showNotification('❌ Fehler bei der Batch-Generierung');
+                    return true;
                 }
-            }, 2000); // Poll every 2 seconds
+                return false;
+            };
+            
+            watchProgress(`/events/batch/${filename}`, `/api/batch-progress/${filename}`, onProgress, () => {
+                button.disabled = false;
+                if (otherButton) otherButton.disabled = false;
+            });
         } else {
             button.disabled = false;
             showNotification('Fehler beim Starten der Batch-Generierung');
@@ -890,42 +958,145 @@ async function runScraper() {
     }
 }
 
-// Check scraper status
-async function checkScraperStatus() {
-    const scraperBtn = document.getElementById('scraper-btn');
+// Load the detail page of a result built from the result list
+async function loadDetails(filename, index) {
     const statusDiv = document.getElementById('scraper-status');
     const statusText = statusDiv.querySelector('.scraper-status-text');
     
-    const checkInterval = setInterval(async () => {
-        try {
-            const response = await fetch('/scraper-status');
-            const data = await response.json();
+    try {
+        const response = await fetch(`/api/load-details/${filename}/${index}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            }
+        });
+        
+        const data = await response.json();
+        
+        if (data.status === 'started') {
+            statusText.textContent = 'Lade Details...';
+            statusDiv.classList.add('active');
+            // Reload the current file once the details are stored
+            checkScraperStatus(() => window.location.reload());
+        } else {
+            showNotification(data.message || 'Details konnten nicht geladen werden');
+        }
+    } catch (error) {
+        console.error('Error loading details:', error);
+        showNotification('Fehler beim Laden der Details');
+    }
+}
+
+// Follow progress pushed as Server-Sent Events, or poll if the browser or a proxy
+// does not support them. onEvent gets each event and returns true when done.
+function watchProgress(eventsUrl, pollUrl, onEvent, onFailure = null) {
+    let done = false;
+    
+    const poll = () => {
+        const pollInterval = setInterval(async () => {
+            try {
+                const response = await fetch(pollUrl);
+                if (onEvent(await response.json())) {
+                    clearInterval(pollInterval);
+                }
+            } catch (error) {
+                console.error('Error polling progress:', error);
+                if (onFailure) {
+                    clearInterval(pollInterval);
+                    onFailure();
+                }
+            }
+        }, 2000); // Poll every 2 seconds
+    };
+    
+    if (!window.EventSource) {
+        poll();
+        return;
+    }
+    
+    const source = new EventSource(eventsUrl);
+    source.onmessage = (message) => {
+        if (onEvent(JSON.parse(message.data))) {
+            done = true;
+            source.close();
+        }
+    };
+    source.onerror = () => {
+        source.close();
+        if (!done) poll();
+    };
+}
+
+// Format seconds as "12m 5s"
+function formatDuration(seconds) {
+    return `${Math.floor(seconds / 60)}m ${seconds % 60}s`;
+}
+
+// Status line for a progress event of the scraper
+function formatScraperEvent(event) {
+    switch (event.event) {
+        case 'start':
+            return `Starte Suche (${event.terms} Suchbegriffe)...`;
+        case 'term':
+            return `Suchbegriff ${event.term_index}/${event.terms}: ${event.term}`;
+        case 'page':
+        case 'card': {
+            let text = `${event.term} (${event.term_index}/${event.terms}), Seite ${event.page}: ` +
+                `${event.results} Treffer, ${event.skipped} gefiltert, ${event.duplicates} doppelt, ` +
+                `${event.cards_per_minute}/min`;
+            if (event.eta !== null) text += `, noch ca. ${formatDuration(event.eta)}`;
+            return text;
+        }
+        case 'details':
+            return `Details geladen: ${event.done}/${event.total}`;
+        case 'finished':
+            return 'Speichere Ergebnisse...';
+        default:
+            return event.progress || '';
+    }
+}
+
+// Check scraper status (pushed by /events/scraper, polling /scraper-status as fallback)
+function checkScraperStatus(onComplete = null) {
+    const statusDiv = document.getElementById('scraper-status');
+    const statusText = statusDiv.querySelector('.scraper-status-text');
+    
+    watchProgress('/events/scraper', '/scraper-status', (data) => {
+        // Structured progress event
+        if (data.event && data.event !== 'status') {
+            statusText.textContent = `Scraper läuft... ${formatScraperEvent(data)}`;
+            return false;
+        }
+        
+        if (data.status === 'completed') {
+            statusText.textContent = 'Scraper abgeschlossen!';
             
-            if (data.status === 'completed') {
-                clearInterval(checkInterval);
-                statusText.textContent = 'Scraper abgeschlossen!';
-                
-                // Refresh files after completion
-                setTimeout(() => {
-                    resetScraperButton();
+            // Refresh files after completion
+            setTimeout(() => {
+                resetScraperButton();
+                if (onComplete) {
+                    onComplete();
+                } else {
                     refreshFiles();
-                }, 2000);
-            } else if (data.status === 'error') {
-                clearInterval(checkInterval);
-                statusText.textContent = 'Fehler beim Scraping!';
-                setTimeout(() => {
-                    resetScraperButton();
-                }, 3000);
-            } else if (data.status === 'running') {
-                // Update status text with progress if available
-                if (data.progress) {
-                    statusText.textContent = `Scraper läuft... ${data.progress}`;
                 }
+            }, 2000);
+            return true;
+        } else if (data.status === 'error') {
+            statusText.textContent = 'Fehler beim Scraping!';
+            setTimeout(() => {
+                resetScraperButton();
+            }, 3000);
+            return true;
+        } else if (data.status === 'running') {
+            // Polled status: prefer the last structured event
+            if (data.event) {
+                statusText.textContent = `Scraper läuft... ${formatScraperEvent(data.event)}`;
+            } else if (data.progress) {
+                statusText.textContent = `Scraper läuft... ${data.progress}`;
             }
-        } catch (error) {
-            console.error('Error checking scraper status:', error);
         }
-    }, 2000); // Check every 2 seconds
+        return false;
+    });
 }
 
 // Reset scraper button to initial state
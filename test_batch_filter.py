@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test batch filtering over result DataFrames against the per-result matchers
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+import yaml
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.compound_matcher import CompoundMatcher
+from utils.batch_filter import load_results_frame, batch_filter
+
+WORDS = ['Straßenbeleuchtung', 'LED-Leuchten', 'Lichtenstein', 'Leder', 'Lampertheim', 'Flutlichtmasten',
+         'Gebäudereinigung', 'Mast', 'und', 'der', 'Stadt', 'Leuchtenaustausch', 'Masterstudium']
+
+def load_search_config():
+    """Load the search section of config.yaml"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml'), 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)['search']
+
+def random_results(count):
+    """Build random results from a small vocabulary"""
+    random.seed(7)
+    sentence = lambda: ' '.join(random.choice(WORDS) for _ in range(random.randint(1, 6)))
+    return [{'title': sentence(), 'description': sentence(), 'url': f'https://x/{n}', 'vergabe_id': str(n)}
+            for n in range(count)]
+
+def test_load_results_frame():
+    """Test loading several files with duplicates and a broken file"""
+    with tempfile.TemporaryDirectory() as directory:
+        old = [{'title': 'Alt', 'vergabe_id': '1', 'url': 'https://x/1'}]
+        new = [{'title': 'Neu', 'vergabe_id': '1', 'url': 'https://x/1'},
+               {'title': 'Ohne ID', 'vergabe_id': '', 'url': 'https://x/2'}]
+        for name, results in [('evergabe_results_20250101_000000.json', old),
+                              ('evergabe_results_20250102_000000.json', new)]:
+            with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+                json.dump(results, f)
+        with open(os.path.join(directory, 'evergabe_results_20250103_000000.json'), 'w') as f:
+            f.write('{broken')
+
+        df = load_results_frame(output_dir=directory)
+        print(f"  Loaded {len(df)} rows")
+        assert sorted(df['title']) == ['Neu', 'Ohne ID']
+        assert len(load_results_frame(output_dir=directory, drop_duplicates=False)) == 3
+
+def test_batch_equals_single_results():
+    """Test that masks and counts agree with matching result by result"""
+    search = load_search_config()
+    morphology = search['morphology']
+    results = random_results(500)
+    df = pd.DataFrame(results)
+
+    matchers = [
+        KeywordMatcher(search['filter_keywords'], ['leder', 'master']),
+        CompoundMatcher(morphology['roots'], morphology['tails'], morphology['words'],
+                        morphology['ignore'], ['leder'])
+    ]
+    for matcher in matchers:
+        batch = batch_filter(df, matcher)
+        counts = {}
+        for index, result in enumerate(results):
+            single = matcher.match(f"{result['title']} {result['description']}")
+            assert batch.relevant[index] == single.relevant, result
+            assert set(batch.matched[index]) == set(single.matched_keywords), result
+            for keyword in single.matched_keywords:
+                counts[keyword] = counts.get(keyword, 0) + 1
+        assert batch.keyword_counts.to_dict() == counts
+        print(f"  {type(matcher).__name__}: {batch.summary()}")
+
+if __name__ == "__main__":
+    test_load_results_frame()
+    test_batch_equals_single_results()
+    print("✅ Batch filter works as expected")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test compaction of result files and the retention policy
+"""
+
+import sys
+import os
+import json
+import gzip
+import tempfile
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.tender_store import TenderStore
+from utils.compaction import (
+    write_compact_dataset, read_compact, retention_candidates, apply_retention, unimported_files
+)
+
+def tender(n, **fields):
+    result = {
+        'url': f'https://www.evergabe.de/auftraege/auftrag-suchen/details/{n}?search_id=s{n}',
+        'title': f'Straßenbeleuchtung {n}',
+        'vergabe_id': str(n),
+        'deadline_iso': '2025-08-22T10:00:00+02:00',
+        'documents': [],
+    }
+    result.update(fields)
+    return result
+
+def write_run(directory, day, results):
+    base = os.path.join(directory, f'evergabe_results_202508{day:02d}_080000')
+    with open(base + '.json', 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+    open(base + '.xlsx', 'wb').close()
+
+def test_compaction_and_retention():
+    """Overlapping runs become one deduplicated dataset; old files are archived"""
+    with tempfile.TemporaryDirectory() as directory:
+        write_run(directory, 1, [tender(1, ai_summary='Zusammenfassung'), tender(2)])
+        write_run(directory, 2, [tender(1), tender(2), tender(3)])
+        write_run(directory, 3, [tender(1, deadline_iso='2025-09-05T10:00:00+02:00'), tender(3)])
+
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        assert len(unimported_files(store, directory)) == 3
+        assert store.import_directory(directory) == 3
+        assert unimported_files(store, directory) == []
+
+        compact_dir = os.path.join(directory, 'compact')
+        assert write_compact_dataset(store, compact_dir) == 3
+        latest = read_compact(compact_dir, vergabe_id='1')
+        assert latest['deadline_iso'] == '2025-09-05T10:00:00+02:00'
+        assert latest['ai_summary'] == 'Zusammenfassung'
+        assert read_compact(compact_dir, url=tender(3, url=tender(3)['url'] + 'x')['url'])['vergabe_id'] == '3'
+        assert read_compact(compact_dir, vergabe_id='99') is None
+
+        now = datetime(2025, 8, 20)
+        assert retention_candidates(store, directory, keep_runs=1, keep_days=30, now=now) == []
+        candidates = retention_candidates(store, directory, keep_runs=1, keep_days=7, now=now)
+        assert [run for run, _ in candidates] == ['evergabe_results_20250802_080000.json',
+                                                 'evergabe_results_20250801_080000.json']
+        archive_dir = os.path.join(directory, 'archive')
+        assert apply_retention(candidates, 'archive', archive_dir) == 4
+        assert sorted(os.listdir(archive_dir))[0] == 'evergabe_results_20250801_080000.json'
+        assert os.path.exists(os.path.join(directory, 'evergabe_results_20250803_080000.json'))
+
+        # The runs stay in the store and are not imported again
+        assert len(store.list_runs()) == 3
+        assert len(store.run_results('evergabe_results_20250801_080000.json')) == 2
+        assert store.import_directory(directory) == 0
+        assert retention_candidates(store, directory, keep_runs=1, keep_days=7, now=now) == []
+
+        # Compressed result files count as runs too
+        gzipped = os.path.join(directory, 'evergabe_results_20250804_080000.json.gz')
+        with gzip.open(gzipped, 'wt', encoding='utf-8') as f:
+            json.dump([tender(4)], f)
+        assert unimported_files(store, directory) == [gzipped]
+        assert store.import_directory(directory) == 1
+        assert unimported_files(store, directory) == []
+
+if __name__ == "__main__":
+    test_compaction_and_retention()
+    print("✅ Compaction works as expected")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the compound-aware morphological matcher
+"""
+
+import sys
+import os
+import yaml
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.compound_matcher import CompoundMatcher
+
+def load_search_config():
+    """Load the search section of config.yaml"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml'), 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)['search']
+
+def build_matcher(exclude_keywords=None):
+    """Build the matcher from the morphology section of config.yaml"""
+    morphology = load_search_config()['morphology']
+    return CompoundMatcher(morphology['roots'], morphology['tails'], morphology['words'],
+                           morphology['ignore'], exclude_keywords)
+
+def test_covers_keyword_list():
+    """Test that every enumerated filter keyword is found by the roots"""
+    matcher = build_matcher()
+    missed = [keyword for keyword in load_search_config()['filter_keywords'] if matcher.should_skip(keyword)]
+    print(f"  Missed keywords: {missed}")
+    assert not missed
+
+def test_real_titles():
+    """Test titles from real search results (see test_improved_filter.py)"""
+    matcher = build_matcher()
+    relevant = [
+        "Erneuerung der Beleuchtungsanlagen Museum König",
+        "Errichtung von Flutlichtmasten, BSA Rosellen Neuss",
+        "Präqualifikationsverfahren für Lichtmaste",
+        "LED-Straßenleuchten und Straßenbeleuchtungsmasten",
+        "Leuchtenaustausch Parkplatz Nord",  # Compound not in the keyword list
+        "Sicherheitsbeleuchtungssteuerung Rathaus",
+    ]
+    irrelevant = [
+        "Errichtung Feuerwehrgerätehaus Heinrichsort in Lichtenstein",
+        "Bankett und Lichtraumprofil",
+        "Metallbauarbeiten (Lichtbauelemente)",
+        "Neubau des Wohnquartiers Lichtenrader Bogen",
+        "Telematik Lichtbildbeschaffung",
+        "Austausch Lichtrufanlage",
+        "St 2027 Kreisverkehr Gut Lichtenberg",
+        "Zehntscheune Lampertheim - Los 26 - Parkettarbeiten",
+        "Fertigung und Lieferung von PE-Basistonnen Leuchtonne B7",
+        "Masterstudium Informatik",
+        "Schlichte Büromöbel, Meldepflicht beachten",
+    ]
+    for text in relevant:
+        assert not matcher.should_skip(text), text
+    for text in irrelevant:
+        assert matcher.should_skip(text), text
+
+def test_match_result():
+    """Test reported roots, exclusion and empty configuration"""
+    matcher = build_matcher(exclude_keywords=['leder'])
+    result = matcher.match("Straßenbeleuchtungsanlage mit Lichtmasten")
+    assert result.matched_keywords == ['leucht', 'licht']
+    assert matcher.should_skip("Lampen aus Leder")  # Excluded
+    assert matcher.match("Lampen aus Leder").excluded_keywords == ['leder']
+    # No roots means no filtering
+    assert not CompoundMatcher({}).should_skip("Gebäudereinigung")
+
+if __name__ == "__main__":
+    test_covers_keyword_list()
+    test_real_titles()
+    test_match_result()
+    print("✅ Compound matcher works as expected")
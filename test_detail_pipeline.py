@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test offline parsing of detail pages and the parser process pool
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.page_parser import parse_search_results, parse_order_details, url_id
+from utils.detail_pipeline import DetailPipeline
+
+SEARCH_PAGE = """
+<ul class="result-list">
+  <li class="result-list-item" data-href="/auftraege/123456">
+    <h3 class="result-list-item-title"><a href="/auftraege/123456">Erneuerung Straßenbeleuchtung</a></h3>
+    <p class="result-list-item-description">Austausch von 120 LED-Leuchten</p>
+    <span class="result-meta">Stadt Leipzig</span>
+  </li>
+  <li class="result-list-item" data-href="/auftraege/123456"><h3 class="result-list-item-title"><a>Duplikat</a></h3></li>
+  <li class="result-list-item" data-href="https://www.evergabe.de/auftraege/654321">
+    <h3 class="result-list-item-title"><a>Gebäudereinigung</a></h3>
+  </li>
+</ul>
+"""
+
+DETAIL_PAGE = """
+<h1 class="header-flex__headline">Erneuerung Straßenbeleuchtung {n}</h1>
+<div id="award_procedure_details"><p class="shorttext">Austausch von Leuchten</p></div>
+<div id="contracting_authority"><p>Stadt Leipzig</p><p>Markt 1</p></div>
+<div id="award_procedure_places"><p>04103 Leipzig (387 km)</p></div>
+<div><strong class="counter-headline">Angebotsfrist</strong></div><span class="d-block">22.08.2025, 10:00 Uhr</span>
+<div id="file_number_contracting_authority"><h2>Vergabe-ID</h2><p>{vergabe_id}</p></div>
+<a href="/dokumente/leistungsverzeichnis.pdf">Leistungsverzeichnis</a>
+"""
+
+def test_parse_pages():
+    """Test list and detail parsing without a browser"""
+    cards = parse_search_results(SEARCH_PAGE)
+    assert [card['url'] for card in cards] == [
+        'https://www.evergabe.de/auftraege/123456',
+        'https://www.evergabe.de/auftraege/654321'
+    ]
+    assert 'LED-Leuchten' in cards[0]['full_text']
+    assert 'Stadt Leipzig' in cards[0]['full_text']
+
+    info = parse_order_details(DETAIL_PAGE.format(n=1, vergabe_id='1234567'), 'https://x/1', 'leucht')
+    print(f"  Parsed: {info['title']} / {info['vergabe_id']} / {info['deadline_iso']}")
+    assert info['title'] == 'Erneuerung Straßenbeleuchtung 1'
+    assert info['contracting_authority'] == 'Stadt Leipzig, Markt 1'
+    assert info['location'] == '04103 Leipzig (387 km)'
+    assert info['vergabe_id'] == '1234567'
+    assert info['distance_km'] == 387.0
+    assert info['documents'][0]['url'] == 'https://www.evergabe.de/dokumente/leistungsverzeichnis.pdf'
+
+def test_ids_from_card_urls():
+    """Test that cards carry the tender number of their URL and repeat links are dropped"""
+    page = """
+    <li class="result-list-item" data-href="/auftraege/auftrag-suchen/details/2400101?search_id=a&amp;utm_source=list"></li>
+    <li class="result-list-item" data-href="/auftraege/auftrag-suchen/details/2400101/?search_id=b"></li>
+    <li class="result-list-item" data-href="/auftraege/auftrag-suchen/details/2400102#top"></li>
+    """
+    cards = parse_search_results(page)
+    assert [card['url_id'] for card in cards] == ['2400101', '2400102']
+    assert 'vergabe_id' not in cards[0]
+    assert url_id('https://www.evergabe.de/auftraege/654321?x=1') == '654321'
+    assert url_id('https://www.evergabe.de/auftraege/merken') == ''
+
+    # The Vergabe-ID only comes from the detail page, never from the URL
+    info = parse_order_details('<h1>Ohne ID</h1>', cards[1]['url'], 'leucht')
+    assert info['vergabe_id'] == ''
+
+def test_pipeline_collects_all_pages():
+    """Test that every queued page is parsed and collected exactly once"""
+    collected = []
+    pipeline = DetailPipeline(collected.append, max_workers=2, queue_size=2)
+    for n in range(10):
+        pipeline.put(DETAIL_PAGE.format(n=n, vergabe_id=1000000 + n), f'https://x/{n}', 'leucht')
+    pipeline.close()
+
+    print(f"  Collected {len(collected)} results from the parser pool")
+    assert sorted(info['url'] for info in collected) == sorted(f'https://x/{n}' for n in range(10))
+
+def test_pipeline_survives_broken_pool():
+    """Test that a pool that no longer accepts pages makes put() raise instead of hang"""
+    pipeline = DetailPipeline(lambda info: None, max_workers=1, queue_size=1)
+    pipeline.executor.shutdown()
+    pipeline.put(DETAIL_PAGE.format(n=1, vergabe_id=1000001), 'https://x/1', 'leucht')
+    for _ in range(100):
+        if pipeline.error is not None:
+            break
+        time.sleep(0.01)
+    try:
+        pipeline.put(DETAIL_PAGE.format(n=2, vergabe_id=1000002), 'https://x/2', 'leucht')
+        assert False, "put() should raise once the pool is broken"
+    except RuntimeError as e:
+        print(f"  {e}")
+    pipeline.close()
+    assert pipeline.failed == ['https://x/1']
+
+if __name__ == "__main__":
+    test_parse_pages()
+    test_ids_from_card_urls()
+    test_pipeline_collects_all_pages()
+    test_pipeline_survives_broken_pool()
+    print("✅ Detail pipeline works as expected")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the file-invalidated result cache and its use in the viewer
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.file_cache import FileCache
+
+def test_cache_invalidation():
+    """Values are reused until a file's mtime or size changes"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.json')
+        with open(path, 'w') as f:
+            f.write('[1]')
+        loads = []
+        def loader():
+            loads.append(1)
+            with open(path) as f:
+                return f.read()
+
+        cache = FileCache(max_entries=2)
+        assert cache.get('a', [path], loader) == '[1]'
+        assert cache.get('a', [path], loader) == '[1]'
+        assert len(loads) == 1 and cache.hits == 1
+
+        with open(path, 'w') as f:
+            f.write('[1, 2]')
+        assert cache.get('a', [path], loader) == '[1, 2]'
+        assert len(loads) == 2
+
+        # A file that appears later (e.g. the write-ahead log) also invalidates
+        missing = os.path.join(directory, 'results.json-wal')
+        cache.get('b', [path, missing], loader)
+        open(missing, 'w').close()
+        cache.get('b', [path, missing], loader)
+        assert len(loads) == 4
+
+        # Least recently used entries are dropped
+        cache.get('c', [path], loader)
+        assert list(cache.entries) == ['b', 'c']
+
+def test_viewer_cache():
+    """The viewer parses a run once and sees new summaries right away"""
+    import web_viewer
+    from utils.tender_store import TenderStore
+    output_dir = web_viewer.OUTPUT_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        web_viewer.OUTPUT_DIR = directory
+        web_viewer.result_catalog = None
+        web_viewer.result_cache.clear()
+        try:
+            store = TenderStore(os.path.join(directory, 'tenders.db'))
+            results = [{'url': f'https://www.evergabe.de/auftraege/auftrag-suchen/details/{n}', 'vergabe_id': str(n),
+                        'title': f'Leuchte {n}', 'description': 'Mastleuchten', 'documents': []} for n in range(3)]
+            store.save_run(results, 'evergabe_results_20250801_080000.json')
+
+            first = web_viewer.load_latest_results()
+            assert web_viewer.load_latest_results() is first
+            assert web_viewer.result_view('evergabe_results_20250801_080000.json', query='leuchte 1') == [1]
+
+            time.sleep(0.01)
+            web_viewer.save_summary('evergabe_results_20250801_080000.json', first[0], 'Neu')
+            assert web_viewer.load_latest_results()[0]['ai_summary'] == 'Neu'
+        finally:
+            web_viewer.OUTPUT_DIR = output_dir
+            if web_viewer.result_catalog:
+                web_viewer.result_catalog.stop_watcher()
+            web_viewer.result_catalog = None
+            web_viewer.result_cache.clear()
+
+if __name__ == "__main__":
+    test_cache_invalidation()
+    test_viewer_cache()
+    print("✅ File cache works as expected")
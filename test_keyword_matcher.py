@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the compiled keyword matcher against the per-keyword regex loop
+"""
+
+import re
+import sys
+import os
+import random
+import yaml
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.keyword_matcher import KeywordMatcher, trie_pattern
+
+def reference_matches(text, keywords, use_word_boundaries):
+    """Per-keyword matching as the filters did before the compiled matcher"""
+    text_lower = text.lower()
+    matches = set()
+    for keyword in keywords:
+        keyword = keyword.lower()
+        if use_word_boundaries:
+            if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower):
+                matches.add(keyword)
+        elif keyword in text_lower:
+            matches.add(keyword)
+    return matches
+
+def test_trie_pattern():
+    """Test that common prefixes are shared"""
+    pattern = trie_pattern(['licht', 'lichter', 'lichtmast', 'lampe'])
+    print(f"Pattern: {pattern}")
+    assert pattern == 'l(?:ampe|icht(?:er|mast)?)'
+
+def test_matcher_equivalence():
+    """Test that the matcher finds exactly the keywords the regex loop finds"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml'), 'r', encoding='utf-8') as f:
+        keywords = yaml.safe_load(f)['search']['filter_keywords']
+    exclude = ['leder', 'lediglich', 'master']
+
+    words = keywords + ['Leder', 'Master', 'Lichtenstein', 'LED', 'und', 'der', 'Stadt', 'Leuchtonne']
+    random.seed(42)
+
+    for use_word_boundaries in (True, False):
+        matcher = KeywordMatcher(keywords, exclude, use_word_boundaries)
+        for _ in range(2000):
+            text = random.choice([' ', '-', ', ']).join(
+                random.choice(words) for _ in range(random.randint(1, 8))
+            )
+            included = reference_matches(text, keywords, use_word_boundaries)
+            excluded = reference_matches(text, exclude, use_word_boundaries)
+            result = matcher.match(text)
+
+            assert set(result.matched_keywords) == included, text
+            assert set(result.excluded_keywords) == excluded, text
+            assert matcher.should_skip(text) == (bool(excluded) or not included), text
+
+    print("✅ Compiled matcher is equivalent to the per-keyword loop")
+
+def test_word_boundaries():
+    """Test the examples from FILTERING_GUIDE.md"""
+    matcher = KeywordMatcher(['led', 'mast', 'beleuchtung'], ['leder', 'master'])
+    assert not matcher.should_skip("LED-Straßenbeleuchtung")
+    assert matcher.should_skip("Lederverarbeitung")
+    assert matcher.should_skip("Masterstudium")
+    assert not matcher.should_skip("neuer Mast für Beleuchtung")
+    assert matcher.should_skip("Neuer Mast, kein Leder")  # Excluded
+    assert sorted(matcher.match("Neuer Mast, LED Beleuchtung").matched_keywords) == ['beleuchtung', 'led', 'mast']
+    # No include keywords means no filtering
+    assert not KeywordMatcher([], ['leder']).should_skip("Leder")
+
+if __name__ == "__main__":
+    test_trie_pattern()
+    test_matcher_equivalence()
+    test_word_boundaries()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test keyword hit statistics and the pruning analysis
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.keyword_stats import KeywordStats, load_stats, analyze_keywords
+
+KEYWORDS = ['beleuchtung', 'straßenbeleuchtung', 'leuchten', 'led-leuchten', 'lichtkuppel', 'Leuchten']
+
+RESULTS = [
+    ('https://x/1', "Erneuerung Straßenbeleuchtung und Beleuchtung"),
+    ('https://x/2', "Lieferung LED-Leuchten"),
+    ('https://x/3', "Beleuchtung Sporthalle"),
+]
+
+def run_once(stats):
+    """Record one scraper run: early filter on all results, late filter on the kept ones"""
+    matcher = KeywordMatcher(KEYWORDS, ['sporthalle'])
+    kept = []
+    for url, text in RESULTS:
+        match = matcher.match(text)
+        stats.record('early', match.matched_keywords, url=url)
+        if match.relevant:
+            kept.append((url, text))
+    for url, text in kept:
+        match = matcher.match(text)
+        # The detail page URL carries another search_id than the card's
+        stats.record('late', match.matched_keywords, match.relevant, url=url + '?search_id=detail')
+    stats.save()
+
+def test_counts_and_persistence():
+    """Test counters after two runs and the report analysis"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'keyword_stats.json')
+        run_once(KeywordStats(path))
+        run_once(KeywordStats(path))
+
+        stats = load_stats(path)
+        print(f"  Runs: {stats['runs']}, keywords: {sorted(stats['keywords'])}")
+        assert stats['runs'] == 2
+        beleuchtung = stats['keywords']['beleuchtung']
+        assert beleuchtung['early'] == {'matched': 4, 'only': 2, 'relevant': 2}
+        assert beleuchtung['late'] == {'matched': 2, 'only': 0, 'relevant': 2}
+        assert stats['keywords']['led-leuchten']['early']['relevant'] == 2
+
+        findings = analyze_keywords(stats, KEYWORDS)
+        print(f"  Findings: {findings}")
+        assert findings['duplicates'] == ['leuchten']
+        assert findings['never_matched'] == ['lichtkuppel']
+        assert 'straßenbeleuchtung' in findings['never_only']
+        assert ('straßenbeleuchtung', ['beleuchtung']) in findings['subsumed']
+        assert ('led-leuchten', ['leuchten']) in findings['subsumed']
+
+if __name__ == "__main__":
+    test_counts_and_persistence()
+    print("✅ Keyword statistics work as expected")
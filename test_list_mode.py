@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Test building results from search result cards (lazy/list_only detail mode)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.page_parser import parse_search_results, card_to_result
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       'benchmarks', 'fixtures', 'search', 'search_page_1.html')
+
+def test_card_to_result():
+    """Test that authority, location and deadline are taken from the card meta info"""
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        cards = parse_search_results(f.read())
+
+    print(f"Parsed {len(cards)} cards")
+    assert len(cards) == 12
+
+    for card in cards:
+        result = card_to_result(card, 'leucht')
+        print(f"  {result['title'][:40]:<40} | {result['contracting_authority']:<14} | {result['location']:<24} | {result['deadline']}")
+        assert result['details_loaded'] is False
+        assert result['contracting_authority'].startswith('Stadt ')
+        assert result['location'] and result['distance_km'] is not None
+        assert result['deadline'] and result['deadline_iso']
+        assert 'Angebotsfrist' not in result['deadline']
+
+if __name__ == "__main__":
+    test_card_to_result()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test normalisation of extracted fields into typed values
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.result_normalizer import normalize_result, ensure_normalized
+
+def test_normalize_result():
+    """Test that display strings are turned into typed companion fields"""
+
+    print("="*70)
+    print("TESTING FIELD NORMALISATION")
+    print("="*70)
+
+    info = normalize_result({
+        'deadline': '22.08.2025, 10:00 Uhr',
+        'location': '04103 Leipzig (1.387 km), Sachsen',
+        'cpv_codes': '45316100-6 Installation von Außenbeleuchtungsanlagen, Elektroarbeiten',
+        'period_of_performance': '01.09.2025 - 31.12.2025',
+        'vergabe_id': ' 1234567 '
+    })
+
+    for field in ['deadline_iso', 'distance_km', 'postal_code', 'cpv_list', 'cpv_ids', 'period_start', 'period_end']:
+        print(f"  {field}: {info[field]}")
+
+    assert info['deadline_iso'] == '2025-08-22T10:00:00+02:00'
+    assert info['distance_km'] == 1387.0
+    assert info['postal_code'] == '04103'
+    assert info['cpv_list'] == ['45316100-6 Installation von Außenbeleuchtungsanlagen', 'Elektroarbeiten']
+    assert info['cpv_ids'] == ['45316100']
+    assert info['period_start'] == '2025-09-01'
+    assert info['period_end'] == '2025-12-31'
+    assert info['vergabe_id'] == '1234567'
+
+    # Missing values stay empty instead of raising
+    empty = normalize_result({'deadline': '', 'location': 'Leipzig'})
+    assert empty['deadline_iso'] is None
+    assert empty['distance_km'] is None
+    assert empty['cpv_list'] == []
+    assert empty['period_start'] is None
+
+    # Old result files get the typed fields on load
+    legacy = ensure_normalized([{'deadline': '01.02.2026'}])
+    assert legacy[0]['deadline_iso'].startswith('2026-02-01T00:00:00')
+
+    print("\n✅ Normalisation works as expected")
+
+if __name__ == "__main__":
+    test_normalize_result()
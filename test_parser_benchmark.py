@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test the offline parser benchmark against the fixture corpus
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_parser import run_benchmark, compare_with_baseline, print_report
+
+def test_parser_benchmark():
+    """Test that the benchmark covers every fixture page and field"""
+    report = run_benchmark(repeat=1)
+    print_report(report)
+
+    assert report['search']['pages'] > 0
+    assert report['search']['cards'] > 0
+    assert report['detail']['pages'] > 0
+    assert 'reference_ids' in report['detail']['per_field_ms']
+    assert report['detail']['peak_memory_kb'] > 0
+
+    # A run compared with itself never regresses, a 10x slower one always does
+    assert compare_with_baseline(report, report) == []
+    slow = {section: dict(report[section]) for section in ('search', 'detail')}
+    for section in slow.values():
+        section['mean_ms'] = section['mean_ms'] * 10
+    assert compare_with_baseline(slow, report)
+
+    # A machine that is slower overall (reference parse included) is no regression
+    busy = {section: dict(report[section]) for section in ('search', 'detail')}
+    for section in busy.values():
+        for metric in ('mean_ms', 'reference_ms'):
+            section[metric] = section[metric] * 2
+        section['per_field_ms'] = {field: ms * 2 for field, ms in section.get('per_field_ms', {}).items()}
+    assert compare_with_baseline(busy, report) == []
+
+if __name__ == "__main__":
+    test_parser_benchmark()
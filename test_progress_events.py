@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the progress events of the scraper and their Server-Sent Events stream
+"""
+
+import sys
+import os
+import io
+import json
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.progress_events import ProgressReporter, EventBroker, parse_progress
+
+def test_reporter():
+    """Event lines carry term, page, counters, throughput and ETA"""
+    stream = io.StringIO()
+    progress = ProgressReporter(enabled=True, stream=stream)
+    progress.start(['leuchte', 'mast'], max_pages=2)
+    progress.start_term('leuchte')
+    progress.start_page(1, cards=3)
+    progress.card('result', 'Straßenbeleuchtung')
+    progress.card('skipped')
+    progress.card('duplicate')
+    progress.end_page()
+    progress.end_term()
+    progress.finish()
+
+    events = [parse_progress(line) for line in stream.getvalue().splitlines()]
+    assert [event['event'] for event in events] == ['start', 'term', 'page', 'card', 'card', 'card', 'finished']
+    assert events[2]['page_cards'] == 3 and events[2]['eta'] is None
+    assert events[3]['title'] == 'Straßenbeleuchtung'
+    assert events[5]['eta'] is None  # No term finished yet
+    last = events[-1]
+    assert (last['term'], last['term_index'], last['terms']) == ('leuchte', 1, 2)
+    assert (last['cards'], last['results'], last['skipped'], last['duplicates']) == (3, 1, 1, 1)
+    assert last['eta'] is not None and last['cards_per_minute'] > 0
+    assert parse_progress('Processing page 1') is None
+
+    # The ETA uses the pages the finished terms loaded, not max_pages
+    progress = ProgressReporter(enabled=True, stream=io.StringIO())
+    progress.start(['leuchte', 'mast', 'lampe'], max_pages=999)
+    for term in ('leuchte', 'mast'):
+        progress.start_term(term)
+        progress.end_page()
+        progress.end_page()
+        progress.end_term()
+    assert progress.eta(40.0) == 20
+    progress.start_term('lampe')
+    progress.end_page()
+    assert progress.eta(50.0) == 10
+
+    quiet = io.StringIO()
+    ProgressReporter(stream=quiet).start(['leuchte'], 1)
+    assert quiet.getvalue() == ''
+
+def test_event_stream():
+    """Subscribers get the last event first and every later one until the end"""
+    broker = EventBroker()
+    broker.publish('scraper', {'event': 'status', 'status': 'running'})
+    chunks = []
+    stream = broker.stream('scraper', keepalive=0.05, until=lambda event: event.get('status') == 'completed')
+    chunks.append(next(stream))
+    reader = threading.Thread(target=lambda: chunks.extend(stream))
+    reader.start()
+    broker.publish('scraper', {'event': 'card', 'results': 1})
+    broker.publish('scraper', {'event': 'status', 'status': 'completed'})
+    reader.join(timeout=5)
+    assert not reader.is_alive()
+
+    events = [json.loads(chunk[len('data: '):]) for chunk in chunks if chunk.startswith('data: ')]
+    assert [event.get('status') or event['event'] for event in events] == ['running', 'card', 'completed']
+    assert broker.subscribers['scraper'] == set()
+
+def test_viewer_endpoints():
+    """The viewer streams batch progress and reports the last scraper event"""
+    import web_viewer
+    web_viewer.batch_progress['run.json'] = {'total': 2, 'processed': 2, 'status': 'completed'}
+    web_viewer.publish_batch('run.json')
+    client = web_viewer.app.test_client()
+
+    response = client.get('/events/batch/run.json')
+    assert response.mimetype == 'text/event-stream'
+    event = json.loads(response.get_data(as_text=True).split('data: ', 1)[1])
+    assert (event['file'], event['processed'], event['status']) == ('run.json', 2, 'completed')
+
+    web_viewer.scraper_state['event'] = {'event': 'page', 'page': 2}
+    try:
+        assert client.get('/scraper-status').get_json()['event']['page'] == 2
+    finally:
+        web_viewer.scraper_state['event'] = None
+
+if __name__ == "__main__":
+    test_reporter()
+    test_event_stream()
+    test_viewer_endpoints()
+    print("✅ Progress events work as expected")
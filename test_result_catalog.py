@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the catalogue of runs listed in the viewer
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.tender_store import TenderStore
+from utils.result_catalog import ResultCatalog
+
+def tender(n, **fields):
+    result = {
+        'url': f'https://www.evergabe.de/auftraege/auftrag-suchen/details/{n}',
+        'title': f'Straßenbeleuchtung {n}',
+        'vergabe_id': str(n),
+        'deadline_iso': f'2025-08-{10 + n:02d}T10:00:00+02:00',
+        'documents': [],
+    }
+    result.update(fields)
+    return result
+
+def test_catalog():
+    """Runs are listed with counts, summaries and deadlines and refreshed on change"""
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, 'evergabe_results_20250801_080000.json'), 'w', encoding='utf-8') as f:
+            json.dump([tender(1, ai_summary='Zusammenfassung'), tender(2)], f)
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        catalog = ResultCatalog(store, directory)
+
+        assert catalog.refresh()
+        assert not catalog.refresh()
+        entry, = catalog.files()
+        assert entry['filename'] == 'evergabe_results_20250801_080000.json'
+        assert entry['timestamp'] == '2025-08-01 08:00:00'
+        assert (entry['count'], entry['summaries']) == (2, 1)
+        assert entry['earliest_deadline'] == '2025-08-11T10:00:00+02:00'
+        assert entry['size'] > 0
+
+        # A new run shows up first, a new summary updates the coverage
+        time.sleep(0.01)
+        store.save_run([tender(3), tender(2)], 'evergabe_results_20250802_080000.json')
+        store.set_summary(tender(2), 'Neu')
+        assert catalog.refresh()
+        newest, oldest = catalog.files()
+        assert newest['filename'] == 'evergabe_results_20250802_080000.json'
+        assert (newest['count'], newest['summaries'], newest['size']) == (2, 1, 0)
+        assert oldest['summaries'] == 2
+
+        # The catalogue file lets the next process start without a rebuild
+        assert ResultCatalog(store, directory).files() == catalog.files()
+
+        catalog.start_watcher(interval=0.05)
+        try:
+            store.save_run([tender(4)], 'evergabe_results_20250803_080000.json')
+            for _ in range(100):
+                if len(catalog.files()) == 3:
+                    break
+                time.sleep(0.02)
+            assert catalog.files()[0]['filename'] == 'evergabe_results_20250803_080000.json'
+        finally:
+            catalog.stop_watcher()
+
+if __name__ == "__main__":
+    test_catalog()
+    print("✅ Result catalogue works as expected")
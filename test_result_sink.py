@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test the streaming JSONL result sink and the exports written from it
+"""
+
+import sys
+import os
+import csv
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.result_sink import JsonlSink
+from utils.result_export import write_json, write_tables, export_run
+from utils.tender_store import TenderStore
+
+def result(n):
+    return {
+        'url': f'https://www.evergabe.de/auftraege/auftrag-suchen/details/{n}',
+        'title': f'Straßenbeleuchtung {n}',
+        'vergabe_id': str(n),
+        'distance_km': 12.5 if n % 2 else None,
+        'cpv_list': ['34993000', '31527200'],
+        'documents': [{'name': 'LV.pdf', 'url': f'https://www.evergabe.de/dokumente/{n}.pdf'}],
+    }
+
+def test_sink():
+    """Results are written as they come and read back lazily"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'evergabe_results_20250801_080000.jsonl')
+        sink = JsonlSink(path, sync_every=2)
+        for n in range(5):
+            sink.append(result(n))
+        assert len(sink) == 5 and bool(sink)
+        assert [r['vergabe_id'] for r in sink] == ['0', '1', '2', '3', '4']
+        assert [r['vergabe_id'] for r in sink[:2]] == ['0', '1']
+        assert sink[-1]['vergabe_id'] == '4'
+        sink.close()
+
+        # A crash in the middle of a line loses only that line
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"url": "https://www.evergabe.de/auf')
+        recovered = JsonlSink(path, append=True)
+        assert len(recovered) == 5
+        recovered.remove()
+        assert not os.path.exists(path)
+
+def test_exports():
+    """Exports from the sink match the former json.dump/DataFrame output"""
+    with tempfile.TemporaryDirectory() as directory:
+        sink = JsonlSink(os.path.join(directory, 'run.jsonl'))
+        for n in range(3):
+            sink.append(result(n))
+
+        json_path = os.path.join(directory, 'run.json')
+        assert write_json(sink, json_path) == 3
+        with open(json_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        assert text == json.dumps(list(sink), ensure_ascii=False, indent=2)
+        write_json([], json_path)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == []
+
+        # Excel and CSV in one pass (a generator can only be read once)
+        csv_path = os.path.join(directory, 'run.csv')
+        excel_path = os.path.join(directory, 'run.xlsx')
+        assert write_tables((r for r in sink), excel_path, csv_path) == 3
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert rows[0]['documents'] == 'LV.pdf'
+        assert rows[0]['cpv_list'] == '34993000, 31527200'
+        assert rows[0]['distance_km'] == '' and rows[1]['distance_km'] == '12.5'
+
+        from openpyxl import load_workbook
+        sheet = load_workbook(excel_path)['Sheet1']
+        header = [cell.value for cell in sheet[1]]
+        url_cell = sheet.cell(row=2, column=header.index('url') + 1)
+        assert url_cell.hyperlink.target == result(0)['url']
+        assert sheet.cell(row=3, column=header.index('title') + 1).value == 'Straßenbeleuchtung 1'
+
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        export_run(sink, directory, 'evergabe_results_20250801_080000', ['json'], store=store)
+        assert store.count() == 3
+        assert os.path.exists(os.path.join(directory, 'evergabe_results_20250801_080000.json'))
+        sink.close()
+
+def test_known_tender_export():
+    """A tender taken from the database is exported like a freshly scraped one"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        store.save_run([result(1)], 'evergabe_results_20250801_080000.json')
+        store.set_summary(result(1), 'Zusammenfassung')
+
+        known = store.get_tender(url=result(1)['url'] + '?search_id=x', as_result=True)
+        assert 'tender_id' not in known and 'first_seen' not in known
+        sink = JsonlSink(os.path.join(directory, 'run.jsonl'))
+        sink.append(known)
+        sink.append(result(2))
+        export_run(sink, directory, 'evergabe_results_20250802_080000', ['json', 'csv'], store=store)
+        sink.close()
+
+        with open(os.path.join(directory, 'evergabe_results_20250802_080000.json'), 'r', encoding='utf-8') as f:
+            exported_known, exported_fresh = json.load(f)
+        assert set(exported_known) == set(exported_fresh) | {'ai_summary'}
+        with open(os.path.join(directory, 'evergabe_results_20250802_080000.csv'), 'r', encoding='utf-8-sig', newline='') as f:
+            header = next(csv.reader(f))
+        assert 'tender_id' not in header and 'first_seen' not in header
+
+def test_parquet():
+    """Parquet rows are typed and partitioned by scrape date"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("  pyarrow not installed - Parquet test skipped")
+        return
+    import pandas as pd
+    with tempfile.TemporaryDirectory() as directory:
+        rows = [dict(result(n), contracting_authority='Stadt Leipzig', procedure_type='Offenes Verfahren',
+                     deadline='22.08.2025, 10:00 Uhr', deadline_iso='2025-08-22T10:00:00+02:00',
+                     scraped_at='2025-08-01T08:01:02.123456') for n in range(3)]
+        export_run(rows, directory, 'evergabe_results_20250801_080000', ['parquet'])
+        export_run(rows[:1], directory, 'evergabe_results_20250802_080000', ['parquet'])
+        dataset = os.path.join(directory, 'parquet')
+        assert sorted(os.listdir(dataset)) == ['scrape_date=2025-08-01', 'scrape_date=2025-08-02']
+
+        schema = pq.read_schema(os.path.join(dataset, 'scrape_date=2025-08-01', 'evergabe_results_20250801_080000.parquet'))
+        assert str(schema.field('contracting_authority').type) == 'dictionary<values=string, indices=int32, ordered=0>'
+        assert str(schema.field('deadline').type) == 'timestamp[us, tz=Europe/Berlin]'
+        assert str(schema.field('cpv_ids').type) == 'list<element: string>'
+
+        df = pd.read_parquet(dataset, columns=['vergabe_id', 'deadline', 'documents'],
+                             filters=[('scrape_date', '>=', '2025-08-02')])
+        assert list(df['vergabe_id']) == ['0']
+        assert df['deadline'][0] == pd.Timestamp('2025-08-22 10:00', tz='Europe/Berlin')
+        assert df['documents'][0][0]['name'] == 'LV.pdf'
+
+if __name__ == "__main__":
+    test_sink()
+    test_exports()
+    test_known_tender_export()
+    test_parquet()
+    print("✅ Result sink works as expected")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test the paginated results API of the viewer
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import web_viewer
+from utils.tender_store import TenderStore
+
+RUN = 'evergabe_results_20250801_080000.json'
+
+def tender(n, **fields):
+    result = {
+        'url': f'https://www.evergabe.de/auftraege/auftrag-suchen/details/{n}',
+        'vergabe_id': str(n),
+        'title': f'Leuchte {n}',
+        'description': 'Mastleuchten' if n % 2 else 'Straßenbeleuchtung',
+        'deadline_iso': f'2025-08-{30 - n:02d}T10:00:00+02:00' if n != 5 else None,
+        'documents': [],
+    }
+    result.update(fields)
+    return result
+
+def test_results_api():
+    """Pages are sorted, filtered and rendered on the server; the page holds one card"""
+    output_dir = web_viewer.OUTPUT_DIR
+    template_folder = web_viewer.app.template_folder
+    with tempfile.TemporaryDirectory() as directory:
+        web_viewer.OUTPUT_DIR = directory
+        web_viewer.result_catalog = None
+        web_viewer.result_cache.clear()
+        web_viewer.app.template_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+        try:
+            TenderStore(os.path.join(directory, 'tenders.db')).save_run([tender(n) for n in range(25)], RUN)
+            client = web_viewer.app.test_client()
+
+            page = client.get('/').get_data(as_text=True)
+            assert page.count('class="result-card"') == 1
+            assert 'data-total="25"' in page and 'Leuchte 0' in page and 'Leuchte 1<' not in page
+
+            data = client.get('/api/results?offset=20&limit=10').get_json()
+            assert (data['file'], data['total']) == (RUN, 25)
+            assert [item['index'] for item in data['results']] == [20, 21, 22, 23, 24]
+            assert 'html' not in data['results'][0]
+
+            data = client.get(f'/api/results?file={RUN}&sort=deadline&limit=3&html=1').get_json()
+            assert [item['index'] for item in data['results']] == [24, 23, 22]
+            assert 'Leuchte 24' in data['results'][0]['html']
+            data = client.get(f'/api/results?file={RUN}&sort=-deadline&offset=23').get_json()
+            assert [item['index'] for item in data['results']] == [24, 5]
+
+            data = client.get(f'/api/results?file={RUN}&filter=MASTLEUCHTEN&limit=100').get_json()
+            assert data['total'] == 12
+            assert all(item['index'] % 2 for item in data['results'])
+
+            data = client.get('/search?q=Mastleuchten&limit=5').get_json()
+            assert (data['total'], len(data['results'])) == (12, 5)
+            assert data['results'][0]['score'] >= data['results'][-1]['score']
+
+            assert client.get('/api/results?sort=price').status_code == 400
+            assert client.get('/api/results?offset=x').status_code == 400
+        finally:
+            if web_viewer.result_catalog:
+                web_viewer.result_catalog.stop_watcher()
+            web_viewer.OUTPUT_DIR = output_dir
+            web_viewer.result_catalog = None
+            web_viewer.result_cache.clear()
+            web_viewer.app.template_folder = template_folder
+
+if __name__ == "__main__":
+    test_results_api()
+    print("✅ Results API works as expected")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the full-text search index of the tender store
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.tender_store import TenderStore, fold_text, search_query
+
+def tender(n, title, description='', **fields):
+    result = {
+        'url': f'https://www.evergabe.de/auftraege/auftrag-suchen/details/{n}',
+        'vergabe_id': str(n),
+        'title': title,
+        'description': description,
+        'contracting_authority': 'Stadt Köln',
+        'documents': [],
+    }
+    result.update(fields)
+    return result
+
+def ids(hits):
+    return [result['vergabe_id'] for score, result in hits]
+
+def test_folding():
+    """Umlauts and ß are spelled out, every word becomes a prefix"""
+    assert fold_text('Straßenbeleuchtung Größe') == 'Strassenbeleuchtung Groesse'
+    assert search_query('Straße, LED!') == '"strasse"* "led"*'
+    assert search_query('  ') == ''
+
+def test_search():
+    """Ranked search across runs, updated with new results and summaries"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tenders.db')
+        store = TenderStore(path)
+        store.save_run([
+            tender(1, 'Straßenbeleuchtung LED', 'Austausch von Mastleuchten'),
+            tender(2, 'Schulgebäude', 'Neue Strassenbeleuchtung auf dem Schulhof'),
+        ], 'evergabe_results_20250801_080000.json')
+        store.save_run([
+            tender(3, 'Sporthalle', 'Hallenbeleuchtung',
+                   documents=[{'name': 'Leistungsverzeichnis Leuchten.pdf', 'url': 'https://example.org/lv.pdf'}]),
+        ], 'evergabe_results_20250802_080000.json')
+
+        # ß/ss, umlauts, prefixes; the title match ranks first
+        total, hits = store.search('strassenbeleuchtung')
+        assert total == 2 and ids(hits) == ['1', '2']
+        assert ids(store.search('Straßenbel')[1]) == ['1', '2']
+        assert ids(store.search('köln sporthalle')[1]) == ['3']
+        assert ids(store.search('koeln sporthalle')[1]) == ['3']
+        assert ids(store.search('leistungsverzeichnis')[1]) == ['3']
+        assert store.search('schulgebaude led') == (0, [])
+
+        # Pagination
+        total, hits = store.search('stadt', limit=2, offset=2)
+        assert total == 3 and len(hits) == 1
+
+        # New summaries and changed content are indexed right away
+        store.set_summary(tender(3, 'Sporthalle'), 'Tausch der Hallenstrahler gegen LED')
+        assert ids(store.search('hallenstrahler')[1]) == ['3']
+        store.update_tenders([tender(2, 'Schulgebäude', 'Sanierung der Turnhalle')])
+        assert ids(store.search('turnhalle')[1]) == ['2']
+        assert ids(store.search('schulhof')[1]) == []
+        assert store.search_ids('led') == [1, 3]
+
+        # Databases from before the index are indexed when opened
+        with sqlite3.connect(path) as conn:
+            conn.execute('DROP TABLE tender_search')
+        assert ids(TenderStore(path).search('sporthalle')[1]) == ['3']
+
+if __name__ == "__main__":
+    test_folding()
+    test_search()
+    print("✅ Search index works as expected")
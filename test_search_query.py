@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test building search URLs with server-side filters
+"""
+
+import sys
+import os
+import urllib.parse
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.search_query import build_search_url, filter_params
+
+def test_default_url():
+    """Test that the URL without filters matches the previous search URL"""
+    url = build_search_url('leucht')
+    print(f"  {url}")
+    assert url == ("https://www.evergabe.de/auftraege/auftrag-suchen?utf8=%E2%9C%93&search[source]=form_cms"
+                   "&search[query]=leucht&search[filters][publish_end]=0&commit=Auftr%C3%A4ge+suchen")
+
+def test_filters():
+    """Test lists, nested mappings, relative dates and empty values"""
+    filters = {
+        'craft_code_ids': ['34993000', 31527200],
+        'location': {'zip': '04103', 'radius': 50},
+        'publish_start': 'today-14',
+        'region_ids': [],
+        'remote': None,
+    }
+    params = filter_params(filters, today=date(2025, 8, 20))
+    print(f"  {params}")
+    assert params == [
+        ('search[filters][craft_code_ids][]', '34993000'),
+        ('search[filters][craft_code_ids][]', '31527200'),
+        ('search[filters][location][zip]', '04103'),
+        ('search[filters][location][radius]', '50'),
+        ('search[filters][publish_start]', '06.08.2025'),
+    ]
+
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(build_search_url('licht', filters)).query)
+    assert query['search[filters][craft_code_ids][]'] == ['34993000', '31527200']
+    assert query['search[filters][publish_end]'] == ['0']
+
+if __name__ == "__main__":
+    test_default_url()
+    test_filters()
+    print("✅ Search URLs are built as expected")
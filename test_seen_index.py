@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the cross-run seen index (Bloom filter + exact SQLite table)
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.seen_index import BloomFilter, SeenIndex
+
+def url(n, search_id='abc'):
+    return f'https://www.evergabe.de/auftraege/auftrag-suchen/details/{n}?search_id={search_id}'
+
+def test_bloom_filter():
+    """No false negatives, few false positives, contents survive reopening"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'test.bloom')
+        bloom = BloomFilter(path, capacity=1000, error_rate=0.01)
+        for n in range(1000):
+            bloom.add(f'key-{n}')
+        bloom.count = 1000
+        bloom.close()
+
+        bloom = BloomFilter(path, capacity=1000, error_rate=0.01)
+        assert bloom.count == 1000
+        assert all(f'key-{n}' in bloom for n in range(1000))
+        false_positives = sum(f'other-{n}' in bloom for n in range(10000))
+        assert false_positives < 300, false_positives
+        bloom.close()
+
+def test_known_and_revalidated():
+    """Fetched tenders are known across runs until they are due again"""
+    with tempfile.TemporaryDirectory() as directory:
+        index = SeenIndex(directory, capacity=10)
+        assert index.should_fetch(url(1)) == (True, 'new')
+        index.mark_seen(url(1))
+        # Seen on the list only - the detail page still has to be loaded
+        assert index.should_fetch(url(1)) == (True, 'new')
+        yesterday = datetime.now() - timedelta(hours=30)
+        index.mark_seen(url(1), fetched=True, now=yesterday)
+        index.close()
+
+        # Next run, other search_id
+        index = SeenIndex(directory, capacity=10)
+        assert index.should_fetch(url(1, 'xyz')) == (False, 'known')
+        assert index.should_fetch(url(1, 'xyz'), revalidate_hours=24) == (True, 'revalidate')
+        assert index.should_fetch(url(1, 'xyz'), revalidate_hours=48) == (False, 'known')
+        assert index.get(url(1))['last_fetched'] == yesterday.isoformat(timespec='seconds')
+        index.close()
+
+def test_growth_and_rebuild():
+    """The filter grows past its capacity and is rebuilt if its file is lost"""
+    with tempfile.TemporaryDirectory() as directory:
+        index = SeenIndex(directory, capacity=10)
+        for n in range(50):
+            index.mark_seen(url(n), fetched=True)
+        assert len(index) == 50
+        assert index.bloom.capacity >= 50
+        index.close()
+
+        os.remove(os.path.join(directory, 'seen_index.bloom'))
+        index = SeenIndex(directory, capacity=10)
+        assert len(index) == 50
+        assert all(not index.should_fetch(url(n))[0] for n in range(50))
+        assert index.get(url(999)) is None
+        index.close()
+
+if __name__ == "__main__":
+    test_bloom_filter()
+    test_known_and_revalidated()
+    test_growth_and_rebuild()
+    print("✅ Seen index works as expected")
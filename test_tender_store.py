@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test the SQLite tender store (cross-run dedup, summaries, JSON import/export)
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.tender_store import TenderStore
+
+def tender(n, **fields):
+    """A normalised result as the scraper collects it"""
+    result = {
+        'url': f'https://www.evergabe.de/auftraege/auftrag-suchen/details/{n}?search_id=abc{n}',
+        'title': f'Straßenbeleuchtung {n}',
+        'description': 'Austausch von Leuchten',
+        'vergabe_id': str(n),
+        'deadline_iso': '2025-08-22T10:00:00+02:00',
+        'documents': [{'name': 'LV.pdf', 'url': f'https://www.evergabe.de/dokumente/{n}.pdf'}],
+        'details_loaded': True,
+    }
+    result.update(fields)
+    return result
+
+def test_runs_and_dedup():
+    """Tenders found in several runs are stored once and keep their details"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        store.save_run([tender(1), tender(2)], 'evergabe_results_20250801_080000.json', search_terms=['leucht'])
+        # Second run finds tender 2 from the list only (other search_id) and a new tender
+        partial = tender(2, url='https://www.evergabe.de/auftraege/auftrag-suchen/details/2?search_id=xyz',
+                         description='', vergabe_id='', documents=[], details_loaded=False)
+        store.save_run([partial, tender(3)], 'evergabe_results_20250802_080000.json')
+
+        assert store.count() == 3
+        runs = store.list_runs()
+        assert [run['file'] for run in runs] == ['evergabe_results_20250802_080000.json',
+                                                 'evergabe_results_20250801_080000.json']
+        results = store.latest_run_results()
+        print(f"  Latest run: {[result['title'] for result in results]}")
+        assert [result['vergabe_id'] for result in results] == ['2', '3']
+        assert results[0]['description'] == 'Austausch von Leuchten'
+        assert results[0]['details_loaded'] is True
+        assert results[0]['first_seen'] == '2025-08-01T08:00:00'
+
+        assert store.get_tender(vergabe_id='3')['title'] == 'Straßenbeleuchtung 3'
+        assert store.get_tender(url=tender(1)['url'] + '#top')['vergabe_id'] == '1'
+        assert [t['vergabe_id'] for t in store.tenders(scraped_since='2025-08-02')] == ['3', '2']
+
+def test_summaries_and_files():
+    """Summaries live in the store; JSON files are imported and exported"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'evergabe_results_20250701_120000.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([tender(5, ai_summary='Alt'), tender(6)], f)
+
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        assert store.import_directory(directory) == 1
+        assert store.import_directory(directory) == 0
+
+        results = store.run_results('evergabe_results_20250701_120000.json')
+        assert results[0]['ai_summary'] == 'Alt'
+        store.set_summary(results[1], 'Neue Zusammenfassung')
+        store.export_json('evergabe_results_20250701_120000.json', path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            exported = json.load(f)
+        assert exported[1]['ai_summary'] == 'Neue Zusammenfassung'
+        assert 'tender_id' not in exported[0]
+
+def test_revisions():
+    """Changed tenders get a revision with only the changed fields"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        store.save_run([tender(1), tender(2)], 'evergabe_results_20250801_080000.json')
+        # Same content again (other search_id, other field order) - no revision
+        store.save_run([tender(2), tender(1, url=tender(1)['url'] + 'x')], 'evergabe_results_20250802_080000.json')
+        # A card of tender 1 from the list does not count as a change
+        card = tender(1, description='Kurztext', documents=[], details_loaded=False)
+        store.save_run([card], 'evergabe_results_20250802_120000.json')
+        assert store.changes_since('2025-08-01') == []
+
+        # Deadline extended and a document added
+        documents = tender(1)['documents'] + [{'name': 'Änderung.pdf', 'url': 'https://www.evergabe.de/dokumente/1b.pdf'}]
+        changed = tender(1, deadline_iso='2025-09-05T10:00:00+02:00', documents=documents)
+        store.save_run([changed, tender(2)], 'evergabe_results_20250803_080000.json')
+
+        changes = store.changes_since('2025-08-03')
+        assert [result['vergabe_id'] for result in changes] == ['1']
+        revision = changes[0]['revisions'][0]
+        assert revision['changed_at'] == '2025-08-03T08:00:00'
+        assert set(revision['changes']) == {'deadline_iso', 'documents'}
+        assert revision['changes']['deadline_iso']['old'] == '2025-08-22T10:00:00+02:00'
+        assert [doc['name'] for doc in revision['changes']['documents']['added']] == ['Änderung.pdf']
+        assert store.get_tender(vergabe_id='1')['description'] == 'Austausch von Leuchten'
+
+        assert store.changes_since('2025-08-04') == []
+        assert store.changes_since('2025-08-01', fields=['title']) == []
+        assert len(store.revisions(changes[0]['tender_id'])) == 1
+
+def test_compressed_files():
+    """gzip/zstd result files are imported as the same run and exported compressed"""
+    from utils.result_export import export_run
+    from utils.result_files import load_results, result_files, result_path
+    compressions = ['none', 'gzip']
+    try:
+        import zstandard
+        compressions.append('zstd')
+    except ImportError:
+        print("  zstandard not installed - zstd skipped")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for day, compression in enumerate(compressions, 1):
+            export_run([tender(day), tender(9)], directory, f'evergabe_results_2025080{day}_080000',
+                       ['json'], compression=compression)
+        paths = result_files(directory)
+        assert [os.path.basename(path) for path in paths] == [
+            'evergabe_results_20250801_080000.json', 'evergabe_results_20250802_080000.json.gz',
+            'evergabe_results_20250803_080000.json.zst'][:len(compressions)]
+
+        store = TenderStore(os.path.join(directory, 'tenders.db'))
+        assert store.import_directory(directory) == len(compressions)
+        assert store.import_directory(directory) == 0
+        assert store.count() == len(compressions) + 1
+
+        # Runs are named by their .json name; summaries are written back compressed
+        results = store.run_results('evergabe_results_20250802_080000.json')
+        store.set_summary(results[0], 'Kurzfassung')
+        path = result_path(directory, 'evergabe_results_20250802_080000.json')
+        store.export_json('evergabe_results_20250802_080000.json', path)
+        assert load_results(path)[0]['ai_summary'] == 'Kurzfassung'
+
+if __name__ == "__main__":
+    test_runs_and_dedup()
+    test_summaries_and_files()
+    test_revisions()
+    test_compressed_files()
+    print("✅ Tender store works as expected")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the search-term planner (overlap statistics, stopping, term order)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.term_planner import TermPlanner
+
+def urls(start, stop):
+    """Tender URLs for a range of ids"""
+    return [f'https://www.evergabe.de/auftraege/{n}' for n in range(start, stop)]
+
+def run_search(planner, pages_by_term):
+    """Page through terms like process_search_results does"""
+    loaded = {}
+    for term, pages in pages_by_term.items():
+        planner.start_term(term)
+        loaded[term] = 0
+        for page, page_urls in enumerate(pages, 1):
+            planner.record_page(term, page, page_urls)
+            loaded[term] += 1
+            if not planner.should_continue(term, page):
+                break
+    planner.finish()
+    return loaded
+
+def test_stops_overlapping_term():
+    """A later term that repeats the first one is stopped, the first never"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'term_stats.json')
+        planner = TermPlanner(path, min_new_fraction=0.2, min_pages=1)
+        loaded = run_search(planner, {
+            'licht': [urls(0, 10), urls(10, 20), urls(20, 30)],
+            'leucht': [urls(0, 9) + urls(100, 101), urls(9, 19), urls(200, 210)],
+            'lamp': [urls(300, 310), urls(0, 10)],
+        })
+        for line in planner.summary():
+            print(f"  {line}")
+        assert loaded == {'licht': 3, 'leucht': 1, 'lamp': 2}
+        assert planner.run['leucht']['stopped_at'] == 1
+        assert planner.term_yield('leucht') == (10, 1)
+        assert planner.term_yield('lamp') == (20, 10)
+
+        # Next run: broadest term first, stored page statistics accumulate
+        next_run = TermPlanner(path)
+        assert next_run.history['runs'] == 1
+        assert next_run.order_terms(['lamp', 'leucht', 'licht', 'neu']) == ['neu', 'licht', 'lamp', 'leucht']
+        assert next_run.history['terms']['licht']['pages']['2'] == {'seen': 10, 'new': 10, 'passed': 0, 'relevant': 0, 'loads': 1}
+
+def test_adaptive_depth_and_audit():
+    """Pages that brought no relevant results are skipped, except in audit runs"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'term_stats.json')
+        pages = [urls(0, 10), urls(10, 20), urls(20, 30)]
+        relevant = urls(0, 4) + urls(10, 11)  # Nothing relevant on page 3
+
+        for _ in range(3):
+            planner = TermPlanner(path, min_expected_relevant=0.5, min_samples=3, audit_every=5)
+            planner.start_term('leucht')
+            for page, page_urls in enumerate(pages, 1):
+                planner.record_page('leucht', page, page_urls)
+                for _ in page_urls[:2]:
+                    planner.record_passed('leucht')
+                assert planner.should_continue('leucht', page)  # Not enough samples yet
+            planner.record_relevant(relevant)
+            planner.finish()
+
+        stats = planner.history['terms']['leucht']['pages']
+        assert stats['1'] == {'seen': 30, 'new': 30, 'passed': 6, 'relevant': 12, 'loads': 3}
+        assert stats['3']['relevant'] == 0
+
+        planner = TermPlanner(path, min_expected_relevant=0.5, min_samples=3, audit_every=5)
+        planner.start_term('leucht')
+        planner.record_page('leucht', 1, pages[0])
+        assert planner.should_continue('leucht', 1)  # Page 2 had 1 relevant result per run
+        planner.record_page('leucht', 2, pages[1])
+        assert not planner.should_continue('leucht', 2)
+        print(f"  {planner.summary()}")
+
+        # Fifth run is a full-depth audit
+        planner.finish()
+        audit = TermPlanner(path, min_expected_relevant=0.5, min_samples=3, audit_every=5)
+        assert audit.audit
+        audit.start_term('leucht')
+        audit.record_page('leucht', 2, pages[1])
+        assert audit.should_continue('leucht', 2)
+
+if __name__ == "__main__":
+    test_stops_overlapping_term()
+    test_adaptive_depth_and_audit()
+    print("✅ Term planner works as expected")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Batch keyword filtering over many results at once (pandas)
+
+Loads all stored tenders (or historical evergabe_results_*.json files)
+into one DataFrame and applies the same include/exclude logic as the
+scraper filters to whole columns, e.g. to back-test a changed keyword
+list against months of runs.
+"""
+
+import os
+import pandas as pd
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.result_files import load_results, result_files
+from utils.compound_matcher import CompoundMatcher, TOKEN_PATTERN
+
+# Columns the filters look at (same text as filter_relevant)
+TEXT_COLUMNS = ['title', 'description']
+
+
+def load_results_frame(paths=None, output_dir='output', drop_duplicates=True):
+    """Load result files into one DataFrame
+
+    Args:
+        paths: Result files to load (default: all evergabe_results_*.json[.gz|.zst] in output_dir)
+        output_dir: Directory searched when no paths are given
+        drop_duplicates: Keep only the newest row per vergabe_id (or url)
+
+    Returns:
+        DataFrame with one row per result and a source_file column
+    """
+    if paths is None:
+        paths = result_files(output_dir)
+
+    frames = []
+    for path in paths:
+        try:
+            results = load_results(path)
+        except (OSError, ValueError, EOFError, RuntimeError) as e:
+            print(f"  ✗ Could not load {path}: {e}")
+            continue
+        if not results:
+            continue
+        frame = pd.DataFrame(results)
+        frame['source_file'] = os.path.basename(path)
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=TEXT_COLUMNS + ['url', 'vergabe_id', 'source_file'])
+
+    df = pd.concat(frames, ignore_index=True, sort=False)
+    if drop_duplicates:
+        # File names carry the timestamp, so the last occurrence is the newest
+        key = df['vergabe_id'].fillna('') if 'vergabe_id' in df else pd.Series('', index=df.index)
+        if 'url' in df:
+            key = key.where(key != '', df['url'].fillna(''))
+        df = df[~key.duplicated(keep='last') | (key == '')].reset_index(drop=True)
+    return df
+
+
+def load_store_frame(store):
+    """Load all tenders of a TenderStore (already deduplicated) into one DataFrame"""
+    results = store.tenders()
+    if not results:
+        return pd.DataFrame(columns=TEXT_COLUMNS + ['url', 'vergabe_id'])
+    return pd.DataFrame(results)
+
+
+def text_column(df, columns=None):
+    """Build the lowercased filter text (title + description) once for all rows"""
+    columns = columns or TEXT_COLUMNS
+    text = pd.Series('', index=df.index)
+    for column in columns:
+        if column in df:
+            text = text + ' ' + df[column].fillna('').astype(str)
+    return text.str.lower()
+
+
+class BatchResult:
+    """Masks and keyword statistics of one batch filter run"""
+
+    def __init__(self, included, excluded, matched, keyword_counts, exclude_counts):
+        self.included = included  # Boolean Series: an include keyword matched
+        self.excluded = excluded  # Boolean Series: an exclude keyword matched
+        self.matched = matched  # Series of matched keyword lists per row
+        self.keyword_counts = keyword_counts  # Results per include keyword
+        self.exclude_counts = exclude_counts  # Results per exclude keyword
+
+    @property
+    def relevant(self):
+        """Boolean Series: row would be kept by the filter"""
+        return self.included & ~self.excluded
+
+    def summary(self):
+        """Totals as a dict"""
+        return {
+            'total': int(len(self.included)),
+            'included': int(self.included.sum()),
+            'excluded': int((self.included & self.excluded).sum()),
+            'relevant': int(self.relevant.sum())
+        }
+
+
+def keyword_set_hits(text, keyword_set):
+    """Find the keywords of a KeywordSet in every row
+
+    Returns:
+        Series with a list of distinct matched keywords per row
+    """
+    if keyword_set.pattern is None:
+        return pd.Series([[] for _ in range(len(text))], index=text.index)
+
+    prefixes = keyword_set.prefixes
+
+    def expand(found):
+        keywords = {}
+        for keyword in found:
+            keywords[keyword] = True
+            for shorter in prefixes.get(keyword, ()):
+                keywords[shorter] = True
+        return list(keywords)
+
+    return text.str.findall(keyword_set.pattern).map(expand)
+
+
+def compound_hits(text, matcher):
+    """Find the roots of a CompoundMatcher in every row
+
+    Token decisions are cached in the matcher, so every distinct token is
+    analysed once however often it occurs.
+    """
+    match_token = matcher.match_token
+    return text.str.findall(TOKEN_PATTERN).map(
+        lambda tokens: list(dict.fromkeys(filter(None, map(match_token, tokens))))
+    )
+
+
+def count_keywords(hits):
+    """Count the rows each keyword matched"""
+    exploded = hits.explode().dropna()
+    if exploded.empty:
+        return pd.Series(dtype='int64')
+    return exploded.value_counts()
+
+
+def batch_filter(df, matcher, columns=None):
+    """Apply a keyword matcher to all rows of a results DataFrame
+
+    Args:
+        df: Results DataFrame (see load_results_frame)
+        matcher: KeywordMatcher or CompoundMatcher
+        columns: Text columns to match (default: title and description)
+
+    Returns:
+        BatchResult with masks aligned to df.index
+    """
+    text = text_column(df, columns)
+
+    if isinstance(matcher, CompoundMatcher):
+        matched = compound_hits(text, matcher)
+        included = matched.map(bool) if matcher.has_filter else pd.Series(True, index=df.index)
+    else:
+        matched = keyword_set_hits(text, matcher.include)
+        included = matched.map(bool) if matcher.include else pd.Series(True, index=df.index)
+
+    excluded_hits = keyword_set_hits(text, matcher.exclude)
+    return BatchResult(
+        included=included.astype(bool),
+        excluded=excluded_hits.map(bool).astype(bool),
+        matched=matched,
+        keyword_counts=count_keywords(matched),
+        exclude_counts=count_keywords(excluded_hits)
+    )
+
+
+def filter_frame(df, filter_keywords=None, exclude_keywords=None, use_word_boundaries=True):
+    """Return only the relevant rows for a keyword list (KeywordMatcher)"""
+    matcher = KeywordMatcher(filter_keywords, exclude_keywords, use_word_boundaries)
+    return df[batch_filter(df, matcher).relevant]
+
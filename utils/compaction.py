@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Compaction of historical result files
+
+All evergabe_results_*.json files are merged into the tender store (one
+row per tender with its latest content and AI summary), written out as one
+compact JSONL dataset with an index, and the per-run files outside the
+retention policy are archived or deleted. The runs themselves stay in the
+store, so the viewer still lists them.
+"""
+
+import os
+import json
+import shutil
+from datetime import datetime, timedelta
+
+from utils.page_parser import canonical_url
+from utils.result_files import result_files, run_name
+
+COMPACT_FILE = 'tenders.jsonl'
+INDEX_FILE = 'tenders.index.json'
+
+# Export files of a run (same base name)
+RUN_FILE_EXTENSIONS = ('.json', '.json.gz', '.json.zst', '.xlsx', '.csv')
+
+
+def write_compact_dataset(store, directory):
+    """Write all stored tenders as one JSONL file plus an offset index
+
+    The index maps vergabe_id and canonical URL to the byte offset of the
+    tender's line. Both files are replaced atomically.
+
+    Returns:
+        Number of tenders written
+    """
+    os.makedirs(directory, exist_ok=True)
+    data_path = os.path.join(directory, COMPACT_FILE)
+    index = {'created_at': datetime.now().isoformat(timespec='seconds'), 'count': 0,
+             'vergabe_id': {}, 'url': {}}
+
+    with open(data_path + '.tmp', 'wb') as f:
+        for tender in store.iter_tenders():
+            offset = f.tell()
+            tender.pop('tender_id', None)
+            f.write(json.dumps(tender, ensure_ascii=False).encode('utf-8') + b'\n')
+            if tender.get('vergabe_id'):
+                index['vergabe_id'][tender['vergabe_id']] = offset
+            index['url'][canonical_url(tender.get('url', ''))] = offset
+            index['count'] += 1
+
+    index_path = os.path.join(directory, INDEX_FILE)
+    with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(data_path + '.tmp', data_path)
+    os.replace(index_path + '.tmp', index_path)
+    return index['count']
+
+
+def read_compact(directory, vergabe_id=None, url=None):
+    """Look up one tender in the compact dataset (None if unknown)"""
+    with open(os.path.join(directory, INDEX_FILE), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    offset = index['vergabe_id'].get(vergabe_id) if vergabe_id else None
+    if offset is None and url:
+        offset = index['url'].get(canonical_url(url))
+    if offset is None:
+        return None
+    with open(os.path.join(directory, COMPACT_FILE), 'rb') as f:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+
+def run_files(output_dir, run_file):
+    """Existing export files of a run (JSON, Excel, CSV)"""
+    base = os.path.join(output_dir, os.path.splitext(run_file)[0])
+    return [base + extension for extension in RUN_FILE_EXTENSIONS if os.path.exists(base + extension)]
+
+
+def retention_candidates(store, output_dir, keep_runs=10, keep_days=30, now=None):
+    """Runs whose files fall outside the retention policy
+
+    The newest keep_runs runs and all runs of the last keep_days days keep
+    their files. Only runs that are in the store are considered.
+
+    Returns:
+        List of (run file, [paths]) for runs with files to archive/delete
+    """
+    cutoff = ((now or datetime.now()) - timedelta(days=keep_days)).isoformat(timespec='seconds')
+    candidates = []
+    for position, run in enumerate(store.list_runs()):
+        if position < keep_runs or run['started_at'] >= cutoff:
+            continue
+        paths = run_files(output_dir, run['file'])
+        if paths:
+            candidates.append((run['file'], paths))
+    return candidates
+
+
+def apply_retention(candidates, action='archive', archive_dir=None):
+    """Archive (move) or delete the files of the given runs
+
+    Returns:
+        Number of files moved or deleted
+    """
+    if action not in ('archive', 'delete'):
+        raise ValueError(f"Unknown retention action: {action}")
+    count = 0
+    for _, paths in candidates:
+        for path in paths:
+            if action == 'archive':
+                os.makedirs(archive_dir, exist_ok=True)
+                shutil.move(path, os.path.join(archive_dir, os.path.basename(path)))
+            else:
+                os.remove(path)
+            count += 1
+    return count
+
+
+def unimported_files(store, output_dir):
+    """Result files in the output directory that are not in the store yet"""
+    known = {run['file'] for run in store.list_runs()}
+    return [path for path in result_files(output_dir) if run_name(path) not in known]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Compound-aware German keyword matcher based on word roots
+
+German compounds ("Straßenbeleuchtungsanlage", "Flutlichtmasten") cannot be
+found with word-boundary matching unless every compound is listed. This
+matcher instead looks for a few roots anywhere inside each word and accepts
+the word if what follows the root is a known inflection ending, optionally
+followed by further compound members (tails):
+
+    word = <any prefix> ROOT ENDING [LINK TAIL ENDING]*
+
+    straßen + leucht + e                    -> match (root "leucht")
+    be + leucht + ung + s + anlage + n      -> match (root "leucht")
+    licht + en + stein                      -> no match ("stein" is no tail)
+    lamp + ertheim                          -> no match
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from utils.keyword_matcher import KeywordSet, MatchResult
+
+# Linking elements (Fugenelemente) between compound members
+LINKS = ['', 's', 'n', 'en', 'e', 'es']
+
+# Endings allowed after a tail
+TAIL_ENDINGS = ['', 'e', 'en', 'n', 's', 'es', 'er']
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Cached decisions per token, tokens repeat a lot across tenders
+TOKEN_CACHE_SIZE = 50000
+
+
+class Trie:
+    """Character trie that finds all entries starting at a position"""
+
+    def __init__(self, words=()):
+        self.root = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = word
+
+    def prefixes_at(self, text, start):
+        """Yield every entry that text contains at position start"""
+        node = self.root
+        for index in range(start, len(text)):
+            node = node.get(text[index])
+            if node is None:
+                return
+            if '' in node:
+                yield node['']
+
+
+class CompoundMatcher:
+    """Root/affix based matcher with the same interface as KeywordMatcher"""
+
+    def __init__(self, roots: Dict[str, List[str]], tails: Optional[List[str]] = None,
+                 words: Optional[List[str]] = None, ignore: Optional[List[str]] = None,
+                 exclude_keywords=None, use_word_boundaries=True):
+        """
+        Args:
+            roots: Root -> allowed endings directly after the root
+                   (e.g. {'leucht': ['', 'e', 'en', 'ung']})
+            tails: Compound members that may follow a root ending
+                   (e.g. ['anlage', 'mast', 'tausch'])
+            words: Whole words that match on their own (e.g. ['straße'])
+            ignore: Word parts that hide a root and never count as a match
+                    (e.g. ['pflicht'] so "Meldepflicht" does not match "licht")
+            exclude_keywords: Keywords that exclude a result (as in KeywordMatcher)
+            use_word_boundaries: Word boundaries for the exclude keywords
+        """
+        self.roots = {str(root).lower(): [str(e or '').lower() for e in (endings or [''])]
+                      for root, endings in (roots or {}).items()}
+        self.root_trie = Trie(self.roots)
+        self.tail_trie = Trie(str(tail).lower() for tail in (tails or []))
+        self.words = {str(word).lower() for word in (words or [])}
+        ignore = [str(part).lower() for part in (ignore or []) if part]
+        self.ignore_pattern = re.compile('|'.join(map(re.escape, ignore))) if ignore else None
+        self.exclude = KeywordSet(exclude_keywords, use_word_boundaries)
+        self.token_cache = {}
+
+    @classmethod
+    def from_config(cls, config, exclude_keywords=None, use_word_boundaries=None):
+        """Build the matcher from the search.morphology section"""
+        if exclude_keywords is None:
+            exclude_keywords = config.get('search.exclude_keywords', [])
+        if use_word_boundaries is None:
+            use_word_boundaries = config.get('search.use_word_boundaries', True)
+        return cls(
+            roots=config.get('search.morphology.roots', {}),
+            tails=config.get('search.morphology.tails', []),
+            words=config.get('search.morphology.words', []),
+            ignore=config.get('search.morphology.ignore', []),
+            exclude_keywords=exclude_keywords,
+            use_word_boundaries=use_word_boundaries
+        )
+
+    @property
+    def has_filter(self):
+        """True if there is anything to match (otherwise nothing is filtered)"""
+        return bool(self.roots or self.words)
+
+    def _accepts_rest(self, rest, endings):
+        """Check that rest is an allowed ending, optionally followed by more compound members"""
+        for ending in endings:
+            if not rest.startswith(ending):
+                continue
+            after_ending = rest[len(ending):]
+            if not after_ending:
+                return True
+            for link in LINKS:
+                if not after_ending.startswith(link):
+                    continue
+                position = len(link)
+                for tail in self.tail_trie.prefixes_at(after_ending, position):
+                    if self._accepts_rest(after_ending[position + len(tail):], TAIL_ENDINGS):
+                        return True
+        return False
+
+    def _match_root(self, word):
+        """Return the first root found in word with an accepted rest, or None"""
+        for start in range(len(word)):
+            for root in self.root_trie.prefixes_at(word, start):
+                if self._accepts_rest(word[start + len(root):], self.roots[root]):
+                    return root
+        return None
+
+    def match_token(self, token):
+        """Return the root (or word) a lowercased token matches, or None"""
+        if token in self.token_cache:
+            return self.token_cache[token]
+
+        found = token if token in self.words else None
+        if found is None:
+            # Ignored parts split the word, a root must lie completely in one piece
+            pieces = self.ignore_pattern.split(token) if self.ignore_pattern else [token]
+            for piece in pieces:
+                found = self._match_root(piece)
+                if found:
+                    break
+
+        if len(self.token_cache) >= TOKEN_CACHE_SIZE:
+            self.token_cache.clear()
+        self.token_cache[token] = found
+        return found
+
+    def match(self, text, collect_all=True) -> MatchResult:
+        """Match a text; matched_keywords holds the roots/words that were found"""
+        text_lower = (text or '').lower()
+        excluded = self.exclude.find_all(text_lower, first_only=not collect_all)
+        if excluded and not collect_all:
+            return MatchResult([], excluded)
+
+        matched = {}
+        for token in TOKEN_PATTERN.findall(text_lower):
+            root = self.match_token(token)
+            if root:
+                matched[root] = True
+                if not collect_all:
+                    break
+        return MatchResult(list(matched), excluded)
+
+    def should_skip(self, text) -> bool:
+        """True if a result should be skipped (excluded or no root matched)"""
+        if not self.has_filter:
+            return False  # No filtering, process everything
+        return not self.match(text, collect_all=False).relevant
+
+    def is_relevant(self, text) -> bool:
+        """True if a root matches and no exclude keyword does"""
+        return self.match(text, collect_all=False).relevant
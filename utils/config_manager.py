@@ -82,8 +82,19 @@ class ConfigManager:
             'search': {
                 'terms': ['Straßenbeleuchtung', 'LED', 'Beleuchtung'],
                 'max_pages': 3,
+                'planner': {
+                    'enabled': True, 'min_new_fraction': 0.1, 'min_pages': 1,
+                    'min_expected_relevant': 0.0, 'min_samples': 3, 'audit_every': 10
+                },
                 'max_results_per_page': 0,
-                'filter_keywords': []
+                'server_filters': {'publish_end': '0'},
+                'filter_keywords': [],
+                'match_mode': 'keywords',
+                'morphology': {'roots': {}, 'tails': [], 'words': [], 'ignore': []},
+                'keyword_stats': True,
+                'known_tenders': {'enabled': True, 'revalidate_hours': 24},
+                'detail_mode': 'full',
+                'required_fields': ['title', 'contracting_authority', 'deadline']
             },
             'browser': {
                 'headless': False,
@@ -113,7 +124,11 @@ class ConfigManager:
             'output': {
                 'directory': 'output',
                 'formats': ['json', 'excel'],
+                'parquet_directory': 'parquet',
+                'compression': 'none',
+                'retention': {'keep_runs': 10, 'keep_days': 30, 'action': 'archive', 'archive_directory': 'archive'},
                 'include_timestamp': True,
+                'database': 'tenders.db',
                 'save_debug_html': False,
                 'extract_fields': [
                     'title', 'description', 'contracting_authority', 'location',
@@ -135,6 +150,7 @@ class ConfigManager:
             'performance': {
                 'parallel_details': False,
                 'max_workers': 3,
+                'parse_queue_size': 6,
                 'use_cache': True,
                 'cache_expiry': 24
             },
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Producer/consumer pipeline that parses detail pages in worker processes
+"""
+
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.page_parser import parse_order_details
+
+
+class DetailPipeline:
+    """Decouples fetching detail pages from parsing them
+
+    The browser thread (producer) puts raw HTML into a bounded queue and
+    goes on fetching. A dispatcher thread hands the pages to a pool of parser
+    processes, and a single collector thread receives the result dicts and
+    passes them to the collector callback (dedup, persistence, printing).
+
+    When parsers fall behind, the queue fills up and put() blocks, so the
+    browser never runs more than queue_size pages ahead of the parsers.
+
+    If the pool breaks (e.g. a worker process was killed), the dispatcher
+    keeps draining the queue, the pages it could not hand over are listed
+    in failed and put() raises, so the producer can parse on its own.
+    """
+
+    def __init__(self, collector, max_workers=3, queue_size=None):
+        """
+        Args:
+            collector: Callable receiving each parsed result dict
+            max_workers: Number of parser processes
+            queue_size: Maximum number of fetched pages waiting to be parsed
+                        (default: 2 x max_workers)
+        """
+        self.collector = collector
+        self.max_workers = max(1, int(max_workers))
+        self.queue = queue.Queue(maxsize=queue_size or 2 * self.max_workers)
+        self.parsed = queue.Queue()
+        self.slots = threading.BoundedSemaphore(self.max_workers)
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.closed = False
+        self.error = None  # Exception that broke the parser pool
+        self.failed = []  # URLs of queued pages that were not parsed
+
+        self.dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self.collector_thread = threading.Thread(target=self._collect, daemon=True)
+        self.dispatcher.start()
+        self.collector_thread.start()
+
+    def put(self, html, url, search_term):
+        """Queue a fetched page for parsing (blocks while the queue is full)"""
+        if self.closed:
+            raise RuntimeError("DetailPipeline is already closed")
+        if self.error is not None:
+            raise RuntimeError(f"DetailPipeline is broken: {self.error}")
+        self.queue.put((html, url, search_term))
+
+    def _dispatch(self):
+        """Move queued pages into the parser pool, at most max_workers at a time"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            html, url, search_term = item
+            if self.error is not None:
+                self.failed.append(url)
+                continue
+            # Keep pages in the bounded queue until a parser is free
+            self.slots.acquire()
+            try:
+                future = self.executor.submit(parse_order_details, html, url, search_term)
+            except Exception as e:
+                # Keep draining so a blocked put() returns and sees the error
+                self.slots.release()
+                self.error = e
+                self.failed.append(url)
+                print(f"      ✗ Parser pool failed, {url} not parsed: {e}")
+                continue
+            future.url = url
+            future.add_done_callback(self._on_parsed)
+
+    def _on_parsed(self, future):
+        """Release the parser slot and hand the result to the collector thread"""
+        self.slots.release()
+        self.parsed.put(future)
+
+    def _collect(self):
+        """Single consumer for parsed results"""
+        while True:
+            future = self.parsed.get()
+            if future is None:
+                break
+            try:
+                info = future.result()
+            except Exception as e:
+                print(f"      ✗ Error parsing details of {future.url}: {e}")
+                continue
+            try:
+                self.collector(info)
+            except Exception as e:
+                print(f"      ✗ Error collecting details of {future.url}: {e}")
+
+    def close(self):
+        """Wait until all queued pages are parsed and collected"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.dispatcher.join()
+        self.executor.shutdown(wait=True)
+        self.parsed.put(None)
+        self.collector_thread.join()
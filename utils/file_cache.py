@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+In-memory cache for values loaded from files
+
+Each entry remembers the (path, mtime, size) of the files it was loaded
+from and is reloaded as soon as one of them changes, so the viewer parses
+a run once instead of on every request.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_signature(paths):
+    """(path, mtime, size) of each file; missing files count as (path, None, None)"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class FileCache:
+    """Least recently used cache of values invalidated by file changes"""
+
+    def __init__(self, max_entries=16):
+        """
+        Args:
+            max_entries: Number of values kept (least recently used are dropped)
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (signature, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, paths, loader):
+        """Cached value for key, loaded again with loader() when a file changed
+
+        Args:
+            key: Cache key
+            paths: Files the value is derived from
+            loader: Function without arguments returning the value
+        """
+        signature = file_signature(paths)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] == signature:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+        with self.lock:
+            self.entries[key] = (signature, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drop all entries"""
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Compiled keyword matcher for early (result list) and late (final) filtering
+"""
+
+import re
+from typing import List, Optional
+
+
+class MatchResult:
+    """Outcome of matching one text against include/exclude keywords"""
+
+    def __init__(self, matched_keywords, excluded_keywords):
+        self.matched_keywords = matched_keywords
+        self.excluded_keywords = excluded_keywords
+
+    @property
+    def included(self):
+        """True if at least one include keyword matched"""
+        return bool(self.matched_keywords)
+
+    @property
+    def excluded(self):
+        """True if at least one exclude keyword matched"""
+        return bool(self.excluded_keywords)
+
+    @property
+    def relevant(self):
+        """True if the text matches the filter and is not excluded"""
+        return self.included and not self.excluded
+
+    def __repr__(self):
+        return f"MatchResult(matched={self.matched_keywords}, excluded={self.excluded_keywords})"
+
+
+def trie_pattern(keywords: List[str]) -> str:
+    """Build a regex alternation that shares common prefixes (a trie as regex)
+
+    "licht", "lichter", "lichtmast" becomes "licht(?:er|mast)?", so the regex
+    engine follows one path per character instead of trying every keyword.
+    Optional groups are greedy, so the longest keyword is preferred.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a keyword
+
+    def to_pattern(node):
+        is_end = '' in node
+        branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if is_end else group
+
+    return to_pattern(trie)
+
+
+class KeywordSet:
+    """A set of keywords compiled into a single regular expression
+
+    All keywords are combined into one prefix-sharing alternation inside a
+    lookahead, so a single finditer() pass over the text finds the longest
+    keyword starting at each position. Keywords that are prefixes of a
+    longer match (e.g. "led" inside "led-leuchten", or "licht" inside
+    "lichter" in substring mode) are added from a precomputed table, so
+    every matching keyword is reported without scanning the text again.
+    """
+
+    def __init__(self, keywords: Optional[List[str]], use_word_boundaries=True):
+        self.use_word_boundaries = use_word_boundaries
+        # Lowercase once, drop empties and duplicates (keep config order)
+        self.keywords = list(dict.fromkeys(
+            str(keyword).lower() for keyword in (keywords or []) if keyword
+        ))
+        self.pattern = self._compile()
+        self.prefixes = self._build_prefix_table()
+
+    def _compile(self):
+        """Build one pattern for all keywords"""
+        if not self.keywords:
+            return None
+        alternation = trie_pattern(self.keywords)
+        if self.use_word_boundaries:
+            return re.compile(r'(?=\b(' + alternation + r')\b)')
+        return re.compile(r'(?=(' + alternation + r'))')
+
+    def _build_prefix_table(self):
+        """Map each keyword to the shorter keywords that also match wherever it matches"""
+        table = {}
+        for keyword in self.keywords:
+            contained = []
+            for other in self.keywords:
+                if other == keyword or not keyword.startswith(other):
+                    continue
+                if self.use_word_boundaries:
+                    # The shorter keyword must end on a word boundary inside the longer one
+                    boundary = re.match(r'\b' + re.escape(other) + r'\b', keyword)
+                    if not boundary:
+                        continue
+                contained.append(other)
+            if contained:
+                table[keyword] = contained
+        return table
+
+    def find_all(self, text_lower: str, first_only=False) -> List[str]:
+        """Return all keywords found in an already lowercased text"""
+        if self.pattern is None:
+            return []
+        found = {}
+        for match in self.pattern.finditer(text_lower):
+            keyword = match.group(1)
+            found[keyword] = True
+            if first_only:
+                break
+            for shorter in self.prefixes.get(keyword, ()):
+                found[shorter] = True
+        return list(found)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+
+class KeywordMatcher:
+    """Include/exclude keyword matcher built once from the configuration
+
+    Replaces the per-keyword re.search loops: the text is lowercased once and
+    each keyword list is matched in a single pass, so matching time does not
+    grow with the number of keywords.
+    """
+
+    def __init__(self, filter_keywords=None, exclude_keywords=None, use_word_boundaries=True):
+        """
+        Args:
+            filter_keywords: Keywords of which at least one must match
+            exclude_keywords: Keywords that exclude a result
+            use_word_boundaries: Match whole words only (LED won't match Leder)
+        """
+        self.include = KeywordSet(filter_keywords, use_word_boundaries)
+        self.exclude = KeywordSet(exclude_keywords, use_word_boundaries)
+        self.use_word_boundaries = use_word_boundaries
+
+    def match(self, text: str, collect_all=True) -> MatchResult:
+        """Match a text against include and exclude keywords
+
+        Args:
+            text: Text to check (title, description, ...)
+            collect_all: Report every matching keyword; if False, stop
+                         at the first include/exclude hit
+
+        Returns:
+            MatchResult with the matched and excluding keywords
+        """
+        text_lower = (text or '').lower()
+        excluded = self.exclude.find_all(text_lower, first_only=not collect_all)
+        if excluded and not collect_all:
+            return MatchResult([], excluded)
+        matched = self.include.find_all(text_lower, first_only=not collect_all)
+        return MatchResult(matched, excluded)
+
+    def should_skip(self, text: str) -> bool:
+        """True if a result should be skipped (excluded or no include keyword)"""
+        if not self.include:
+            return False  # No filtering, process everything
+        return not self.match(text, collect_all=False).relevant
+
+    def is_relevant(self, text: str) -> bool:
+        """True if a result matches an include keyword and no exclude keyword"""
+        return self.match(text, collect_all=False).relevant
+
+
+def build_matcher(config, filter_keywords=None, exclude_keywords=None, use_word_boundaries=None):
+    """Build the keyword matcher from configuration, with optional overrides"""
+    if filter_keywords is None:
+        filter_keywords = config.get('search.filter_keywords', [])
+    if exclude_keywords is None:
+        exclude_keywords = config.get('search.exclude_keywords', [])
+    if use_word_boundaries is None:
+        use_word_boundaries = config.get('search.use_word_boundaries', True)
+    return KeywordMatcher(filter_keywords, exclude_keywords, use_word_boundaries)
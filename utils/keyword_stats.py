@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Per-keyword hit statistics for early and late filtering, kept across runs
+
+For every filter keyword (or root in morphological mode) the scraper counts
+how many results it matched, how often it was the only matching keyword and
+how many of those results ended up relevant. Keywords matched together are
+counted as well, so the report can find keywords that never add anything.
+"""
+
+import os
+import json
+from datetime import datetime
+
+from utils.page_parser import canonical_url
+
+STAGES = ('early', 'late')
+
+
+def empty_counts():
+    """Counters for one keyword"""
+    return {stage: {'matched': 0, 'only': 0, 'relevant': 0} for stage in STAGES}
+
+
+class KeywordStats:
+    """Collects keyword hits during a run and merges them into a JSON file"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: JSON file the statistics are stored in
+        """
+        self.path = path
+        self.keywords = {}  # keyword -> stage -> counters (this run)
+        self.co_matches = {}  # keyword -> other keyword -> results matched together
+        self.early_matches = {}  # canonical url -> keywords matched by the early filter
+
+    def _counts(self, keyword):
+        if keyword not in self.keywords:
+            self.keywords[keyword] = empty_counts()
+        return self.keywords[keyword]
+
+    def record(self, stage, matched_keywords, relevant=False, url=None):
+        """Record the keywords one result matched
+
+        Args:
+            stage: 'early' (result list) or 'late' (final results)
+            matched_keywords: Keywords found in the result text
+            relevant: True if the result was kept (late stage)
+            url: Result URL, to credit early keywords when the result is kept
+                 (cards and detail pages link the same tender differently,
+                 so it is compared in canonical form)
+        """
+        matched_keywords = list(matched_keywords)
+        for keyword in matched_keywords:
+            counts = self._counts(keyword)[stage]
+            counts['matched'] += 1
+            if len(matched_keywords) == 1:
+                counts['only'] += 1
+            if relevant:
+                counts['relevant'] += 1
+            others = self.co_matches.setdefault(keyword, {})
+            for other in matched_keywords:
+                if other != keyword:
+                    others[other] = others.get(other, 0) + 1
+
+        url = canonical_url(url)
+        if stage == 'early' and url:
+            self.early_matches[url] = matched_keywords
+        elif stage == 'late' and url and relevant:
+            # Credit the keywords that let this result through the early filter
+            for keyword in self.early_matches.pop(url, []):
+                self._counts(keyword)['early']['relevant'] += 1
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def save(self):
+        """Add this run's counts to the stored statistics and reset them"""
+        if not self.keywords:
+            return
+        stored = load_stats(self.path)
+
+        for keyword, stages in self.keywords.items():
+            target = stored['keywords'].setdefault(keyword, empty_counts())
+            for stage, counts in stages.items():
+                for name, value in counts.items():
+                    target[stage][name] = target[stage].get(name, 0) + value
+
+        for keyword, others in self.co_matches.items():
+            target = stored['co_matches'].setdefault(keyword, {})
+            for other, value in others.items():
+                target[other] = target.get(other, 0) + value
+
+        stored['runs'] += 1
+        stored['updated_at'] = datetime.now().isoformat(timespec='seconds')
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, ensure_ascii=False, indent=2)
+        print(f"✓ Keyword statistics saved to {self.path}")
+
+        self.keywords, self.co_matches, self.early_matches = {}, {}, {}
+
+
+def load_stats(path):
+    """Load stored statistics (empty statistics if the file does not exist)"""
+    stats = {'runs': 0, 'updated_at': None, 'keywords': {}, 'co_matches': {}}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stats.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"✗ Could not load keyword statistics {path}: {e}")
+    return stats
+
+
+def total_matched(stats, keyword):
+    """Results a keyword matched in both stages"""
+    counts = stats['keywords'].get(keyword, {})
+    return sum(counts.get(stage, {}).get('matched', 0) for stage in STAGES)
+
+
+def analyze_keywords(stats, configured_keywords):
+    """Find keywords that can be removed
+
+    Args:
+        stats: Statistics from load_stats
+        configured_keywords: Keywords currently in the configuration
+
+    Returns:
+        Dict with lists for 'duplicates', 'never_matched', 'never_only'
+        and 'subsumed' (keyword, covering keywords)
+    """
+    lowered = [str(keyword).lower() for keyword in configured_keywords if keyword]
+    seen, duplicates = set(), []
+    for keyword in lowered:
+        if keyword in seen and keyword not in duplicates:
+            duplicates.append(keyword)
+        seen.add(keyword)
+    keywords = list(dict.fromkeys(lowered))
+
+    never_matched = [keyword for keyword in keywords if total_matched(stats, keyword) == 0]
+
+    never_only = []
+    subsumed = []
+    for keyword in keywords:
+        matched = total_matched(stats, keyword)
+        if not matched:
+            continue
+        counts = stats['keywords'][keyword]
+        if sum(counts.get(stage, {}).get('only', 0) for stage in STAGES) == 0:
+            never_only.append(keyword)
+        # Covered by another keyword that matched every result this one matched
+        covering = [other for other, together in stats['co_matches'].get(keyword, {}).items()
+                    if together >= matched and other in seen]
+        if covering:
+            subsumed.append((keyword, sorted(covering)))
+
+    return {
+        'duplicates': duplicates,
+        'never_matched': never_matched,
+        'never_only': never_only,
+        'subsumed': subsumed
+    }
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+HTML parsing for evergabe.de search result and detail pages
+
+Everything in here works on raw HTML strings and has no browser dependency,
+so it can run in worker processes and offline against saved pages.
+"""
+
+import re
+from datetime import datetime
+from bs4 import BeautifulSoup
+
+from utils.result_normalizer import (
+    normalize_result, DATE_PATTERN, DISTANCE_PATTERN, POSTAL_CODE_PATTERN
+)
+
+BASE_URL = "https://www.evergabe.de"
+
+# Detail URLs end in the URL's own tender number (/auftraege/auftrag-suchen/details/2400101).
+# It is only a dedup key (see url_id), not the Vergabe-ID shown on the page.
+DETAIL_ID_PATTERN = re.compile(r'/details/(\d+)')
+
+
+def absolute_url(href):
+    """Make a relative evergabe.de link absolute"""
+    if not href.startswith('http'):
+        return f"{BASE_URL}{href}"
+    return href
+
+
+def canonical_url(url):
+    """Tender URL without query string, fragment and trailing slash
+
+    The same tender is linked with different search_id parameters from
+    every search, so stored tenders are keyed by this form.
+    """
+    if not url:
+        return url
+    url = absolute_url(url).split('#', 1)[0].split('?', 1)[0]
+    return url.rstrip('/')
+
+
+def url_id(url):
+    """Tender number in a tender URL ('' if the URL has none)
+
+    Result cards only link the detail page. The number in its path
+    identifies the tender on evergabe.de, so duplicates linked through
+    different paths can be recognised before the page is loaded. It is
+    not the Vergabe-ID shown on the detail page and only used for dedup.
+    """
+    url = canonical_url(url)
+    if not url:
+        return ''
+    match = DETAIL_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
+    last_segment = url.rsplit('/', 1)[-1]
+    return last_segment if last_segment.isdigit() else ''
+
+
+def parse_search_results(html):
+    """Parse a search result page into result cards
+
+    Args:
+        html: Page source of a search result page
+
+    Returns:
+        List of dicts with url, url_id, title, description, meta_text and
+        full_text, unique by canonical URL and in page order
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # evergabe.de uses <li class="result-list-item"> for results
+    result_items = soup.find_all('li', class_='result-list-item')
+
+    cards = []
+    if result_items:
+        for item in result_items:
+            # Each result item has a data-href attribute with the tender URL
+            tender_url = item.get('data-href', '')
+            if tender_url:
+                cards.append(parse_result_item(item))
+    else:
+        # Fallback: look for links in any result-related containers
+        result_containers = soup.find_all(['div', 'ul'], class_=lambda x: x and 'result' in str(x).lower())
+
+        for container in result_containers:
+            # Find links that look like tender details
+            container_links = container.find_all('a', href=lambda x: x and '/ausschreibung/' in x)
+            for link in container_links:
+                href = link.get('href', '')
+                text = link.get_text(strip=True)
+
+                # Skip if it's a navigation link
+                if any(skip in href.lower() for skip in ['merken', 'filter', 'sort']):
+                    continue
+
+                if text and len(text) > 10:
+                    cards.append({
+                        'url': href,
+                        'title': text,
+                        'description': '',
+                        'meta_text': '',
+                        'full_text': text,
+                        'contracting_authority': '',
+                        'location': '',
+                        'deadline': ''
+                    })
+
+    # Filter unique tenders (the same tender may be linked with other parameters)
+    unique_cards = []
+    seen = set()
+    for card in cards:
+        card['url'] = absolute_url(card['url'])
+        card['url_id'] = url_id(card['url'])
+        key = canonical_url(card['url'])
+        if key not in seen:
+            seen.add(key)
+            unique_cards.append(card)
+
+    return unique_cards
+
+
+def parse_result_item(item):
+    """Parse a single <li class="result-list-item"> into a result card"""
+    # Get the title from the h3 element
+    title_elem = item.find('h3', class_='result-list-item-title')
+    title = ''
+    if title_elem:
+        title_link = title_elem.find('a')
+        if title_link:
+            title = title_link.get_text(strip=True)
+
+    # Get description/preview text from the result item
+    description = ''
+    # Look for description in various possible elements
+    desc_elem = item.find('p', class_='result-list-item-description')
+    if not desc_elem:
+        desc_elem = item.find('div', class_='description')
+    if not desc_elem:
+        desc_elem = item.find('p')  # Any paragraph in the item
+
+    if desc_elem:
+        description = desc_elem.get_text(strip=True)
+
+    # Get any additional metadata (location, authority, etc.)
+    meta_text = ''
+    meta_parts = []
+    is_meta = lambda x: x and ('meta' in str(x).lower() or 'info' in str(x).lower())
+    meta_elems = item.find_all(['span', 'div'], class_=is_meta)
+    for position, meta in enumerate(meta_elems):
+        text = meta.get_text(strip=True)
+        meta_text += ' ' + text
+        # Innermost meta elements hold the single values. find_all returns
+        # document order, so a meta element with nested ones is directly
+        # followed by its first nested one.
+        following = meta_elems[position + 1] if position + 1 < len(meta_elems) else None
+        is_leaf = following is None or not _is_inside(following, meta, item)
+        if text and is_leaf and text not in meta_parts:
+            meta_parts.append(text)
+
+    card = {
+        'url': item.get('data-href', ''),
+        'title': title,
+        'description': description,
+        'meta_text': meta_text,
+        # Combine all text for better filtering
+        'full_text': f"{title} {description} {meta_text}"
+    }
+    card.update(classify_meta_parts(meta_parts))
+    return card
+
+
+def _is_inside(element, ancestor, stop):
+    """Whether element is nested in ancestor (searching up to stop)"""
+    for parent in element.parents:
+        if parent is ancestor:
+            return True
+        if parent is stop:
+            return False
+    return False
+
+
+def classify_meta_parts(meta_parts):
+    """Sort the meta values of a result card into authority, location and deadline
+
+    The card shows them without labels, so they are recognised by shape:
+    a date is the deadline, a postal code or distance is the location and
+    the first remaining value is the contracting authority.
+    """
+    fields = {'contracting_authority': '', 'location': '', 'deadline': ''}
+    for part in meta_parts:
+        date_match = DATE_PATTERN.search(part)
+        if not fields['deadline'] and date_match:
+            # Strip labels like "Angebotsfrist:"
+            label = part[:date_match.start()]
+            fields['deadline'] = part[len(label):].strip() if label.rstrip().endswith(':') else part
+        elif not fields['location'] and (DISTANCE_PATTERN.search(part) or POSTAL_CODE_PATTERN.search(part)):
+            fields['location'] = part
+        elif not fields['contracting_authority']:
+            fields['contracting_authority'] = part
+    return fields
+
+
+def card_to_result(card, search_term):
+    """Build a partial result from a search result card (no detail page)
+
+    Args:
+        card: Card dict from parse_search_results()
+        search_term: Search term that found this order
+
+    Returns:
+        Result dict with details_loaded=False
+    """
+    info = empty_result(card['url'], search_term)
+    for field in ('title', 'description', 'contracting_authority', 'location', 'deadline'):
+        info[field] = card.get(field, '')
+    info['details_loaded'] = False
+    return normalize_result(info)
+
+
+def empty_result(url, search_term):
+    """Create a result dict with all extracted fields empty"""
+    return {
+        'search_term': search_term,
+        'url': url,
+        'scraped_at': datetime.now().isoformat(),
+        'title': '',
+        'description': '',
+        'contracting_authority': '',
+        'location': '',
+        'deadline': '',
+        'cpv_codes': '',
+        'reference': '',
+        'vergabe_id': '',
+        'procedure_type': '',
+        'period_of_performance': '',
+        'documents': []
+    }
+
+
+def extract_title(soup, info):
+    """Get title from H1"""
+    h1 = soup.find('h1', class_='header-flex__headline')
+    if not h1:
+        h1 = soup.find('h1')
+    if h1:
+        info['title'] = h1.get_text(strip=True)
+
+
+def extract_description(soup, info):
+    """Get description from the "Ausgeschriebene Leistung" section"""
+    desc_section = soup.find('div', id='award_procedure_details')
+    if desc_section:
+        desc_text = desc_section.find('p', class_='shorttext')
+        if desc_text:
+            info['description'] = desc_text.get_text(strip=True)
+
+
+def extract_contracting_authority(soup, info):
+    """Get contracting authority (Auftraggeber)"""
+    authority_section = soup.find('div', id='contracting_authority')
+    if authority_section:
+        # Look for the full authority text including all details
+        authority_text = []
+        # Get all p tags with authority information
+        for p_tag in authority_section.find_all('p'):
+            text = p_tag.get_text(strip=True)
+            if text:
+                authority_text.append(text)
+        if authority_text:
+            info['contracting_authority'] = ', '.join(authority_text)
+
+    # Alternative: look for Auftraggeber header
+    if not info['contracting_authority']:
+        auftraggeber = soup.find(text=lambda x: x and 'Auftraggeber' in x)
+        if auftraggeber:
+            parent = auftraggeber.find_parent()
+            if parent:
+                next_elem = parent.find_next_sibling()
+                if next_elem:
+                    info['contracting_authority'] = next_elem.get_text(strip=True)
+
+
+def extract_location(soup, info):
+    """Get location from "Ausführungsort" section"""
+    location_section = soup.find('div', id='award_procedure_places')
+    if not location_section:
+        return
+
+    # Get all location-related text elements
+    location_parts = []
+    seen_texts = set()  # Track unique texts to avoid duplicates
+
+    # Look for all p tags and spans with location info
+    for elem in location_section.find_all(['p', 'span']):
+        text = elem.get_text(strip=True)
+        # Skip UI elements, headers, and duplicates
+        skip_terms = ['Ausführungsort', 'Karte anzeigen', 'mehr anzeigen',
+                     'weniger anzeigen', 'anzeigen', '(1)', '(2)', '(3)']
+
+        if text and not any(skip in text for skip in skip_terms) and len(text) > 2:
+            # Clean up the text
+            text = text.replace('Karte anzeigen', '').strip()
+            text = text.replace('mehr anzeigen', '').strip()
+
+            # Only add if not already seen (avoid duplicates)
+            if text not in seen_texts:
+                seen_texts.add(text)
+                # Special handling for postal code + city + distance
+                if 'km)' in text:
+                    # This is likely "04103 Leipzig (387 km)" format
+                    location_parts.append(text)
+                elif text not in str(location_parts):  # Avoid substring duplicates
+                    location_parts.append(text)
+
+    # Clean and join location parts
+    if location_parts:
+        # Remove any duplicate substrings
+        cleaned_parts = []
+        for part in location_parts:
+            is_duplicate = False
+            for other in location_parts:
+                if part != other and part in other:
+                    is_duplicate = True
+                    break
+            if not is_duplicate:
+                cleaned_parts.append(part)
+
+        info['location'] = ', '.join(cleaned_parts)
+    else:
+        # Fallback: try to get any text from the section
+        location_text = location_section.get_text(separator=' ', strip=True)
+        # Clean up common UI elements
+        for term in ['Ausführungsort', 'Karte anzeigen', 'mehr anzeigen', '(1)']:
+            location_text = location_text.replace(term, ' ')
+        location_text = ' '.join(location_text.split())  # Clean whitespace
+        if location_text.strip():
+            info['location'] = location_text.strip()
+
+
+def extract_deadline(soup, info):
+    """Get deadline (Angebotsfrist)"""
+    deadline_elem = soup.find('strong', class_='counter-headline', text='Angebotsfrist')
+    if deadline_elem:
+        deadline_parent = deadline_elem.find_parent()
+        if deadline_parent:
+            deadline_span = deadline_parent.find_next('span', class_='d-block')
+            if deadline_span:
+                info['deadline'] = deadline_span.get_text(strip=True)
+
+
+def extract_reference_ids(soup, info):
+    """Get reference number (Vergabenummer) and Vergabe-ID"""
+    ref_section = soup.find('div', id='file_number_contracting_authority')
+    if ref_section:
+        # Look for all h2 headers and their values
+        h2_tags = ref_section.find_all('h2')
+        for h2 in h2_tags:
+            header_text = h2.get_text(strip=True)
+
+            # Check for Vergabenummer
+            if 'Vergabe' in header_text and 'nummer' in header_text:
+                # Look for the value - it might be in a p tag or as direct text
+                next_elem = h2.find_next_sibling()
+                if next_elem:
+                    value = next_elem.get_text(strip=True)
+                    # Filter out the header text if it's repeated
+                    if value and not 'Auftraggebers' in value and value != header_text:
+                        info['reference'] = value
+                else:
+                    # Try to get text after the h2
+                    parent = h2.parent
+                    if parent:
+                        full_text = parent.get_text(strip=True)
+                        # Split by the header and get what comes after
+                        parts = full_text.split(header_text)
+                        if len(parts) > 1:
+                            value = parts[1].strip()
+                            # Take the first line if multiple lines
+                            if '\n' in value:
+                                value = value.split('\n')[0].strip()
+                            if value and not 'bei evergabe' in value:
+                                info['reference'] = value
+
+            # Check for Vergabe-ID
+            elif 'Vergabe-ID' in header_text:
+                # Look for the value
+                next_elem = h2.find_next_sibling()
+                if next_elem:
+                    value = next_elem.get_text(strip=True)
+                    # Filter out the header text if it's repeated
+                    if value and not 'evergabe.de' in value and value != header_text:
+                        info['vergabe_id'] = value
+                else:
+                    # Try to get text after the h2
+                    parent = h2.parent
+                    if parent:
+                        full_text = parent.get_text(strip=True)
+                        # Split by the header and get what comes after
+                        parts = full_text.split(header_text)
+                        if len(parts) > 1:
+                            value = parts[1].strip()
+                            # Extract just numbers
+                            match = re.search(r'\d+', value)
+                            if match:
+                                info['vergabe_id'] = match.group()
+
+    # If still not found, try a more aggressive search
+    if not info['reference'] or info['reference'] == '(des Auftraggebers)':
+        # Look for codes that look like reference numbers
+        text = soup.get_text()
+        # Pattern for reference numbers (mix of letters and numbers, 5-15 chars)
+        matches = re.findall(r'\b[A-Z0-9]{5,15}\b', text)
+        for match in matches:
+            # Check if this looks like a reference (has both letters and numbers)
+            if any(c.isalpha() for c in match) and any(c.isdigit() for c in match):
+                # Check if it's near "Vergabenummer" text
+                if 'Vergabenummer' in text:
+                    idx = text.find('Vergabenummer')
+                    match_idx = text.find(match)
+                    if abs(match_idx - idx) < 200:  # Within 200 chars
+                        info['reference'] = match
+                        break
+
+    if not info['vergabe_id'] or info['vergabe_id'] == '(bei evergabe.de)':
+        # Look for 7-digit numbers that could be Vergabe-IDs
+        text = soup.get_text()
+        # Pattern for Vergabe-ID (typically 7 digits)
+        matches = re.findall(r'\b\d{6,8}\b', text)
+        for match in matches:
+            # Check if it's near "Vergabe-ID" text
+            if 'Vergabe-ID' in text:
+                idx = text.find('Vergabe-ID')
+                match_idx = text.find(match)
+                if abs(match_idx - idx) < 200:  # Within 200 chars
+                    info['vergabe_id'] = match
+                    break
+
+
+def extract_procedure_type(soup, info):
+    """Get procedure type"""
+    type_section = soup.find('div', id='award_procedure_type')
+    if type_section:
+        type_span = type_section.find('span', text=lambda x: x and 'Ausschreibung' in x if x else False)
+        if type_span:
+            info['procedure_type'] = type_span.get_text(strip=True)
+
+
+def extract_period_of_performance(soup, info):
+    """Get period of performance"""
+    period_section = soup.find('div', id='period_of_performance')
+    if period_section:
+        period_span = period_section.find('span')
+        if period_span:
+            info['period_of_performance'] = period_span.get_text(strip=True)
+
+
+def extract_cpv_codes(soup, info):
+    """Get CPV codes from badges"""
+    cpv_badges = soup.find_all('a', class_='badge-primary-ultra-light', href=lambda x: x and 'craft_code_ids' in x)
+    if cpv_badges:
+        cpv_list = [badge.find('span', class_='link-text').get_text(strip=True) for badge in cpv_badges if badge.find('span', class_='link-text')]
+        info['cpv_codes'] = ', '.join(cpv_list)
+
+
+def extract_documents(soup, info):
+    """Find document links"""
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if any(ext in href.lower() for ext in ['.pdf', '.doc', '.docx', '.zip']) or 'herunterladen' in href:
+            href = absolute_url(href)
+            doc_name = link.get_text(strip=True) or 'Document'
+            if doc_name and 'PDF' not in doc_name and len(doc_name) > 3:
+                info['documents'].append({
+                    'name': doc_name,
+                    'url': href
+                })
+
+
+# Detail page fields in extraction order (later extractors may rely on earlier ones)
+FIELD_EXTRACTORS = [
+    ('title', extract_title),
+    ('description', extract_description),
+    ('contracting_authority', extract_contracting_authority),
+    ('location', extract_location),
+    ('deadline', extract_deadline),
+    ('reference_ids', extract_reference_ids),
+    ('procedure_type', extract_procedure_type),
+    ('period_of_performance', extract_period_of_performance),
+    ('cpv_codes', extract_cpv_codes),
+    ('documents', extract_documents),
+]
+
+
+def parse_order_details(html, url, search_term):
+    """Extract detailed information from the HTML of an order page
+
+    Args:
+        html: Page source of the detail page
+        url: URL the page was loaded from
+        search_term: Search term that found this order
+
+    Returns:
+        Result dict with typed companion fields added
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    info = empty_result(url, search_term)
+
+    for _, extractor in FIELD_EXTRACTORS:
+        extractor(soup, info)
+    info['details_loaded'] = True
+
+    # Add typed companion fields (deadline_iso, distance_km, cpv_list, ...)
+    return normalize_result(info)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Structured progress events of the scraper and the viewer's batch jobs
+
+The scraper (run.py --progress-events) prints one line per event, prefixed
+with PROGRESS_PREFIX and followed by JSON: the current term and page, the
+counters, the throughput and an ETA. The viewer parses these lines from the
+scraper's output and publishes them, together with its own batch-summary
+events, to an EventBroker that streams them to the browser as
+Server-Sent Events.
+"""
+
+import sys
+import json
+import time
+import queue
+import threading
+
+PROGRESS_PREFIX = '@@progress '
+
+# Outcome of a result card -> counter of a scraper run
+OUTCOME_COUNTERS = {'result': 'results', 'skipped': 'skipped', 'duplicate': 'duplicates',
+                    'known': 'known', 'failed': 'failed'}
+
+
+class ProgressReporter:
+    """Counts a scraper run's progress and prints it as event lines"""
+
+    def __init__(self, enabled=False, stream=None):
+        """
+        Args:
+            enabled: Print event lines (otherwise only count)
+            stream: Output stream (default: stdout)
+        """
+        self.enabled = enabled
+        self.stream = stream or sys.stdout
+        self.started = time.monotonic()
+        self.terms = []
+        self.max_pages = 0
+        self.term = None
+        self.term_index = 0
+        self.page = 0
+        self.pages_done = 0
+        self.term_pages = 0  # Pages of the current term
+        self.finished_terms = 0
+        self.finished_pages = 0  # Pages of the finished terms
+        self.cards = 0
+        self.counters = dict.fromkeys(OUTCOME_COUNTERS.values(), 0)
+
+    def emit(self, event, **fields):
+        """Print one event line (with elapsed time, throughput and ETA)"""
+        if not self.enabled:
+            return
+        elapsed = time.monotonic() - self.started
+        payload = {
+            'event': event,
+            'term': self.term,
+            'term_index': self.term_index,
+            'terms': len(self.terms),
+            'page': self.page,
+            'max_pages': self.max_pages,
+            'cards': self.cards,
+            **self.counters,
+            'elapsed': round(elapsed, 1),
+            'cards_per_minute': round(self.cards / elapsed * 60, 1) if elapsed > 0 else 0.0,
+            'eta': self.eta(elapsed),
+        }
+        payload.update(fields)
+        self.stream.write(PROGRESS_PREFIX + json.dumps(payload, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+    def eta(self, elapsed):
+        """Estimated seconds left, assuming the remaining terms load as many pages
+        as the finished ones did on average (None before the first term finished)
+
+        Terms rarely use all max_pages: the result list ends or the term
+        planner stops paging early.
+        """
+        if not self.finished_terms or not self.pages_done:
+            return None
+        pages_per_term = self.finished_pages / self.finished_terms
+        remaining = pages_per_term * (len(self.terms) - self.term_index)
+        if self.term_index > self.finished_terms:
+            remaining += max(pages_per_term - self.term_pages, 0)
+        return round(elapsed / self.pages_done * remaining)
+
+    def start(self, terms, max_pages):
+        """A search over terms starts"""
+        self.started = time.monotonic()
+        self.terms = list(terms)
+        self.max_pages = max_pages
+        self.emit('start')
+
+    def start_term(self, term):
+        """The search for one term starts"""
+        self.term = term
+        self.term_index += 1
+        self.page = 0
+        self.term_pages = 0
+        self.emit('term')
+
+    def start_page(self, page, cards):
+        """A result page with a number of cards was loaded"""
+        self.page = page
+        self.emit('page', page_cards=cards)
+
+    def card(self, outcome, title=''):
+        """A card was handled (outcome: result, skipped, duplicate, known or failed)"""
+        self.cards += 1
+        self.counters[OUTCOME_COUNTERS[outcome]] += 1
+        self.emit('card', outcome=outcome, title=title[:80])
+
+    def end_page(self):
+        """The cards of the current page are done"""
+        self.pages_done += 1
+        self.term_pages += 1
+
+    def end_term(self):
+        """A term is done; its page count goes into the ETA"""
+        self.finished_terms += 1
+        self.finished_pages += self.term_pages
+
+    def details(self, done, total, title=''):
+        """A detail page of an existing run was loaded"""
+        self.emit('details', done=done, total=total, title=title[:80])
+
+    def finish(self):
+        """The run is done"""
+        self.emit('finished')
+
+
+def parse_progress(line):
+    """Event dict of a progress line (None for other output)"""
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(PROGRESS_PREFIX):])
+    except ValueError:
+        return None
+
+
+class EventBroker:
+    """Publishes events to the subscribers of a channel (thread-safe)
+
+    New subscribers first get the channel's last event, so a page opened
+    in the middle of a run shows the current state right away.
+    """
+
+    def __init__(self, queue_size=1000):
+        self.queue_size = queue_size
+        self.subscribers = {}  # channel -> set of queues
+        self.last = {}  # channel -> last event
+        self.lock = threading.Lock()
+
+    def publish(self, channel, event):
+        """Send an event to all subscribers (slow subscribers miss events instead of blocking)"""
+        with self.lock:
+            self.last[channel] = event
+            subscribers = list(self.subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                pass
+
+    def subscribe(self, channel):
+        """Queue receiving the channel's events"""
+        subscriber = queue.Queue(self.queue_size)
+        with self.lock:
+            self.subscribers.setdefault(channel, set()).add(subscriber)
+            if channel in self.last:
+                subscriber.put_nowait(self.last[channel])
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        with self.lock:
+            self.subscribers.get(channel, set()).discard(subscriber)
+
+    def stream(self, channel, keepalive=15.0, until=None):
+        """Server-Sent Events of a channel as text chunks
+
+        Args:
+            channel: Channel name
+            keepalive: Seconds between comment lines that keep the connection open
+            until: Function of an event that returns True for the last event
+        """
+        subscriber = self.subscribe(channel)
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                # The event type is part of the data, so one onmessage handler gets all events
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+                if until and until(event):
+                    return
+        finally:
+            self.unsubscribe(channel, subscriber)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Catalogue of all runs for the viewer's file list
+
+Holds per run its timestamp, file size, result count, summary coverage and
+earliest deadline in memory (and in output/.catalog.json for a fast start).
+It is rebuilt from the tender database only when the output directory,
+the database or the catalogue file changed: a polling watcher checks
+that in the background, and the scraper refreshes it after saving a run.
+"""
+
+import os
+import json
+import threading
+
+from utils.file_cache import file_signature
+from utils.result_files import result_path
+
+CATALOG_FILE = '.catalog.json'
+
+
+class ResultCatalog:
+    """In-memory list of runs, refreshed when the output changes"""
+
+    def __init__(self, store, output_dir, path=None):
+        """
+        Args:
+            store: TenderStore with the runs
+            output_dir: Directory with the result files
+            path: Catalogue file (default: output_dir/.catalog.json)
+        """
+        self.store = store
+        self.output_dir = output_dir
+        self.path = path or os.path.join(output_dir, CATALOG_FILE)
+        self.entries = self.load()
+        self.signature = None
+        self.lock = threading.Lock()
+        self.watcher = None
+        self.stopped = threading.Event()
+
+    def load(self):
+        """Entries of the catalogue file (empty if there is none)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)['runs']
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def save(self):
+        """Write the catalogue file atomically"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'runs': self.entries}, f, ensure_ascii=False)
+        os.replace(self.path + '.tmp', self.path)
+
+    def watched_files(self):
+        """Files whose changes make the catalogue stale"""
+        return [self.output_dir, self.store.path, self.store.path + '-wal', self.path]
+
+    def build(self):
+        """Catalogue entries from the tender database (newest first)"""
+        entries = []
+        for run in self.store.run_overview():
+            path = result_path(self.output_dir, run['file'])
+            entries.append({
+                'filename': run['file'],
+                'timestamp': run['started_at'].replace('T', ' '),
+                'size': os.path.getsize(path) if path else 0,
+                'count': run['result_count'],
+                'summaries': run['summaries'],
+                'earliest_deadline': run['earliest_deadline'],
+            })
+        return entries
+
+    def refresh(self, force=False):
+        """Rebuild the catalogue if a watched file changed
+
+        Returns:
+            True if the catalogue was rebuilt
+        """
+        with self.lock:
+            signature = file_signature(self.watched_files())
+            if not force and signature == self.signature:
+                return False
+            self.store.import_directory(self.output_dir)
+            self.entries = self.build()
+            self.save()
+            # Our own writes must not count as a change
+            self.signature = file_signature(self.watched_files())
+            return True
+
+    def files(self):
+        """All runs, newest first (from memory)"""
+        return self.entries
+
+    def start_watcher(self, interval=2.0):
+        """Refresh the catalogue in a background thread every interval seconds"""
+        if self.watcher:
+            return
+        def watch():
+            while not self.stopped.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"✗ Could not refresh the result catalogue: {e}")
+        self.watcher = threading.Thread(target=watch, daemon=True)
+        self.watcher.start()
+
+    def stop_watcher(self):
+        """Stop the background thread"""
+        self.stopped.set()
+        if self.watcher:
+            self.watcher.join()
+            self.watcher = None
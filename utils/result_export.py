@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Export a run's results to JSON/Excel/CSV/Parquet files
+
+The results are any iterable of result dicts (usually the scraper's JSONL
+sink) and every format is written one result (or batch) at a time: the
+Excel and CSV tables together in a single pass.
+
+Parquet files go into a dataset partitioned by scrape date
+(parquet/scrape_date=YYYY-MM-DD/<run>.parquet) with typed columns, so
+analyses over many runs read only the columns and days they need:
+
+    pd.read_parquet('output/parquet', columns=['deadline', 'contracting_authority'],
+                    filters=[('scrape_date', '>=', '2025-08-01')])
+
+Parquet needs pyarrow (optional, pip install pyarrow).
+"""
+
+import os
+import csv
+import json
+import textwrap
+from datetime import datetime, date
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from utils.page_parser import empty_result
+from utils.result_normalizer import NORMALIZED_FIELDS
+from utils.tender_store import run_started_at
+from utils.result_files import open_text, compression_suffix
+
+
+def flatten_value(key, value):
+    """Cell value of a result field (documents as names, lists joined)"""
+    if key == 'documents':
+        return '\n'.join(d['name'] for d in value) if isinstance(value, list) else ''
+    if isinstance(value, list):
+        return ', '.join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def write_json(results, path, indent=2):
+    """Write results as a JSON array, one result at a time
+
+    Args:
+        results: Iterable of result dicts
+        path: Output file (.gz/.zst are compressed while writing)
+        indent: Pretty-print indent, None for one result per line
+
+    Returns:
+        Number of results written
+    """
+    count = 0
+    with open_text(path, 'w') as f:
+        f.write('[')
+        for result in results:
+            f.write(',\n' if count else '\n')
+            text = json.dumps(result, ensure_ascii=False, indent=indent)
+            f.write(textwrap.indent(text, ' ' * indent) if indent else text)
+            count += 1
+        f.write('\n]' if count else ']')
+    return count
+
+
+# Columns of the Excel/CSV tables: the extracted fields, then the typed ones
+TABLE_COLUMNS = (list(empty_result('', '')) + ['details_loaded'] + NORMALIZED_FIELDS
+                 + ['ai_summary'])
+
+# Excel allows this many hyperlinks per sheet; later URLs are plain text
+MAX_HYPERLINKS = 65530
+
+
+def table_rows(results):
+    """Yield one flat row per result (values in TABLE_COLUMNS order)"""
+    for result in results:
+        yield ['' if result.get(key) is None else flatten_value(key, result.get(key))
+               for key in TABLE_COLUMNS]
+
+
+def excel_value(value):
+    """Cell value without the control characters Excel rejects"""
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub('', value)
+    return value
+
+
+def write_tables(results, excel_path=None, csv_path=None):
+    """Write the Excel and/or CSV table of the results in one pass
+
+    The workbook is written in openpyxl's write-only mode and the CSV row
+    by row, so memory stays flat however many results there are. URLs
+    become hyperlinks in the workbook (openpyxl keeps those until the file
+    is saved, at most MAX_HYPERLINKS of them).
+
+    Returns:
+        Number of rows written
+    """
+    workbook = sheet = writer = csv_file = None
+    if excel_path:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Sheet1')
+        sheet.append(TABLE_COLUMNS)
+    if csv_path:
+        csv_file = open(csv_path, 'w', encoding='utf-8-sig', newline='')
+        writer = csv.writer(csv_file)
+        writer.writerow(TABLE_COLUMNS)
+
+    url_column = TABLE_COLUMNS.index('url')
+    count = 0
+    try:
+        for row in table_rows(results):
+            if writer:
+                writer.writerow(row)
+            if sheet:
+                cells = [excel_value(value) for value in row]
+                url = cells[url_column]
+                if url and count < MAX_HYPERLINKS:
+                    cell = WriteOnlyCell(sheet, value=url)
+                    cell.hyperlink = url
+                    cell.style = 'Hyperlink'
+                    cells[url_column] = cell
+                sheet.append(cells)
+            count += 1
+    finally:
+        if csv_file:
+            csv_file.close()
+    if workbook:
+        workbook.save(excel_path)
+    return count
+
+
+PARQUET_BATCH_SIZE = 1000
+
+
+def parquet_schema(pa):
+    """Typed Parquet columns of a result"""
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('vergabe_id', pa.string()),
+        ('url', pa.string()),
+        ('title', pa.string()),
+        ('description', pa.string()),
+        ('contracting_authority', category),
+        ('procedure_type', category),
+        ('search_term', category),
+        ('location', pa.string()),
+        ('postal_code', pa.string()),
+        ('distance_km', pa.float64()),
+        ('deadline', pa.timestamp('us', tz='Europe/Berlin')),
+        ('deadline_text', pa.string()),
+        ('reference', pa.string()),
+        ('period_start', pa.date32()),
+        ('period_end', pa.date32()),
+        ('cpv_ids', pa.list_(pa.string())),
+        ('cpv_list', pa.list_(pa.string())),
+        ('documents', pa.list_(pa.struct([('name', pa.string()), ('url', pa.string())]))),
+        ('details_loaded', pa.bool_()),
+        ('scraped_at', pa.timestamp('us')),
+    ])
+
+
+def parse_iso(value, parse=datetime.fromisoformat):
+    """Parse an ISO date/timestamp string (None if empty or invalid)"""
+    if not value:
+        return None
+    try:
+        return parse(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parquet_row(result):
+    """Row of typed Parquet values for a result"""
+    row = {key: result.get(key) or None for key in (
+        'vergabe_id', 'url', 'title', 'description', 'contracting_authority', 'procedure_type',
+        'search_term', 'location', 'postal_code', 'reference'
+    )}
+    row.update({
+        'distance_km': result.get('distance_km'),
+        'deadline': parse_iso(result.get('deadline_iso')),
+        'deadline_text': result.get('deadline') or None,
+        'period_start': parse_iso(result.get('period_start'), date.fromisoformat),
+        'period_end': parse_iso(result.get('period_end'), date.fromisoformat),
+        'cpv_ids': list(result.get('cpv_ids') or []),
+        'cpv_list': list(result.get('cpv_list') or []),
+        'documents': [{'name': doc.get('name'), 'url': doc.get('url')} for doc in result.get('documents') or []],
+        'details_loaded': bool(result.get('details_loaded', True)),
+        'scraped_at': parse_iso(result.get('scraped_at')),
+    })
+    return row
+
+
+def write_parquet(results, dataset_dir, base_name, scrape_date=None):
+    """Write results into the date-partitioned Parquet dataset, in batches
+
+    Args:
+        results: Iterable of result dicts
+        dataset_dir: Dataset root (e.g. output/parquet)
+        base_name: File name without extension
+        scrape_date: Partition date (default: today)
+
+    Returns:
+        Path of the written file, or None if pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("✗ Parquet output needs pyarrow (pip install pyarrow) - skipped")
+        return None
+
+    scrape_date = scrape_date or date.today()
+    partition = os.path.join(dataset_dir, f'scrape_date={scrape_date.isoformat()}')
+    os.makedirs(partition, exist_ok=True)
+    path = os.path.join(partition, f'{base_name}.parquet')
+
+    schema = parquet_schema(pa)
+    batch = []
+    with pq.ParquetWriter(path, schema) as writer:
+        for result in results:
+            batch.append(parquet_row(result))
+            if len(batch) >= PARQUET_BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    return path
+
+
+def export_run(results, output_dir, base_name, formats, store=None, search_terms=None,
+               parquet_dir='parquet', compression='none'):
+    """Store a run and write its export files
+
+    Args:
+        results: Iterable of result dicts with len()
+        output_dir: Directory for the export files
+        base_name: File name without extension (evergabe_results_...)
+        formats: Output formats (json, excel, csv, parquet)
+        store: TenderStore the run is saved in first (optional)
+        search_terms: Search terms of the run (stored with it)
+        parquet_dir: Parquet dataset directory (relative to output_dir)
+        compression: JSON file compression (none, gzip, zstd)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Store all runs in the tender database (the files below are exports)
+    if store:
+        store.save_run(results, f'{base_name}.json', search_terms=search_terms)
+        print(f"\n✓ Stored {len(results)} results in {store.path} ({store.count()} tenders in total)")
+
+    if 'json' in formats:
+        suffix = compression_suffix(compression)
+        json_file = os.path.join(output_dir, f'{base_name}.json{suffix}')
+        # Compressed files are not read by people, one result per line is enough
+        count = write_json(results, json_file, indent=None if suffix else 2)
+        print(f"\n✓ Saved {count} results to {json_file}")
+
+    if 'excel' in formats or 'csv' in formats:
+        excel_file = os.path.join(output_dir, f'{base_name}.xlsx') if 'excel' in formats else None
+        csv_file = os.path.join(output_dir, f'{base_name}.csv') if 'csv' in formats else None
+        write_tables(results, excel_file, csv_file)
+        for path in (excel_file, csv_file):
+            if path:
+                print(f"✓ Saved results to {path}")
+
+    if 'parquet' in formats:
+        started_at = run_started_at(base_name)
+        scrape_date = datetime.fromisoformat(started_at).date() if started_at else None
+        parquet_file = write_parquet(results, os.path.join(output_dir, parquet_dir), base_name, scrape_date)
+        if parquet_file:
+            print(f"✓ Saved results to {parquet_file}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Result files, optionally compressed
+
+Runs are exported as evergabe_results_<timestamp>.json, .json.gz or
+.json.zst (output.compression). These helpers open any of them as text with
+streaming (de)compression and map them to the run name (the .json name)
+the tender store keys runs by. zstd needs the zstandard package (optional).
+"""
+
+import io
+import os
+import glob
+import gzip
+import json
+
+# output.compression -> file name suffix
+COMPRESSION_SUFFIXES = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# Result file variants, preferred first
+RESULT_SUFFIXES = ('.json', '.json.gz', '.json.zst')
+
+
+def compression_suffix(compression):
+    """File name suffix of a compression setting"""
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression: {compression} (use {', '.join(COMPRESSION_SUFFIXES)})")
+    return COMPRESSION_SUFFIXES[compression]
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd result files need the zstandard package (pip install zstandard)")
+    return zstandard
+
+
+def open_text(path, mode='r'):
+    """Open a (possibly compressed) file as UTF-8 text, streaming
+
+    Args:
+        path: File name; .gz and .zst are (de)compressed
+        mode: 'r' or 'w'
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if path.endswith('.zst'):
+        zstandard = _zstandard()
+        raw = open(path, mode + 'b')
+        if mode == 'r':
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def load_results(path):
+    """Load the results of a (possibly compressed) JSON result file"""
+    with open_text(path) as f:
+        return json.load(f)
+
+
+def run_name(path):
+    """Run name of a result file: its .json file name without compression suffix"""
+    name = os.path.basename(path)
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if suffix and name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def result_path(directory, run_file):
+    """Existing result file of a run in any variant (None if there is none)"""
+    base = os.path.join(directory, run_name(run_file))[:-len('.json')]
+    for suffix in RESULT_SUFFIXES:
+        if os.path.exists(base + suffix):
+            return base + suffix
+    return None
+
+
+def result_files(directory):
+    """Result files of all runs in a directory (one per run, oldest first)"""
+    names = {run_name(path) for path in glob.glob(os.path.join(directory, 'evergabe_results_*.json*'))
+             if path.endswith(RESULT_SUFFIXES)}
+    return [result_path(directory, name) for name in sorted(names)]
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Normalisation of extracted tender fields into typed companion values
+"""
+
+import re
+from datetime import datetime, date
+from typing import Dict, Any, List, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+    BERLIN_TZ = ZoneInfo('Europe/Berlin')
+except Exception:
+    # No tz database available - fall back to the local timezone
+    BERLIN_TZ = datetime.now().astimezone().tzinfo
+
+# "22.08.2025", "22.08.2025, 10:00 Uhr", "22.08.2025 - 10:00"
+DATE_PATTERN = re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})(?:\D{0,5}?(\d{1,2}):(\d{2}))?')
+# "04103 Leipzig (387 km)" or "(1.024,5 km)"
+DISTANCE_PATTERN = re.compile(r'\(\s*([\d.,]+)\s*km\s*\)', re.IGNORECASE)
+POSTAL_CODE_PATTERN = re.compile(r'\b(\d{5})\b')
+# CPV codes look like "45316100-6" (check digit optional)
+CPV_ID_PATTERN = re.compile(r'\b(\d{8})(?:-\d)?\b')
+
+# Fields added by normalize_result()
+NORMALIZED_FIELDS = [
+    'deadline_iso',
+    'distance_km',
+    'postal_code',
+    'cpv_list',
+    'cpv_ids',
+    'period_start',
+    'period_end',
+]
+
+
+def parse_german_datetime(text: str) -> Optional[datetime]:
+    """Parse the first German date (with optional time) found in text
+
+    Args:
+        text: Display string such as "22.08.2025, 10:00 Uhr"
+
+    Returns:
+        Timezone-aware datetime in Europe/Berlin or None
+    """
+    if not text:
+        return None
+    match = DATE_PATTERN.search(text)
+    if not match:
+        return None
+    day, month, year, hour, minute = match.groups()
+    try:
+        return datetime(int(year), int(month), int(day),
+                        int(hour or 0), int(minute or 0), tzinfo=BERLIN_TZ)
+    except ValueError:
+        return None
+
+
+def parse_german_dates(text: str) -> List[date]:
+    """Parse all German dates found in text (e.g. a period "01.09.2025 - 31.12.2025")"""
+    dates = []
+    if not text:
+        return dates
+    for match in DATE_PATTERN.finditer(text):
+        day, month, year = match.group(1), match.group(2), match.group(3)
+        try:
+            dates.append(date(int(year), int(month), int(day)))
+        except ValueError:
+            continue
+    return dates
+
+
+def parse_distance_km(location: str) -> Optional[float]:
+    """Get the distance in km from a location string like "04103 Leipzig (387 km)" """
+    if not location:
+        return None
+    match = DISTANCE_PATTERN.search(location)
+    if not match:
+        return None
+    value = match.group(1)
+    # German number format: "." thousands separator, "," decimal separator
+    value = value.replace('.', '').replace(',', '.')
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def split_cpv_codes(cpv_codes) -> List[str]:
+    """Split the display string of CPV/craft codes into a list"""
+    if not cpv_codes:
+        return []
+    if isinstance(cpv_codes, list):
+        return [str(code).strip() for code in cpv_codes if str(code).strip()]
+    return [code.strip() for code in cpv_codes.split(', ') if code.strip()]
+
+
+def normalize_result(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Add typed companion fields to an extracted result (in place)
+
+    The display strings are left untouched, the typed values are stored next
+    to them so consumers can sort/filter without re-parsing:
+
+        deadline_iso   ISO 8601 timestamp with timezone (or None)
+        distance_km    numeric distance from the location (or None)
+        postal_code    first postal code in the location (or '')
+        cpv_list       list of CPV/craft code labels
+        cpv_ids        list of numeric 8-digit CPV codes
+        period_start   ISO date of the period of performance start (or None)
+        period_end     ISO date of the period of performance end (or None)
+
+    Args:
+        info: Result dictionary as built by the detail page extraction
+
+    Returns:
+        The same dictionary, for convenience
+    """
+    deadline = parse_german_datetime(info.get('deadline', ''))
+    info['deadline_iso'] = deadline.isoformat() if deadline else None
+
+    location = info.get('location', '') or ''
+    info['distance_km'] = parse_distance_km(location)
+    postal_match = POSTAL_CODE_PATTERN.search(location)
+    info['postal_code'] = postal_match.group(1) if postal_match else ''
+
+    info['cpv_list'] = split_cpv_codes(info.get('cpv_codes', ''))
+    info['cpv_ids'] = CPV_ID_PATTERN.findall(', '.join(info['cpv_list']))
+
+    period_dates = parse_german_dates(info.get('period_of_performance', ''))
+    info['period_start'] = period_dates[0].isoformat() if period_dates else None
+    info['period_end'] = period_dates[-1].isoformat() if len(period_dates) > 1 else None
+
+    if info.get('vergabe_id'):
+        info['vergabe_id'] = str(info['vergabe_id']).strip()
+
+    return info
+
+
+def ensure_normalized(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Normalise results loaded from older files that lack the typed fields"""
+    for result in results:
+        if 'deadline_iso' not in result:
+            normalize_result(result)
+    return results
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Streaming result sink: one JSON line per result, written as it is extracted
+
+The scraper appends every result to a JSONL file instead of keeping the
+whole run in memory, so a crash loses at most the last few results. Writes
+are fsynced in batches. Iterating the sink reads the file back one line at
+a time, which is how the exports are produced.
+"""
+
+import os
+import json
+import time
+import threading
+from itertools import islice
+
+
+def read_jsonl(path):
+    """Yield the results of a JSONL file (a torn last line after a crash is skipped)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"✗ Skipping unreadable line in {path}")
+
+
+class JsonlSink:
+    """Append-only JSONL file of results that can be iterated like a list"""
+
+    def __init__(self, path, sync_every=20, sync_interval=5.0, append=False):
+        """
+        Args:
+            path: JSONL file (truncated unless append is set)
+            sync_every: fsync after this many unsynced results
+            sync_interval: ...or when the last fsync is this many seconds old
+            append: Continue an existing file (e.g. to recover a crashed run)
+        """
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.count = sum(1 for _ in read_jsonl(path)) if append and os.path.exists(path) else 0
+        self.file = open(path, 'a' if append else 'w', encoding='utf-8')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.lock = threading.Lock()  # The detail pipeline collects from its own thread
+
+    def append(self, result):
+        """Write one result"""
+        line = json.dumps(result, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.count += 1
+            self.unsynced += 1
+            if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+                self._sync()
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def sync(self):
+        """Flush and fsync everything written so far"""
+        with self.lock:
+            if not self.file.closed:
+                self._sync()
+
+    def __iter__(self):
+        self.sync()
+        return read_jsonl(self.path)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Results by index or slice (read from the file; for previews, not for loops)"""
+        if isinstance(index, slice):
+            if (index.start or 0) < 0 or (index.stop or 0) < 0:
+                return list(self)[index]
+            return list(islice(self, index.start, index.stop, index.step))
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('result index out of range')
+        return next(islice(self, index, None))
+
+    def close(self):
+        """Sync and close the file"""
+        with self.lock:
+            if not self.file.closed:
+                self._sync()
+                self.file.close()
+
+    def remove(self):
+        """Close and delete the file (after the run was exported)"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
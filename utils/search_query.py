@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Build evergabe.de search URLs including server-side filters
+"""
+
+import re
+import urllib.parse
+from datetime import date, timedelta
+
+SEARCH_URL = "https://www.evergabe.de/auftraege/auftrag-suchen"
+
+# Relative dates in filter values, e.g. "today-14" = 14 days ago
+RELATIVE_DATE_PATTERN = re.compile(r'^today(?:([+-])(\d+))?$')
+
+
+def resolve_value(value, today=None):
+    """Turn a configured filter value into the string the search form sends"""
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    text = str(value).strip()
+    match = RELATIVE_DATE_PATTERN.match(text.lower())
+    if match:
+        days = int(match.group(2) or 0)
+        offset = timedelta(days=-days if match.group(1) == '-' else days)
+        return ((today or date.today()) + offset).strftime('%d.%m.%Y')
+    return text
+
+
+def filter_params(filters, prefix='search[filters]', today=None):
+    """Flatten the server_filters mapping into (name, value) pairs
+
+    Scalars become search[filters][name], lists become repeated
+    search[filters][name][] and nested mappings nest the brackets
+    (location: {radius: 50} -> search[filters][location][radius]).
+    Empty values are left out.
+    """
+    params = []
+    for name, value in (filters or {}).items():
+        key = f"{prefix}[{name}]"
+        if isinstance(value, dict):
+            params.extend(filter_params(value, key, today))
+        elif isinstance(value, (list, tuple)):
+            params.extend((f"{key}[]", resolve_value(item, today)) for item in value if item not in (None, ''))
+        elif value not in (None, ''):
+            params.append((key, resolve_value(value, today)))
+    return params
+
+
+def build_search_url(search_term, server_filters=None, today=None):
+    """Build the search URL for a term with the configured server-side filters"""
+    params = [
+        ('utf8', '✓'),
+        ('search[source]', 'form_cms'),
+        ('search[query]', search_term),
+    ]
+    filters = {'publish_end': '0'}
+    filters.update(server_filters or {})
+    params.extend(filter_params(filters, today=today))
+    params.append(('commit', 'Aufträge suchen'))
+    return f"{SEARCH_URL}?{urllib.parse.urlencode(params, safe='[]')}"
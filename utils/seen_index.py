@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Persistent index of tenders seen in earlier runs
+
+A memory-mapped Bloom filter answers "never seen" without touching the
+disk; only possible hits are confirmed in an exact SQLite table that also
+keeps when a tender was first/last seen and when its detail page was last
+fetched. The scraper consults it before opening a detail page, so hourly
+runs do not re-fetch tenders they loaded an hour ago.
+"""
+
+import os
+import math
+import mmap
+import struct
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta
+
+from utils.page_parser import canonical_url
+
+# Header: magic, number of bits, number of hashes, number of keys added
+HEADER = struct.Struct('<4sQIQ')
+MAGIC = b'BLM1'
+
+
+class BloomFilter:
+    """Bloom filter stored in a memory-mapped file"""
+
+    def __init__(self, path, capacity=100000, error_rate=0.001):
+        """
+        Args:
+            path: File the bit array is stored in (created if missing)
+            capacity: Expected number of keys
+            error_rate: Acceptable false positive rate at capacity
+        """
+        self.path = path
+        self.capacity = capacity
+        self.bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.bits / capacity * math.log(2))))
+
+        if not self._open_existing():
+            self._create()
+
+    def _open_existing(self):
+        """Map an existing file with a valid header (False if there is none)"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return False
+        magic, bits, hashes, _ = HEADER.unpack(header)
+        if magic != MAGIC or os.path.getsize(self.path) != HEADER.size + (bits + 7) // 8:
+            return False
+        self.bits, self.hashes = bits, hashes
+        self._map()
+        return True
+
+    def _create(self):
+        """Create an empty filter file"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.bits, self.hashes, 0))
+            f.truncate(HEADER.size + (self.bits + 7) // 8)
+        self._map()
+
+    def _map(self):
+        self.file = open(self.path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    @property
+    def count(self):
+        """Number of keys added (as recorded in the header)"""
+        return HEADER.unpack_from(self.map, 0)[3]
+
+    @count.setter
+    def count(self, value):
+        HEADER.pack_into(self.map, 0, MAGIC, self.bits, self.hashes, value)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.bits for i in range(self.hashes)]
+
+    def add(self, key):
+        """Add a key"""
+        for position in self._positions(key):
+            index = HEADER.size + (position >> 3)
+            self.map[index] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        for position in self._positions(key):
+            if not self.map[HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def close(self):
+        """Flush and unmap the file"""
+        self.map.flush()
+        self.map.close()
+        self.file.close()
+
+
+class SeenIndex:
+    """Tenders seen in earlier runs: Bloom filter in front of an exact SQLite table"""
+
+    def __init__(self, directory, capacity=100000, error_rate=0.001):
+        """
+        Args:
+            directory: Directory for seen_index.db and seen_index.bloom
+            capacity: Initial Bloom filter capacity (grows when exceeded)
+            error_rate: Bloom filter false positive rate
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.error_rate = error_rate
+        self.bloom_path = os.path.join(directory, 'seen_index.bloom')
+        self.conn = sqlite3.connect(os.path.join(directory, 'seen_index.db'))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            'key TEXT PRIMARY KEY, first_seen TEXT NOT NULL, last_seen TEXT NOT NULL, last_fetched TEXT)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen(last_seen)')
+
+        count = self.conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        self.bloom = BloomFilter(self.bloom_path, max(capacity, 2 * count), error_rate)
+        # Rebuild when the filter is missing keys (lost file, or full)
+        if self.bloom.count != count or count > self.bloom.capacity:
+            self.rebuild(max(capacity, 2 * count))
+
+        self.bloom_hits = 0  # Lookups the exact table had to answer
+        self.bloom_misses = 0  # Lookups answered by the Bloom filter alone
+
+    def rebuild(self, capacity):
+        """Recreate the Bloom filter from the exact table"""
+        self.bloom.close()
+        os.remove(self.bloom_path)
+        self.bloom = BloomFilter(self.bloom_path, capacity, self.error_rate)
+        count = 0
+        for row in self.conn.execute('SELECT key FROM seen'):
+            self.bloom.add(row['key'])
+            count += 1
+        self.bloom.count = count
+
+    @staticmethod
+    def key(url):
+        """Index key of a tender URL"""
+        return canonical_url(url)
+
+    def get(self, url):
+        """Seen record of a tender (None if never seen)"""
+        key = self.key(url)
+        if key not in self.bloom:
+            self.bloom_misses += 1
+            return None
+        self.bloom_hits += 1
+        row = self.conn.execute('SELECT * FROM seen WHERE key = ?', (key,)).fetchone()
+        return dict(row) if row else None
+
+    def should_fetch(self, url, revalidate_hours=0, now=None):
+        """Decide whether a tender's detail page has to be loaded
+
+        Returns:
+            (fetch, reason) - reason is 'new', 'revalidate' or 'known'
+        """
+        record = self.get(url)
+        if record is None or not record['last_fetched']:
+            return True, 'new'
+        if revalidate_hours:
+            now = now or datetime.now()
+            if datetime.fromisoformat(record['last_fetched']) <= now - timedelta(hours=revalidate_hours):
+                return True, 'revalidate'
+        return False, 'known'
+
+    def mark_seen(self, url, fetched=False, now=None):
+        """Record that a tender was seen (and fetched) now"""
+        key = self.key(url)
+        now = (now or datetime.now()).isoformat(timespec='seconds')
+        cursor = self.conn.execute(
+            'INSERT OR IGNORE INTO seen (key, first_seen, last_seen, last_fetched) VALUES (?, ?, ?, ?)',
+            (key, now, now, now if fetched else None)
+        )
+        if cursor.rowcount:
+            self.bloom.add(key)
+            self.bloom.count += 1
+            if self.bloom.count > self.bloom.capacity:
+                self.conn.commit()
+                self.rebuild(2 * self.bloom.capacity)
+        elif fetched:
+            self.conn.execute('UPDATE seen SET last_seen = ?, last_fetched = ? WHERE key = ?', (now, now, key))
+        else:
+            self.conn.execute('UPDATE seen SET last_seen = ? WHERE key = ?', (now, key))
+
+    def __len__(self):
+        return self.bloom.count
+
+    def close(self):
+        """Commit and close the index"""
+        self.conn.commit()
+        self.conn.close()
+        self.bloom.close()
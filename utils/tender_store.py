@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+SQLite store for tenders across all scraper runs
+
+Every tender is stored once (matched by vergabe_id or canonical URL) and
+linked to the runs that found it. AI summaries and documents have their
+own tables. The per-run JSON/Excel files are exports of this store; the
+viewer reads runs from here and imports older JSON files on first use.
+
+Each tender keeps a hash of its tracked content. When a tender is scraped
+again with other content, only the changed fields are stored as a revision
+(deadline extensions, new documents, ...), see changes_since().
+
+Titles, descriptions, AI summaries and document names/texts are kept in a
+full-text index (SQLite FTS5) that is updated with every write, see search().
+Umlauts and ß are folded (ä -> ae, ß -> ss) so either spelling matches.
+"""
+
+import os
+import re
+import json
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.page_parser import canonical_url
+from utils.result_normalizer import ensure_normalized
+from utils.result_files import open_text, load_results, run_name, result_files
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tenders (
+    id INTEGER PRIMARY KEY,
+    vergabe_id TEXT,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    contracting_authority TEXT,
+    location TEXT,
+    deadline_iso TEXT,
+    distance_km REAL,
+    details_loaded INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL,
+    content_hash TEXT,
+    first_seen TEXT NOT NULL,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tenders_vergabe_id ON tenders(vergabe_id);
+CREATE INDEX IF NOT EXISTS idx_tenders_deadline ON tenders(deadline_iso);
+CREATE INDEX IF NOT EXISTS idx_tenders_scraped_at ON tenders(scraped_at);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL UNIQUE,
+    started_at TEXT NOT NULL,
+    search_terms TEXT,
+    result_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
+
+CREATE TABLE IF NOT EXISTS run_tenders (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    tender_id INTEGER NOT NULL REFERENCES tenders(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (run_id, tender_id)
+);
+CREATE INDEX IF NOT EXISTS idx_run_tenders_tender ON run_tenders(tender_id);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    tender_id INTEGER PRIMARY KEY REFERENCES tenders(id) ON DELETE CASCADE,
+    summary TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    tender_id INTEGER NOT NULL REFERENCES tenders(id) ON DELETE CASCADE,
+    name TEXT,
+    url TEXT NOT NULL,
+    UNIQUE (tender_id, url)
+);
+
+CREATE TABLE IF NOT EXISTS revisions (
+    id INTEGER PRIMARY KEY,
+    tender_id INTEGER NOT NULL REFERENCES tenders(id) ON DELETE CASCADE,
+    changed_at TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    changes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_revisions_changed_at ON revisions(changed_at);
+CREATE INDEX IF NOT EXISTS idx_revisions_tender ON revisions(tender_id);
+"""
+
+# Full-text index, one row per tender (rowid = tender id)
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tender_search USING fts5(
+    title, description, contracting_authority, location, summary, documents,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# BM25 weights of the search columns (title matches rank highest)
+SEARCH_WEIGHTS = (10.0, 1.0, 3.0, 2.0, 1.0, 0.5)
+
+GERMAN_FOLDING = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue',
+                                'ß': 'ss', 'ẞ': 'SS'})
+
+# Fields kept in their own tables or columns, not in the data JSON
+SEPARATE_FIELDS = ('ai_summary', 'tender_id', 'first_seen', 'revisions')
+
+# Fields compared between scrapes of a tender (what the bid team acts on)
+TRACKED_FIELDS = (
+    'title', 'description', 'contracting_authority', 'location', 'deadline_iso',
+    'procedure_type', 'period_of_performance', 'cpv_codes', 'reference', 'documents'
+)
+
+RUN_FILE_PATTERN = re.compile(r'evergabe_results_(\d{8}_\d{6})')
+
+
+def run_started_at(filename):
+    """Timestamp of a run from its file name (None if the name has none)"""
+    match = RUN_FILE_PATTERN.search(filename or '')
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').isoformat(timespec='seconds')
+
+
+def fold_text(text):
+    """Text with umlauts and ß spelled out (Straße -> Strasse) for the search index"""
+    return (text or '').translate(GERMAN_FOLDING)
+
+
+def search_query(text):
+    """FTS5 query for user input: every word as a prefix, all words required"""
+    words = re.findall(r'\w+', fold_text(text).lower())
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def merge_result(old, new):
+    """Merge a newly scraped result into the stored one
+
+    Empty new values do not overwrite stored ones, and a result built from
+    the result list only fills gaps, so it does not erase (or reformat)
+    details loaded earlier.
+    """
+    merged = dict(old)
+    fill_only = old.get('details_loaded', True) and not new.get('details_loaded', True)
+    for key, value in new.items():
+        if (value in (None, '', [], {}) or fill_only) and merged.get(key) not in (None, '', [], {}):
+            continue
+        merged[key] = value
+    merged['details_loaded'] = bool(old.get('details_loaded', True)) or bool(new.get('details_loaded', True))
+    return merged
+
+
+def tracked_content(result):
+    """Tracked fields of a result in a stable form (documents sorted by URL)"""
+    content = {}
+    for field in TRACKED_FIELDS:
+        value = result.get(field)
+        if field == 'documents':
+            value = sorted((doc.get('url', ''), doc.get('name', '')) for doc in value or [])
+        elif isinstance(value, str):
+            value = value.strip()
+        content[field] = value if value not in (None, '') else None
+    return content
+
+
+def content_hash(result):
+    """Stable hash of a result's tracked fields"""
+    content = json.dumps(tracked_content(result), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def diff_content(old, new):
+    """Changed tracked fields between two versions of a result
+
+    Returns:
+        Dict of field -> {'old': ..., 'new': ...}; documents are reported as
+        {'added': [...], 'removed': [...]} (document dicts)
+    """
+    old_content, new_content = tracked_content(old), tracked_content(new)
+    changes = {}
+    for field in TRACKED_FIELDS:
+        if old_content[field] == new_content[field]:
+            continue
+        if field == 'documents':
+            old_urls = {url for url, _ in old_content[field]}
+            new_urls = {url for url, _ in new_content[field]}
+            changes[field] = {
+                'added': [doc for doc in new.get('documents') or [] if doc.get('url') not in old_urls],
+                'removed': [doc for doc in old.get('documents') or [] if doc.get('url') not in new_urls]
+            }
+        else:
+            changes[field] = {'old': old_content[field], 'new': new_content[field]}
+    return changes
+
+
+class TenderStore:
+    """Tenders, runs, summaries and documents in one SQLite database"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before change tracking lack the hash column
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(tenders)')}
+            if 'content_hash' not in columns:
+                conn.execute('ALTER TABLE tenders ADD COLUMN content_hash TEXT')
+            indexed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tender_search'").fetchone()
+            try:
+                conn.executescript(SEARCH_SCHEMA)
+                self.has_search = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search() is unavailable
+                self.has_search = False
+        # Databases created before the search index are indexed once
+        if self.has_search and not indexed:
+            self.rebuild_search_index()
+
+    @contextmanager
+    def connect(self):
+        """Open a connection for one operation (commits on success, so threads can share the store)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA foreign_keys = ON')
+        conn.execute('PRAGMA journal_mode = WAL')
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+
+    def find_tender(self, conn, result):
+        """Return the stored row for a result (by vergabe_id, then canonical URL)"""
+        vergabe_id = result.get('vergabe_id')
+        if vergabe_id:
+            row = conn.execute('SELECT * FROM tenders WHERE vergabe_id = ?', (vergabe_id,)).fetchone()
+            if row:
+                return row
+        url = canonical_url(result.get('url', ''))
+        return conn.execute('SELECT * FROM tenders WHERE url = ?', (url,)).fetchone()
+
+    def upsert_tender(self, conn, result, scraped_at=None):
+        """Insert or update one result
+
+        Returns:
+            Tender id
+        """
+        scraped_at = scraped_at or datetime.now().isoformat(timespec='seconds')
+        data = {key: value for key, value in result.items() if key not in SEPARATE_FIELDS}
+        row = self.find_tender(conn, data)
+
+        if row:
+            old = json.loads(row['data'])
+            data = merge_result(old, data)
+            tender_id = row['id']
+            # Only compare full scrapes, a card has less (and other) text
+            if old.get('details_loaded', True) and result.get('details_loaded', True):
+                self._add_revision(conn, tender_id, row['content_hash'] or content_hash(old), old, data, scraped_at)
+        else:
+            tender_id = None
+
+        values = (
+            data.get('vergabe_id') or None,
+            data.get('title'),
+            data.get('contracting_authority'),
+            data.get('location'),
+            data.get('deadline_iso'),
+            data.get('distance_km'),
+            int(bool(data.get('details_loaded', True))),
+            json.dumps(data, ensure_ascii=False),
+            content_hash(data),
+            scraped_at
+        )
+        if tender_id is None:
+            cursor = conn.execute(
+                'INSERT INTO tenders (vergabe_id, title, contracting_authority, location, '
+                'deadline_iso, distance_km, details_loaded, data, content_hash, scraped_at, url, first_seen) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                values + (canonical_url(data.get('url', '')), scraped_at)
+            )
+            tender_id = cursor.lastrowid
+        else:
+            # The URL stays as first stored, it identifies the tender
+            conn.execute(
+                'UPDATE tenders SET vergabe_id = ?, title = ?, contracting_authority = ?, '
+                'location = ?, deadline_iso = ?, distance_km = ?, details_loaded = ?, data = ?, '
+                'content_hash = ?, scraped_at = MAX(scraped_at, ?) WHERE id = ?',
+                values + (tender_id,)
+            )
+
+        for document in data.get('documents') or []:
+            if document.get('url'):
+                conn.execute(
+                    'INSERT OR IGNORE INTO documents (tender_id, name, url) VALUES (?, ?, ?)',
+                    (tender_id, document.get('name'), document['url'])
+                )
+        if result.get('ai_summary'):
+            self._set_summary(conn, tender_id, result['ai_summary'])
+        self._index_tender(conn, tender_id)
+        return tender_id
+
+    def _add_revision(self, conn, tender_id, old_hash, old, new, changed_at):
+        """Store the changed fields of a tender if its content hash changed"""
+        new_hash = content_hash(new)
+        if new_hash == old_hash:
+            return
+        changes = diff_content(old, new)
+        if changes:
+            conn.execute(
+                'INSERT INTO revisions (tender_id, changed_at, content_hash, changes) VALUES (?, ?, ?, ?)',
+                (tender_id, changed_at, new_hash, json.dumps(changes, ensure_ascii=False))
+            )
+
+    def save_run(self, results, file, started_at=None, search_terms=None):
+        """Store the results of one run
+
+        Args:
+            results: Result dicts in display order
+            file: Run name (the JSON export file name)
+            started_at: ISO timestamp (default: from the file name, else now)
+            search_terms: Search terms of the run
+
+        Returns:
+            Run id
+        """
+        started_at = started_at or run_started_at(file) or datetime.now().isoformat(timespec='seconds')
+        with self.connect() as conn:
+            conn.execute(
+                'INSERT INTO runs (file, started_at, search_terms, result_count) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(file) DO UPDATE SET result_count = excluded.result_count',
+                (file, started_at, json.dumps(search_terms or [], ensure_ascii=False), len(results))
+            )
+            run_id = conn.execute('SELECT id FROM runs WHERE file = ?', (file,)).fetchone()['id']
+            conn.execute('DELETE FROM run_tenders WHERE run_id = ?', (run_id,))
+            for position, result in enumerate(results):
+                tender_id = self.upsert_tender(conn, result, started_at)
+                conn.execute(
+                    'INSERT OR IGNORE INTO run_tenders (run_id, tender_id, position) VALUES (?, ?, ?)',
+                    (run_id, tender_id, position)
+                )
+        return run_id
+
+    def update_tenders(self, results):
+        """Update stored tenders (e.g. after loading details) without creating a run"""
+        with self.connect() as conn:
+            for result in results:
+                self.upsert_tender(conn, result)
+
+    def _set_summary(self, conn, tender_id, summary):
+        conn.execute(
+            'INSERT INTO summaries (tender_id, summary, created_at) VALUES (?, ?, ?) '
+            'ON CONFLICT(tender_id) DO UPDATE SET summary = excluded.summary, created_at = excluded.created_at',
+            (tender_id, summary, datetime.now().isoformat(timespec='seconds'))
+        )
+
+    def set_summary(self, result, summary):
+        """Store the AI summary of a result"""
+        with self.connect() as conn:
+            row = self.find_tender(conn, result)
+            if row is None:
+                return False
+            self._set_summary(conn, row['id'], summary)
+            self._index_tender(conn, row['id'])
+        return True
+
+    def _index_tender(self, conn, tender_id):
+        """Write a tender's current text (with summary) to the search index"""
+        if not self.has_search:
+            return
+        row = conn.execute(
+            'SELECT t.data, s.summary FROM tenders t LEFT JOIN summaries s ON s.tender_id = t.id '
+            'WHERE t.id = ?', (tender_id,)
+        ).fetchone()
+        data = json.loads(row['data'])
+        documents = ' '.join(f"{document.get('name') or ''} {document.get('text') or ''}"
+                             for document in data.get('documents') or [])
+        conn.execute('DELETE FROM tender_search WHERE rowid = ?', (tender_id,))
+        conn.execute(
+            'INSERT INTO tender_search (rowid, title, description, contracting_authority, location, '
+            'summary, documents) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (tender_id,) + tuple(fold_text(text) for text in (
+                data.get('title'), data.get('description'), data.get('contracting_authority'),
+                data.get('location'), row['summary'], documents
+            ))
+        )
+
+    def rebuild_search_index(self):
+        """Index all stored tenders again
+
+        Returns:
+            Number of indexed tenders
+        """
+        with self.connect() as conn:
+            conn.execute('DELETE FROM tender_search')
+            ids = [row['id'] for row in conn.execute('SELECT id FROM tenders')]
+            for tender_id in ids:
+                self._index_tender(conn, tender_id)
+        return len(ids)
+
+    def import_file(self, path):
+        """Import a results JSON file (.json, .json.gz, .json.zst) as a run (skipped if already imported)
+
+        Returns:
+            Run id, or None if the file could not be read
+        """
+        file = run_name(path)
+        with self.connect() as conn:
+            row = conn.execute('SELECT id FROM runs WHERE file = ?', (file,)).fetchone()
+        if row:
+            return row['id']
+        try:
+            results = ensure_normalized(load_results(path))
+        except (OSError, ValueError, EOFError, RuntimeError) as e:
+            print(f"✗ Could not import {path}: {e}")
+            return None
+        started_at = run_started_at(file) or datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec='seconds')
+        return self.save_run(results, file, started_at)
+
+    def import_directory(self, output_dir):
+        """Import all result files of a directory that are not in the store yet
+
+        Returns:
+            Number of imported files
+        """
+        with self.connect() as conn:
+            known = {row['file'] for row in conn.execute('SELECT file FROM runs')}
+        imported = 0
+        for path in result_files(output_dir):
+            if run_name(path) not in known and self.import_file(path) is not None:
+                imported += 1
+        return imported
+
+    # ------------------------------------------------------------------
+    # Reading
+
+    def _result(self, row):
+        """Build a result dict from a tenders row (with summary columns)"""
+        result = json.loads(row['data'])
+        result['tender_id'] = row['id']
+        result['first_seen'] = row['first_seen']
+        if row['summary']:
+            result['ai_summary'] = row['summary']
+        return result
+
+    def list_runs(self):
+        """All runs, newest first"""
+        with self.connect() as conn:
+            rows = conn.execute('SELECT * FROM runs ORDER BY started_at DESC, id DESC').fetchall()
+        return [dict(row) for row in rows]
+
+    def run_overview(self):
+        """All runs with result count, summary count and earliest deadline, newest first"""
+        with self.connect() as conn:
+            rows = conn.execute(
+                'SELECT r.file, r.started_at, r.result_count, COUNT(s.tender_id) AS summaries, '
+                'MIN(t.deadline_iso) AS earliest_deadline FROM runs r '
+                'LEFT JOIN run_tenders rt ON rt.run_id = r.id '
+                'LEFT JOIN tenders t ON t.id = rt.tender_id '
+                'LEFT JOIN summaries s ON s.tender_id = t.id '
+                'GROUP BY r.id ORDER BY r.started_at DESC, r.id DESC'
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_run(self, file):
+        """Run row for a run name (None if unknown)"""
+        with self.connect() as conn:
+            row = conn.execute('SELECT * FROM runs WHERE file = ?', (file,)).fetchone()
+        return dict(row) if row else None
+
+    def run_results(self, file):
+        """Results of a run in their original order (empty if unknown)"""
+        with self.connect() as conn:
+            rows = conn.execute(
+                'SELECT t.*, s.summary FROM runs r '
+                'JOIN run_tenders rt ON rt.run_id = r.id '
+                'JOIN tenders t ON t.id = rt.tender_id '
+                'LEFT JOIN summaries s ON s.tender_id = t.id '
+                'WHERE r.file = ? ORDER BY rt.position',
+                (file,)
+            ).fetchall()
+        return [self._result(row) for row in rows]
+
+    def latest_run_results(self):
+        """Results of the newest run"""
+        runs = self.list_runs()
+        return self.run_results(runs[0]['file']) if runs else []
+
+    def get_tender(self, vergabe_id=None, url=None, as_result=False):
+        """Look up one tender by vergabe_id or URL (None if unknown)
+
+        With as_result, the tender is returned like a scraped result (its
+        stored data and summary, without tender_id and first_seen), so it
+        can be added to a new run.
+        """
+        with self.connect() as conn:
+            row = self.find_tender(conn, {'vergabe_id': vergabe_id, 'url': url or ''})
+            if row is None:
+                return None
+            summary = conn.execute('SELECT summary FROM summaries WHERE tender_id = ?', (row['id'],)).fetchone()
+        result = dict(row)
+        result['summary'] = summary['summary'] if summary else None
+        result = self._result(result)
+        if as_result:
+            del result['tender_id'], result['first_seen']
+        return result
+
+    def tenders(self, deadline_from=None, scraped_since=None, limit=None):
+        """All stored tenders, newest first, optionally filtered
+
+        Args:
+            deadline_from: Only tenders with a deadline at or after this ISO date
+            scraped_since: Only tenders scraped at or after this ISO timestamp
+            limit: Maximum number of tenders
+        """
+        query = ('SELECT t.*, s.summary FROM tenders t '
+                 'LEFT JOIN summaries s ON s.tender_id = t.id WHERE 1 = 1')
+        params = []
+        if deadline_from:
+            query += ' AND t.deadline_iso >= ?'
+            params.append(deadline_from)
+        if scraped_since:
+            query += ' AND t.scraped_at >= ?'
+            params.append(scraped_since)
+        query += ' ORDER BY t.scraped_at DESC, t.id DESC'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(int(limit))
+        with self.connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [self._result(row) for row in rows]
+
+    def iter_tenders(self):
+        """Yield all stored tenders (with summaries) one at a time, oldest first"""
+        with self.connect() as conn:
+            cursor = conn.execute(
+                'SELECT t.*, s.summary FROM tenders t '
+                'LEFT JOIN summaries s ON s.tender_id = t.id ORDER BY t.id'
+            )
+            for row in cursor:
+                yield self._result(row)
+
+    def search(self, query, limit=20, offset=0):
+        """Full-text search over all tenders, best matches first (BM25)
+
+        Args:
+            query: Words to search for (each also matches as a prefix)
+            limit: Maximum number of results
+            offset: Number of results to skip
+
+        Returns:
+            (total number of matches, [(score, result)]); higher scores are better
+        """
+        if not self.has_search:
+            raise RuntimeError("Full-text search needs SQLite with FTS5")
+        match = search_query(query)
+        if not match:
+            return 0, []
+        weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+        with self.connect() as conn:
+            total = conn.execute('SELECT COUNT(*) FROM tender_search WHERE tender_search MATCH ?',
+                                 (match,)).fetchone()[0]
+            rows = conn.execute(
+                f'SELECT t.*, s.summary, bm25(tender_search, {weights}) AS rank FROM tender_search '
+                'JOIN tenders t ON t.id = tender_search.rowid '
+                'LEFT JOIN summaries s ON s.tender_id = t.id '
+                'WHERE tender_search MATCH ? ORDER BY rank LIMIT ? OFFSET ?',
+                (match, int(limit), int(offset))
+            ).fetchall()
+        return total, [(round(-row['rank'], 4), self._result(row)) for row in rows]
+
+    def search_ids(self, query):
+        """Ids of all tenders matching a search, best matches first"""
+        match = search_query(query)
+        if not self.has_search or not match:
+            return []
+        weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+        with self.connect() as conn:
+            rows = conn.execute(
+                f'SELECT rowid FROM tender_search WHERE tender_search MATCH ? '
+                f'ORDER BY bm25(tender_search, {weights})', (match,)
+            ).fetchall()
+        return [row['rowid'] for row in rows]
+
+    def revisions(self, tender_id):
+        """Revisions of a tender, oldest first"""
+        with self.connect() as conn:
+            rows = conn.execute(
+                'SELECT changed_at, changes FROM revisions WHERE tender_id = ? ORDER BY changed_at, id',
+                (tender_id,)
+            ).fetchall()
+        return [{'changed_at': row['changed_at'], 'changes': json.loads(row['changes'])} for row in rows]
+
+    def changes_since(self, since, fields=None):
+        """Tenders whose tracked content changed at or after a timestamp
+
+        Args:
+            since: ISO date or timestamp
+            fields: Only changes of these fields (e.g. ['deadline_iso', 'documents'])
+
+        Returns:
+            Results (latest content) with a 'revisions' list, most recently changed first
+        """
+        with self.connect() as conn:
+            rows = conn.execute(
+                'SELECT r.changed_at, r.changes, t.*, s.summary FROM revisions r '
+                'JOIN tenders t ON t.id = r.tender_id '
+                'LEFT JOIN summaries s ON s.tender_id = t.id '
+                'WHERE r.changed_at >= ? ORDER BY r.changed_at DESC, r.id DESC',
+                (since,)
+            ).fetchall()
+        tenders = {}
+        for row in rows:
+            changes = json.loads(row['changes'])
+            if fields:
+                changes = {field: change for field, change in changes.items() if field in fields}
+                if not changes:
+                    continue
+            if row['id'] not in tenders:
+                tenders[row['id']] = self._result(row)
+                tenders[row['id']]['revisions'] = []
+            tenders[row['id']]['revisions'].append({'changed_at': row['changed_at'], 'changes': changes})
+        return list(tenders.values())
+
+    def count(self):
+        """Number of stored tenders"""
+        with self.connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM tenders').fetchone()[0]
+
+    def export_json(self, file, path):
+        """Write a run's results (with summaries) to a JSON file (.gz/.zst compressed)"""
+        results = [{key: value for key, value in result.items() if key not in ('tender_id', 'first_seen')}
+                   for result in self.run_results(file)]
+        with open_text(path, 'w') as f:
+            json.dump(results, f, ensure_ascii=False, indent=None if path.endswith(('.gz', '.zst')) else 2)
+        return len(results)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Search-term planner: measures how much each term adds and stops paging
+through terms that only return tenders other terms already found
+
+The search terms overlap heavily ("leucht", "lamp", "licht"). The planner
+counts per term and page how many tenders were new in this run, orders the
+terms by their historical yield and stops a term once its pages bring
+too few new tenders. Statistics are kept across runs in a JSON file.
+
+It also tracks per term and page how many results passed the early filter
+and how many were relevant in the end, and stops paging a term once the
+next page is expected to bring fewer relevant results than a threshold.
+Every audit_every-th run loads all pages so the statistics stay honest.
+"""
+
+import os
+import json
+from datetime import datetime
+
+
+class TermPlanner:
+    """Orders search terms and decides when to stop paging a term"""
+
+    def __init__(self, path, min_new_fraction=0.1, min_pages=1,
+                 min_expected_relevant=0.0, min_samples=3, audit_every=0):
+        """
+        Args:
+            path: JSON file the term statistics are stored in
+            min_new_fraction: Stop a term when fewer than this fraction of a
+                              page's tenders were new (0.1 = 10%)
+            min_pages: Pages always loaded per term before it can be stopped
+            min_expected_relevant: Stop a term when its next page brought fewer
+                                   relevant results than this on average (0 = off)
+            min_samples: Loads of a page needed before its average is trusted
+            audit_every: Every n-th run loads all pages (0 = never)
+        """
+        self.path = path
+        self.min_new_fraction = min_new_fraction
+        self.min_pages = min_pages
+        self.min_expected_relevant = min_expected_relevant
+        self.min_samples = min_samples
+        self.history = self.load()
+        self.audit = bool(audit_every) and (self.history['runs'] + 1) % audit_every == 0
+        self.seen_urls = set()  # Tenders seen by any term in this run
+        self.found_by = {}  # url -> terms that returned it in this run
+        self.first_page = {}  # url -> page entry of the term that returned it first
+        self.run = {}  # term -> statistics of this run
+
+    def load(self):
+        """Load the stored statistics (empty if there are none)"""
+        history = {'runs': 0, 'updated_at': None, 'terms': {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    history.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"✗ Could not load term statistics {self.path}: {e}")
+        return history
+
+    def average_coverage(self, term):
+        """Average number of distinct tenders a term returned per run (None if unknown)"""
+        stats = self.history['terms'].get(term)
+        if not stats or not stats.get('runs'):
+            return None
+        return stats['tenders'] / stats['runs']
+
+    def order_terms(self, terms):
+        """Order terms by historical coverage, broadest first
+
+        Broad terms run first so the overlapping narrower terms are the ones
+        that get cut. Terms without statistics run first to collect them.
+        """
+        def key(term):
+            coverage = self.average_coverage(term)
+            return float('-inf') if coverage is None else -coverage
+        return sorted(terms, key=key)
+
+    def start_term(self, term):
+        """Begin a term in this run"""
+        self.run[term] = {'pages': [], 'stopped_at': None, 'reason': None}
+
+    def record_page(self, term, page, urls):
+        """Record the tenders of one result page
+
+        Returns:
+            Number of tenders no term had returned before in this run
+        """
+        if term not in self.run:
+            self.start_term(term)
+        urls = set(urls)
+        new_urls = urls - self.seen_urls
+        self.seen_urls |= urls
+        entry = {'page': page, 'seen': len(urls), 'new': len(new_urls), 'passed': 0, 'relevant': 0}
+        for url in urls:
+            self.found_by.setdefault(url, set()).add(term)
+        for url in new_urls:
+            self.first_page[url] = entry
+        self.run[term]['pages'].append(entry)
+        return len(new_urls)
+
+    def record_passed(self, term):
+        """Count a result of the term's current page that passed the early filter"""
+        stats = self.run.get(term)
+        if stats and stats['pages']:
+            stats['pages'][-1]['passed'] += 1
+
+    def record_relevant(self, urls):
+        """Credit relevant final results to the term and page that found them first"""
+        for url in urls:
+            entry = self.first_page.get(url)
+            if entry is not None:
+                entry['relevant'] += 1
+
+    def expected_relevant(self, term, page):
+        """Average relevant results a page of a term brought in past runs (None if too few runs)"""
+        stats = self.history['terms'].get(term, {}).get('pages', {}).get(str(page))
+        if not stats or stats.get('loads', 0) < self.min_samples:
+            return None
+        return stats.get('relevant', 0) / stats['loads']
+
+    def should_continue(self, term, page):
+        """Decide after a page whether the next page of this term is worth loading"""
+        stats = self.run.get(term)
+        if self.audit or not stats or not stats['pages'] or page < self.min_pages:
+            return True
+
+        # Overlap: the term only repeats tenders earlier terms returned
+        last = stats['pages'][-1]
+        fraction = last['new'] / last['seen'] if last['seen'] else 0.0
+        if next(iter(self.run)) != term and fraction < self.min_new_fraction:
+            return self.stop(term, page, f"only {last['new']}/{last['seen']} new on page {page}")
+
+        # Depth: the next page rarely brought relevant results in past runs
+        if self.min_expected_relevant > 0:
+            expected = self.expected_relevant(term, page + 1)
+            if expected is not None and expected < self.min_expected_relevant:
+                return self.stop(term, page, f"page {page + 1} brought {expected:.2f} relevant results on average")
+        return True
+
+    def stop(self, term, page, reason):
+        """Record why paging a term stopped"""
+        self.run[term]['stopped_at'] = page
+        self.run[term]['reason'] = reason
+        return False
+
+    def term_yield(self, term):
+        """Distinct and exclusive (no other term found them) tenders of a term in this run"""
+        tenders = [url for url, terms in self.found_by.items() if term in terms]
+        exclusive = [url for url in tenders if len(self.found_by[url]) == 1]
+        return len(tenders), len(exclusive)
+
+    def finish(self):
+        """Add this run to the stored statistics (call after the final filter)"""
+        if not self.run:
+            return
+        for term, stats in self.run.items():
+            tenders, exclusive = self.term_yield(term)
+            target = self.history['terms'].setdefault(term, {
+                'runs': 0, 'tenders': 0, 'exclusive': 0, 'pages': {}
+            })
+            target['runs'] += 1
+            target['tenders'] += tenders
+            target['exclusive'] += exclusive
+            for page in stats['pages']:
+                page_stats = target['pages'].setdefault(str(page['page']), {})
+                for name in ('seen', 'new', 'passed', 'relevant'):
+                    page_stats[name] = page_stats.get(name, 0) + page[name]
+                page_stats['loads'] = page_stats.get('loads', 0) + 1
+
+        self.history['runs'] += 1
+        self.history['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.history, f, ensure_ascii=False, indent=2)
+
+    def summary(self):
+        """Lines describing this run's term decisions"""
+        lines = ["Full-depth audit run (no pages skipped)"] if self.audit else []
+        for term, stats in self.run.items():
+            pages = len(stats['pages'])
+            seen = sum(page['seen'] for page in stats['pages'])
+            new = sum(page['new'] for page in stats['pages'])
+            passed = sum(page['passed'] for page in stats['pages'])
+            relevant = sum(page['relevant'] for page in stats['pages'])
+            _, exclusive = self.term_yield(term)
+            line = (f"{term}: {pages} pages, {new}/{seen} new, {passed} passed the early filter, "
+                    f"{relevant} relevant, {exclusive} only found by this term")
+            if stats['stopped_at']:
+                line += f" - stopped after page {stats['stopped_at']} ({stats['reason']})"
+            lines.append(line)
+        return lines
@@ -3,16 +3,21 @@
 Flask web application to view evergabe scraper results
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, redirect, url_for, stream_with_context
 import json
 import os
-from datetime import datetime
-import glob
+from datetime import datetime, timedelta
 import sys
 import subprocess
 import threading
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from utils.ollama_client import OllamaClient
+from utils.result_normalizer import ensure_normalized
+from utils.tender_store import TenderStore
+from utils.result_files import load_results, result_path
+from utils.file_cache import FileCache
+from utils.result_catalog import ResultCatalog
+from utils.progress_events import EventBroker, parse_progress
 
 app = Flask(__name__)
 
@@ -21,70 +26,159 @@ scraper_state = {
     'status': 'idle',  # idle, running, completed, error
     'process': None,
     'progress': '',
-    'start_time': None
+    'start_time': None,
+    'event': None  # Last structured progress event of the scraper
 }
 
+# Progress of the scraper and of batch summaries, streamed by /events/...
+events = EventBroker()
+
+def update_scraper_state(status=None, progress=None):
+    """Update the scraper state and push it to /events/scraper"""
+    if status:
+        scraper_state['status'] = status
+    if progress is not None:
+        scraper_state['progress'] = progress
+    events.publish('scraper', {'event': 'status', 'status': scraper_state['status'],
+                               'progress': scraper_state['progress']})
+
+OUTPUT_DIR = "output"
+
+# Tender store (all runs) and the catalogue of runs listed in the viewer.
+# The catalogue imports new result files and is kept current by a watcher.
+tender_store = None
+result_catalog = None
+
+# Parsed runs, reloaded when the database (or the result file) changes
+result_cache = FileCache()
+
+def get_catalog():
+    """Get the run catalogue (created and watched on first use)"""
+    global tender_store, result_catalog
+    if result_catalog is None:
+        tender_store = TenderStore(os.path.join(OUTPUT_DIR, "tenders.db"))
+        result_catalog = ResultCatalog(tender_store, OUTPUT_DIR)
+        result_catalog.refresh()
+        result_catalog.start_watcher()
+    return result_catalog
+
+def get_store():
+    """Get the tender store with all result files imported"""
+    catalog = get_catalog()
+    # Only stats a few files unless the output changed
+    catalog.refresh()
+    return catalog.store
+
+def store_files(store):
+    """Files whose changes invalidate cached runs (the database and its write-ahead log)"""
+    return [store.path, store.path + '-wal']
+
 def load_latest_results():
-    """Load the most recent results file"""
-    output_dir = "output"
-    json_files = glob.glob(os.path.join(output_dir, "evergabe_results_*.json"))
-    
-    if not json_files:
-        return []
-    
-    # Get the most recent file
-    latest_file = max(json_files, key=os.path.getctime)
-    
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load the results of the most recent run"""
+    store = get_store()
+    return result_cache.get('latest', store_files(store), store.latest_run_results)
+
+def run_paths(store, filename):
+    """Files a run is loaded from (database, plus the result file if there is one)"""
+    filepath = result_path(OUTPUT_DIR, filename)
+    return store_files(store) + ([filepath] if filepath else [])
 
 def load_results_file(filename):
-    """Load a specific results file"""
-    filepath = os.path.join("output", filename)
-    if os.path.exists(filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
+    """Load the results of a specific run (by its results file name)"""
+    store = get_store()
+    filepath = result_path(OUTPUT_DIR, filename)
+
+    def load():
+        if store.get_run(filename):
+            return store.run_results(filename)
+        if filepath:
+            return ensure_normalized(load_results(filepath))
+        return []
+
+    return result_cache.get(('run', filename), run_paths(store, filename), load)
+
+def search_text(result):
+    """Lower-case text a result is searched in (runs without a search index)"""
+    return (f"{result.get('title', '')} {result.get('description', '')} "
+            f"{result.get('contracting_authority', '')} {result.get('location', '')}".lower())
+
+# Sort orders of /api/results (prefix with - for descending), missing values last
+RESULT_SORT_KEYS = {
+    'deadline': lambda r: (not r.get('deadline_iso'), r.get('deadline_iso') or ''),
+    'distance': lambda r: (not isinstance(r.get('distance_km'), (int, float)), r.get('distance_km') or 0),
+    'title': lambda r: (not r.get('title'), (r.get('title') or '').lower()),
+    'scraped_at': lambda r: (not r.get('scraped_at'), r.get('scraped_at') or ''),
+}
+
+def result_view(filename, sort='', query=''):
+    """Indices of a run's results that match query, in sort order
+
+    Matches come from the full-text index, best first unless a sort order is
+    given. The index list is cached like the run itself, so paging through a
+    sorted or filtered run does not sort or search again.
+    """
+    field = sort.lstrip('-')
+    if field and field not in RESULT_SORT_KEYS:
+        raise ValueError(f"Unknown sort order: {sort} (use {', '.join(RESULT_SORT_KEYS)})")
+    query = query.lower().strip()
+
+    def build():
+        results = load_results_file(filename)
+        store = get_store()
+        if not query:
+            indices = list(range(len(results)))
+        elif store.has_search and all(result.get('tender_id') for result in results):
+            positions = {result['tender_id']: i for i, result in enumerate(results)}
+            indices = [positions[tender_id] for tender_id in store.search_ids(query) if tender_id in positions]
+        else:
+            indices = [i for i, result in enumerate(results) if query in search_text(result)]
+        if field:
+            key = RESULT_SORT_KEYS[field]
+            if sort.startswith('-'):
+                # Descending, but results without a value still come last
+                indices.sort(key=lambda i: key(results[i])[1], reverse=True)
+                indices.sort(key=lambda i: key(results[i])[0])
+            else:
+                indices.sort(key=lambda i: key(results[i]))
+        return indices
+
+    return result_cache.get(('view', filename, sort, query), run_paths(get_store(), filename), build)
+
+def save_summary(filename, result, summary):
+    """Store an AI summary and refresh the run's JSON export"""
+    store = get_store()
+    store.set_summary(result, summary)
+    filepath = result_path(OUTPUT_DIR, filename)
+    if filepath:
+        store.export_json(filename, filepath)
 
 def get_available_files():
-    """Get list of available result files"""
-    output_dir = "output"
-    json_files = glob.glob(os.path.join(output_dir, "evergabe_results_*.json"))
-    
-    files = []
-    for filepath in json_files:
-        filename = os.path.basename(filepath)
-        # Extract timestamp from filename
-        try:
-            timestamp_str = filename.replace("evergabe_results_", "").replace(".json", "")
-            timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-            files.append({
-                'filename': filename,
-                'timestamp': timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                'size': os.path.getsize(filepath)
-            })
-        except:
-            pass
-    
-    # Sort by timestamp (newest first)
-    files.sort(key=lambda x: x['timestamp'], reverse=True)
-    return files
+    """Get list of available runs (newest first) from the catalogue"""
+    catalog = get_catalog()
+    catalog.refresh()
+    return catalog.files()
+
+def render_viewer(filename):
+    """Viewer page for a run with only its first result rendered"""
+    files = get_available_files()
+    results = load_results_file(filename) if filename else []
+    return render_template('viewer.html',
+                         first_result=results[0] if results else None,
+                         first_index=0,
+                         total=len(results),
+                         files=files,
+                         current_file=filename)
 
 @app.route('/')
 def index():
     """Main page with results viewer"""
-    results = load_latest_results()
     files = get_available_files()
-    current_file = files[0]['filename'] if files else None
-    return render_template('viewer.html', 
-                         results=results, 
-                         total=len(results),
-                         files=files,
-                         current_file=current_file)
+    return render_viewer(files[0]['filename'] if files else None)
 
 @app.route('/refresh')
 def refresh():
     """Refresh the file list and redirect to latest file"""
+    get_catalog().refresh(force=True)
     files = get_available_files()
     if files:
         latest_file = files[0]['filename']
@@ -94,13 +188,41 @@ def refresh():
 @app.route('/load/<filename>')
 def load_file(filename):
     """Load a specific results file"""
-    results = load_results_file(filename)
-    files = get_available_files()
-    return render_template('viewer.html', 
-                         results=results, 
-                         total=len(results),
-                         files=files,
-                         current_file=filename)
+    return render_viewer(filename)
+
+@app.route('/api/results')
+def api_results():
+    """One page of a run's results
+
+    Query parameters: file (default: the latest run), offset, limit (max. 100),
+    sort (deadline, distance, title, scraped_at; prefix - for descending),
+    filter (text search) and html=1 to include each rendered result card.
+    Each item carries the result's index in the run, which the summary and
+    detail endpoints expect.
+    """
+    filename = request.args.get('file')
+    if not filename:
+        files = get_available_files()
+        filename = files[0]['filename'] if files else None
+    sort = request.args.get('sort', '')
+    query = request.args.get('filter', '')
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        indices = result_view(filename, sort, query) if filename else []
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    results = load_results_file(filename) if filename else []
+    items = []
+    for index in indices[offset:offset + limit]:
+        item = {'index': index, 'result': results[index]}
+        if request.args.get('html'):
+            item['html'] = render_template('result_card.html', result=results[index],
+                                           index=index, current_file=filename)
+        items.append(item)
+    return jsonify({'file': filename, 'total': len(indices), 'offset': offset,
+                    'limit': limit, 'sort': sort, 'filter': query, 'results': items})
 
 @app.route('/result/<int:index>')
 def get_result(index):
@@ -116,6 +238,17 @@ def api_files():
     files = get_available_files()
     return jsonify(files)
 
+@app.route('/api/changes')
+def api_changes():
+    """Tenders whose content changed since a date (default: the last 7 days)
+
+    Query parameters: since (ISO date), fields (comma separated, e.g. deadline_iso,documents)
+    """
+    since = request.args.get('since') or (datetime.now() - timedelta(days=7)).date().isoformat()
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    tenders = get_store().changes_since(since, fields or None)
+    return jsonify({'since': since, 'count': len(tenders), 'tenders': tenders})
+
 @app.route('/api/generate-summary/<filename>/<int:index>', methods=['POST'])
 def generate_summary(filename, index):
     """Generate AI summary for a specific result"""
@@ -149,13 +282,8 @@ def generate_summary(filename, index):
             
             summary = ollama.generate_summary(description, context)
             
-            # Save summary back to JSON
-            result['ai_summary'] = summary
-            
-            # Write back to file
-            filepath = os.path.join("output", filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+            # Save summary to the store (and the JSON export)
+            save_summary(filename, result, summary)
             
             return jsonify({'status': 'success', 'summary': summary})
         else:
@@ -238,6 +366,7 @@ def generate_all_summaries(filename):
             'processed': 0,
             'status': 'processing'
         }
+        publish_batch(filename)
         
         # Start processing in background
         import threading
@@ -253,14 +382,16 @@ def generate_all_summaries(filename):
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+def publish_batch(filename, **fields):
+    """Push the batch progress of a file (plus event fields) to /events/batch/<filename>"""
+    event = {'event': 'status', 'file': filename, **batch_progress[filename]}
+    event.update(fields)
+    events.publish(f'batch:{filename}', event)
+
 def process_batch_summaries(filename, to_process):
     """Process batch summaries in background"""
     try:
-        # Load the full results
-        filepath = os.path.join("output", filename)
-        with open(filepath, 'r', encoding='utf-8') as f:
-            results = json.load(f)
-        
+        store = get_store()
         ollama = OllamaClient()
         
         for idx, (result_index, result) in enumerate(to_process):
@@ -276,27 +407,33 @@ def process_batch_summaries(filename, to_process):
                     
                     summary = ollama.generate_summary(description, context)
                     
-                    # Update result
-                    results[result_index]['ai_summary'] = summary
-                    
-                    # Save after each summary (in case of interruption)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        json.dump(results, f, ensure_ascii=False, indent=2)
+                    # Store after each summary (in case of interruption)
+                    store.set_summary(result, summary)
                 
                 # Update progress
                 batch_progress[filename]['processed'] = idx + 1
+                publish_batch(filename, event='summary', index=result_index,
+                              vergabe_id=result.get('vergabe_id'), title=result.get('title'))
                 
             except Exception as e:
                 print(f"Error processing index {result_index}: {e}")
+                publish_batch(filename, event='summary_error', index=result_index, message=str(e))
                 continue
         
+        # Refresh the JSON export
+        filepath = result_path(OUTPUT_DIR, filename)
+        if filepath:
+            store.export_json(filename, filepath)
+        
         # Mark as completed
         batch_progress[filename]['status'] = 'completed'
+        publish_batch(filename)
         
     except Exception as e:
         print(f"Batch processing error: {e}")
         batch_progress[filename]['status'] = 'error'
         batch_progress[filename]['error'] = str(e)
+        publish_batch(filename)
 
 @app.route('/api/batch-progress/<filename>')
 def get_batch_progress(filename):
@@ -306,29 +443,46 @@ def get_batch_progress(filename):
     else:
         return jsonify({'status': 'not_found', 'processed': 0, 'total': 0})
 
+def event_stream(channel, until):
+    """Server-Sent Events response for a channel of the event broker"""
+    return Response(stream_with_context(events.stream(channel, until=until)),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/events/batch/<filename>')
+def batch_events(filename):
+    """Stream the batch summary progress of a file (one event per summary) until it ends"""
+    return event_stream(f'batch:{filename}', lambda event: event.get('status') in ('completed', 'error'))
+
+@app.route('/events/scraper')
+def scraper_events():
+    """Stream the scraper's progress (term, page, counters, throughput, ETA) until it ends"""
+    return event_stream('scraper', lambda event: event.get('event') == 'status'
+                        and event.get('status') in ('completed', 'error'))
+
 @app.route('/search')
 def search():
-    """Search results"""
-    query = request.args.get('q', '').lower()
-    results = load_latest_results()
-    
-    if not query:
-        return jsonify(results)
-    
-    # Search in title, description, authority, location
-    filtered = []
-    for result in results:
-        searchable = f"{result.get('title', '')} {result.get('description', '')} {result.get('contracting_authority', '')} {result.get('location', '')}".lower()
-        if query in searchable:
-            filtered.append(result)
-    
-    return jsonify(filtered)
+    """Full-text search over the tenders of all runs, best matches first
+
+    Query parameters: q (words, each also matches as a prefix), offset, limit (max. 100)
+    """
+    query = request.args.get('q', '')
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        total, hits = get_store().search(query, limit, offset)
+    except (ValueError, RuntimeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    return jsonify({'query': query, 'total': total, 'offset': offset, 'limit': limit,
+                    'results': [{'score': score, 'result': result} for score, result in hits]})
 
 @app.template_filter('format_date')
 def format_date(date_str):
     """Format ISO date string to readable format"""
     if not date_str:
         return "N/A"
+    if isinstance(date_str, datetime):
+        return date_str.strftime("%Y-%m-%d %H:%M")
     try:
         dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
         return dt.strftime("%Y-%m-%d %H:%M")
@@ -346,9 +500,9 @@ def run_scraper():
     
     try:
         # Update state
-        scraper_state['status'] = 'running'
         scraper_state['start_time'] = datetime.now()
-        scraper_state['progress'] = 'Starte Scraper...'
+        scraper_state['event'] = None
+        update_scraper_state('running', 'Starte Scraper...')
         
         # Start scraper in background thread
         thread = threading.Thread(target=run_scraper_process)
@@ -357,11 +511,41 @@ def run_scraper():
         
         return jsonify({'status': 'started', 'message': 'Scraper wurde gestartet'})
     except Exception as e:
-        scraper_state['status'] = 'error'
+        update_scraper_state('error', f'Fehler: {str(e)}')
         return jsonify({'status': 'error', 'message': str(e)})
 
-def run_scraper_process():
-    """Run the scraper process in background"""
+@app.route('/api/load-details/<filename>/<int:index>', methods=['POST'])
+def load_details(filename, index):
+    """Open the detail page for a result that was built from the result list"""
+    if scraper_state['status'] == 'running':
+        return jsonify({'status': 'error', 'message': 'Scraper läuft bereits'})
+    
+    results = load_results_file(filename)
+    if not 0 <= index < len(results):
+        return jsonify({'status': 'error', 'message': 'Invalid index'}), 404
+    if results[index].get('details_loaded', True):
+        return jsonify({'status': 'exists', 'message': 'Details bereits vorhanden'})
+    
+    scraper_state['start_time'] = datetime.now()
+    scraper_state['event'] = None
+    update_scraper_state('running', 'Lade Details...')
+    
+    filepath = result_path(OUTPUT_DIR, filename) or os.path.join(OUTPUT_DIR, filename)
+    thread = threading.Thread(
+        target=run_scraper_process,
+        args=(['--load-details', filepath, '--index', str(index)],)
+    )
+    thread.daemon = True
+    thread.start()
+    
+    return jsonify({'status': 'started', 'message': 'Details werden geladen'})
+
+def run_scraper_process(extra_args=None):
+    """Run the scraper process in background
+    
+    Args:
+        extra_args: Additional command line arguments for run.py
+    """
     global scraper_state
     
     try:
@@ -371,7 +555,7 @@ def run_scraper_process():
             venv_python = 'python3'  # Fallback to system python
         
         # Run the scraper with headless option
-        cmd = [venv_python, 'run.py', '--headless']
+        cmd = [venv_python, 'run.py', '--headless', '--progress-events'] + (extra_args or [])
         
         # Start the process
         process = subprocess.Popen(
@@ -387,35 +571,41 @@ def run_scraper_process():
         # Read output line by line
         for line in iter(process.stdout.readline, ''):
             if line:
+                # Structured progress events are pushed as they are
+                event = parse_progress(line)
+                if event:
+                    scraper_state['event'] = event
+                    events.publish('scraper', event)
+                    continue
+                
                 # Update progress with latest output
                 line = line.strip()
                 if 'Total orders found:' in line:
-                    scraper_state['progress'] = line
+                    update_scraper_state(progress=line)
                 elif 'Relevant to streetlamps:' in line:
-                    scraper_state['progress'] = line
+                    update_scraper_state(progress=line)
                 elif 'Processing page' in line:
-                    scraper_state['progress'] = line
+                    update_scraper_state(progress=line)
                 elif 'Searching for:' in line:
-                    scraper_state['progress'] = line
+                    update_scraper_state(progress=line)
+                elif 'Loading details:' in line or 'Loaded details for' in line:
+                    update_scraper_state(progress=line)
                 elif 'SCRAPER FINISHED' in line:
-                    scraper_state['progress'] = 'Scraper abgeschlossen!'
+                    update_scraper_state(progress='Scraper abgeschlossen!')
         
         # Wait for process to complete
         process.wait()
         
         # Check exit code
+        scraper_state['process'] = None
         if process.returncode == 0:
-            scraper_state['status'] = 'completed'
-            scraper_state['progress'] = 'Erfolgreich abgeschlossen'
+            update_scraper_state('completed', 'Erfolgreich abgeschlossen')
         else:
-            scraper_state['status'] = 'error'
-            scraper_state['progress'] = f'Fehler: Exit code {process.returncode}'
+            update_scraper_state('error', f'Fehler: Exit code {process.returncode}')
             
     except Exception as e:
-        scraper_state['status'] = 'error'
-        scraper_state['progress'] = f'Fehler: {str(e)}'
-    finally:
         scraper_state['process'] = None
+        update_scraper_state('error', f'Fehler: {str(e)}')
 
 @app.route('/scraper-status', methods=['GET'])
 def scraper_status():
@@ -424,7 +614,8 @@ def scraper_status():
     
     response = {
         'status': scraper_state['status'],
-        'progress': scraper_state['progress']
+        'progress': scraper_state['progress'],
+        'event': scraper_state['event']
     }
     
     # Add runtime if running